@@ -3,6 +3,7 @@ import hashlib
 import json
 
 import fastapi
+import loguru
 from fastapi.security import SecurityScopes
 from jose import ExpiredSignatureError
 
@@ -10,12 +11,12 @@ from src.api.dependencies.auth_utils import oauth2_client_scheme, oauth2_code_sc
 from src.api.dependencies.repository import get_repository
 from src.api.dependencies.scopes import Scopes
 from src.config.manager import settings
-from src.repository.models.account import Account
+from src.monitoring.tracing import traced
+from src.repository.models.account import Account, RoleNames
 from src.schemas.jwt import SJwtToken, SRefreshSession, Tokens
 from src.repository.crud.account import AccountCRUDRepository
 from src.repository.crud.application import ApplicationCRUDRepository
 from src.repository.crud.refresh_session import RefreshCRUDRepository
-from src.repository.database import redis_client
 from src.securities.jwt import JWTGenerator, AuthTypes
 from src.securities.password import PasswordGenerator
 from src.api.http_exceptions.exc_400 import http_exc_400_credentials_bad_signin_request, \
@@ -26,9 +27,10 @@ from src.api.http_exceptions.exc_401 import (
     http_401_exc_not_enough_permissions,
     http_exc_401_unauthorized_request,
 )
-from src.api.http_exceptions.exc_403 import http_403_forbidden_inactive_user
+from src.api.http_exceptions.exc_403 import http_403_exc_forbidden_request, http_403_forbidden_inactive_user
 
 
+@traced
 async def get_token_from_password_creds(
         request: fastapi.Request,
         response: fastapi.Response,
@@ -44,7 +46,7 @@ async def get_token_from_password_creds(
     ip = request.client.host
     user_agent = request.headers.get("User-Agent")
 
-    db_account = await account_repo.find_by_username_or_none(username=username)
+    db_account = await account_repo.find_by_login_identifier(identifier=username)
     if db_account is None:
         raise await http_exc_400_credentials_bad_signin_request()
     if not db_account.is_active:
@@ -59,9 +61,11 @@ async def get_token_from_password_creds(
         raise await http_exc_400_credentials_bad_signin_request()
 
     current_sessions = await refresh_session_repo.find_all(account=db_account.id)
-    for session in current_sessions:
-        if len(current_sessions) > 5 or session.ua == user_agent:
-            await refresh_session_repo.delete_by_id(session.id, commit_changes=False)
+    stale_session_ids = [
+        session.id for session in current_sessions if len(current_sessions) > 5 or session.ua == user_agent
+    ]
+    if stale_session_ids:
+        await refresh_session_repo.delete_by_ids(stale_session_ids, commit_changes=False)
 
     access_token = JWTGenerator.generate_access_token(
         db_account,
@@ -95,6 +99,7 @@ async def get_token_from_password_creds(
     return tokens
 
 
+@traced
 async def get_token_from_client_creds(
         client_id: str | None,
         client_secret: str | None,
@@ -119,6 +124,7 @@ async def get_token_from_client_creds(
     return tokens
 
 
+@traced
 async def get_token_from_auth_code(
         request: fastapi.Request,
         client_id: str | None,
@@ -140,7 +146,7 @@ async def get_token_from_auth_code(
     user_agent = request.headers.get("User-Agent")
     ip = request.client.host
 
-    async with redis_client.pipeline() as pipeline:
+    async with request.app.state.redis.pipeline() as pipeline:
         await pipeline.get(name=f"code:{code}")
         await pipeline.delete(f"code:{code}")
         data_dict_json = (await pipeline.execute())[0]
@@ -165,9 +171,11 @@ async def get_token_from_auth_code(
 
     db_account = await account_repo.find_by_id(id=data_dict["user_id"])
     current_sessions = await refresh_session_repo.find_all(account=db_account.id)
-    for session in current_sessions:
-        if len(current_sessions) > 5 or session.ua == user_agent:
-            await refresh_session_repo.delete_by_id(session.id, commit_changes=False)
+    stale_session_ids = [
+        session.id for session in current_sessions if len(current_sessions) > 5 or session.ua == user_agent
+    ]
+    if stale_session_ids:
+        await refresh_session_repo.delete_by_ids(stale_session_ids, commit_changes=False)
 
     access_token = JWTGenerator.generate_access_token(
         sub=db_account,
@@ -193,6 +201,7 @@ async def get_token_from_auth_code(
     return tokens
 
 
+@traced
 async def get_token_from_account(
         client_id: str | None,
         account: Account,
@@ -216,6 +225,7 @@ async def get_token_from_account(
     return tokens
 
 
+@traced
 async def get_token_payload(
         # token1: str = fastapi.Depends(oauth2_password_scheme),
         token2: str = fastapi.Depends(oauth2_client_scheme),
@@ -229,12 +239,13 @@ async def get_token_payload(
     except ExpiredSignatureError:
         raise await http_401_exc_expired_token_request()
     except Exception as e:
-        print(e)
+        loguru.logger.bind(sample_rate=0.1).info(f"Token Payload --- unreadable token: {e!r}")
         return None
 
     return payload
 
 
+@traced
 async def get_auth_user_or_none(
         security_scopes: SecurityScopes,
         payload: dict = fastapi.Depends(get_token_payload),
@@ -244,7 +255,7 @@ async def get_auth_user_or_none(
         return None
     token_data = SJwtToken.model_validate(payload)
     username = token_data.sub
-    db_account = await account_repo.find_by_username_or_none(username=username)
+    db_account = await account_repo.find_by_username_or_none(username=username, primary_only=True)
 
     for scope in security_scopes.scopes:
         if scope not in token_data.scopes:
@@ -259,3 +270,11 @@ async def get_auth_user(
     if account is None:
         raise await http_401_exc_bad_token_request()
     return account
+
+
+async def get_admin_user(
+        account: Account = fastapi.Depends(get_auth_user)
+) -> Account:
+    if account.role != RoleNames.ADMIN:
+        raise await http_403_exc_forbidden_request()
+    return account
@@ -11,16 +11,18 @@ class AccountScopes:
     def __init__(self, role: str):
         self.role = role
 
+    # Tuples: the mapping is shared by every instance, so `scopes` must build a new list instead of appending to it
     _ROLE_RELATIONSHIPS = {
-        RoleNames.STAFF.value: [RoleNames.STAFF.value],
-        RoleNames.DEVELOPER.value: [RoleNames.STAFF.value, RoleNames.DEVELOPER.value],
-        RoleNames.ADMIN.value: [RoleNames.STAFF.value, RoleNames.DEVELOPER.value, RoleNames.ADMIN.value],
+        RoleNames.STAFF.value: (RoleNames.STAFF.value,),
+        RoleNames.DEVELOPER.value: (RoleNames.STAFF.value, RoleNames.DEVELOPER.value),
+        RoleNames.ADMIN.value: (RoleNames.STAFF.value, RoleNames.DEVELOPER.value, RoleNames.ADMIN.value),
     }
 
     @property
     def scopes(self) -> list[str]:
-        scopes = self._ROLE_RELATIONSHIPS.get(self.role, [])
-        scopes.append(self.role)
+        scopes = list(self._ROLE_RELATIONSHIPS.get(self.role, ()))
+        if self.role not in scopes:
+            scopes.append(self.role)
         return scopes
 
     @property
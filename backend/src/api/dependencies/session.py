@@ -1,17 +1,78 @@
+import time
 import typing
 
+import fastapi
+import loguru
+from sqlalchemy.exc import DBAPIError, SQLAlchemyError
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
 )
 
-from src.repository.database import async_db
+from src.api.http_exceptions.exc_503 import http_503_exc_database_timeout
+from src.api.middlewares.read_your_writes import PRIMARY_PIN_STATE_KEY, READ_YOUR_WRITES_COOKIE
+from src.config.manager import settings
+from src.config.settings.enums import DatabaseEngineProfile
+from src.repository.database import RequestSession
+from src.repository.slow_queries import QUERY_CANCELED_SQLSTATE, current_route_name
 
+READ_ONLY_METHODS: frozenset[str] = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+def _get_statement_timeout_ms(request: fastapi.Request) -> int | None:
+    route_name: str | None = getattr(request.scope.get("route"), "name", None)
+    timeout = settings.DB_ROUTE_TIMEOUTS.get(route_name) if route_name is not None else None
+    if timeout is None and settings.DB_ENGINE_PROFILE == DatabaseEngineProfile.PGBOUNCER_TRANSACTION:
+        # Startup parameters do not reach the server through PgBouncer, so the default is applied per transaction
+        timeout = settings.DB_TIMEOUT
+    return int(timeout * 1000) if timeout is not None else None
+
+
+def _is_statement_timeout(error: Exception) -> bool:
+    return isinstance(error, DBAPIError) and getattr(error.orig, "sqlstate", None) == QUERY_CANCELED_SQLSTATE
+
+
+def _is_within_write_window(request: fastapi.Request) -> bool:
+    try:
+        return float(request.cookies.get(READ_YOUR_WRITES_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+async def get_async_session(request: fastapi.Request) -> typing.AsyncGenerator[AsyncSession, None]:
+    """
+    Open a new session per request. No connection is checked out until the first query, so requests that return
+    before touching the database never wait on the pool.
+
+    Statements are bounded by the route's entry in `DB_ROUTE_TIMEOUTS`, or by `DB_TIMEOUT`; a statement that runs
+    over it answers 503 with a `Retry-After` header instead of holding its connection.
+
+    Reads of safe-method requests may be served by a read replica. Once a request writes, the client gets a short
+    lived cookie, set by `ReadYourWritesMiddleware`, that pins its following requests to the primary, so it always
+    reads its own writes.
+    """
+    db = request.app.state.db
+    current_route_name.set(getattr(request.scope.get("route"), "name", None))
+    async_session = db.async_session_factory()
+    session_info = async_session.sync_session.info
+    session_info[RequestSession.READ_ONLY_KEY] = request.method in READ_ONLY_METHODS
+    session_info[RequestSession.FORCE_PRIMARY_KEY] = _is_within_write_window(request)
+    session_info[RequestSession.STATEMENT_TIMEOUT_KEY] = _get_statement_timeout_ms(request)
+
+    if db.replicas:
+        def pin_client_to_primary() -> None:
+            setattr(request.state, PRIMARY_PIN_STATE_KEY, int(time.time()) + settings.DB_READ_YOUR_WRITES_SECONDS)
+
+        session_info[RequestSession.ON_WRITE_KEY] = pin_client_to_primary
 
-async def get_async_session() -> typing.AsyncGenerator[AsyncSession, None]:
     try:
-        yield async_db.async_session
+        yield async_session
     except Exception as e:
-        print(e)
-        await async_db.async_session.rollback()
+        await async_session.rollback()
+        if _is_statement_timeout(e):
+            raise await http_503_exc_database_timeout(retry_after=settings.DB_TIMEOUT_RETRY_AFTER_SECONDS)
+        # Routes answer 4xx by raising `HTTPException`; only failures of the database itself are worth a warning
+        if isinstance(e, SQLAlchemyError):
+            loguru.logger.warning(f"Database Session --- request failed: {e!r}")
+        raise
     finally:
-        await async_db.async_session.close()
+        await async_session.close()
@@ -1,6 +1,7 @@
 import fastapi
 
 from src.api.routes.account import router as account_router
+from src.api.routes.admin import router as admin_router
 from src.api.routes.authentication import router as auth_router
 from src.api.routes.login import router as login_router
 from src.api.routes.application import router as app_router
@@ -11,3 +12,4 @@ router.include_router(router=login_router)
 router.include_router(router=account_router)
 router.include_router(router=app_router)
 router.include_router(router=auth_router)
+router.include_router(router=admin_router)
@@ -40,3 +40,10 @@ async def http_exc_400_client_credentials_bad_request() -> Exception:
         status_code=status.HTTP_400_BAD_REQUEST,
         detail="Signin failed! Check your client credentials.",
     )
+
+
+async def http_400_exc_batch_too_large_request(max_size: int) -> Exception:
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail=f"Too many ids requested! At most {max_size} ids can be fetched at once.",
+    )
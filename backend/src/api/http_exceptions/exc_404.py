@@ -21,3 +21,10 @@ async def http_404_exc_username_not_found_request(username: str) -> Exception:
         detail=f"Either the account with username `{username}` doesn't exist, has been deleted, or you are not "
                f"authorized!",
     )
+
+
+async def http_404_exc_memory_snapshot_not_found_request(label: str) -> Exception:
+    return HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail=f"No memory snapshot labeled `{label}` on this worker!",
+    )
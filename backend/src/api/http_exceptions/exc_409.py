@@ -0,0 +1,15 @@
+from fastapi import HTTPException, status
+
+
+async def http_409_exc_profiler_busy() -> Exception:
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail="A profile is already running on this worker, please retry when it is done!",
+    )
+
+
+async def http_409_exc_memory_tracing_disabled() -> Exception:
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail="Memory tracing is not running on this worker, start it first!",
+    )
@@ -0,0 +1,9 @@
+from fastapi import HTTPException, status
+
+
+async def http_503_exc_database_timeout(retry_after: int) -> Exception:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="The database took too long to answer, please retry later!",
+        headers={"Retry-After": str(retry_after)},
+    )
@@ -0,0 +1,80 @@
+import asyncio
+
+import loguru
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+def _has_request_body(scope: Scope) -> bool:
+    for name, value in scope["headers"]:
+        if name == b"transfer-encoding" or (name == b"content-length" and value.strip() != b"0"):
+            return True
+    return False
+
+
+class CancelOnDisconnectMiddleware:
+    """
+    Cancel the request handler as soon as the client hangs up, so that an in-flight asyncpg query is cancelled on
+    the server and its connection goes back to the pool instead of running to completion for nobody.
+
+    The disconnect is only listened for once the handler has read the whole request body, so that streamed uploads
+    are still read by the handler itself and never buffered here.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        receive_lock = asyncio.Lock()
+        body_read = asyncio.Event()
+        response_complete = asyncio.Event()
+        pending: list[Message] = list()
+        client_disconnected = False
+
+        async def receive_request() -> Message:
+            async with receive_lock:
+                message = pending.pop() if pending else await receive()
+            if message["type"] != "http.request" or not message.get("more_body", False):
+                body_read.set()
+            return message
+
+        async def send_response(message: Message) -> None:
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                response_complete.set()
+
+        async def watch_disconnect(handler: asyncio.Task[None]) -> None:
+            nonlocal client_disconnected
+            if not _has_request_body(scope):
+                # Read the empty body on the handler's behalf and hand it over if it asks for it
+                async with receive_lock:
+                    if not body_read.is_set():
+                        pending.append(await receive())
+                        body_read.set()
+            await body_read.wait()
+
+            while not response_complete.is_set():
+                message = await receive()
+                if message["type"] == "http.disconnect":
+                    if not response_complete.is_set():
+                        client_disconnected = True
+                        handler.cancel()
+                    return
+
+        async def handle_request() -> None:
+            await self.app(scope, receive_request, send_response)
+
+        handler: asyncio.Task[None] = asyncio.create_task(handle_request())
+        watcher = asyncio.create_task(watch_disconnect(handler))
+        try:
+            await handler
+        except asyncio.CancelledError:
+            if not client_disconnected:
+                handler.cancel()
+                raise
+            loguru.logger.info(f"Client disconnected --- cancelled {scope['method']} {scope['path']}")
+        finally:
+            watcher.cancel()
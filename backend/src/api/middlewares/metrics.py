@@ -0,0 +1,48 @@
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.monitoring.metrics import HTTP_REQUEST_DURATION, HTTP_REQUESTS, HTTP_REQUESTS_IN_FLIGHT
+
+
+# nginx's "client closed request": the client hung up before a response was started
+CLIENT_CLOSED_REQUEST_STATUS: int = 499
+
+
+class MetricsMiddleware:
+    """
+    Record latency, status and in-flight count of every HTTP request, labelled with the route name
+    (`auth:get-tokens`) rather than the path, so that path parameters do not explode the label set. A request that
+    raised before starting a response counts as a 500, one that was cancelled or ended without a response because
+    the client disconnected (see `CancelOnDisconnectMiddleware`) as a 499.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code: int | None = None
+
+        async def send_response(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+        started_at = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_response)
+        except Exception:
+            status_code = status_code or 500
+            raise
+        finally:
+            HTTP_REQUESTS_IN_FLIGHT.dec()
+            # The router stores the matched route in the scope it was given, which is this one
+            route_name = getattr(scope.get("route"), "name", None) or "unmatched"
+            HTTP_REQUEST_DURATION.observe(time.perf_counter() - started_at, route_name, scope["method"])
+            HTTP_REQUESTS.inc(route_name, scope["method"], str(status_code or CLIENT_CLOSED_REQUEST_STATUS))
@@ -0,0 +1,36 @@
+import loguru
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from src.monitoring.metrics import DB_REQUEST_DURATION, DB_REQUEST_STATEMENTS
+from src.monitoring.queries import track_queries
+
+
+class QueryTrackingMiddleware:
+    """
+    Count the statements and database time of every HTTP request per route name. With a `repeat_threshold`, a
+    request that runs the same statement shape that many times is logged as a likely N+1 (a query per row of an
+    earlier result).
+    """
+
+    def __init__(self, app: ASGIApp, repeat_threshold: int = 0):
+        self.app = app
+        self.repeat_threshold = repeat_threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with track_queries() as stats:
+            await self.app(scope, receive, send)
+
+        route_name = getattr(scope.get("route"), "name", None) or "unmatched"
+        DB_REQUEST_STATEMENTS.observe(stats.count, route_name)
+        DB_REQUEST_DURATION.observe(stats.duration, route_name)
+
+        if self.repeat_threshold:
+            for statement, count in stats.repeated_shapes(self.repeat_threshold):
+                loguru.logger.warning(
+                    f"Query Tracking --- {scope['method']} {route_name} ran the same statement {count} times"
+                    f" (possible N+1): {statement}"
+                )
@@ -0,0 +1,41 @@
+from starlette.datastructures import MutableHeaders
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.config.manager import settings
+
+# Holds the unix time until which the client must read from the primary after it wrote something
+READ_YOUR_WRITES_COOKIE: str = "db_primary_until"
+# Set in the request state by the session dependency once the request writes
+PRIMARY_PIN_STATE_KEY: str = "db_primary_until"
+
+
+class ReadYourWritesMiddleware:
+    """
+    Attach the read-your-writes cookie to whatever response the route returns once its request wrote to the primary,
+    including responses the route built itself (redirects, streams) rather than the injected `fastapi.Response`.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_response(message: Message) -> None:
+            primary_until = scope.get("state", {}).get(PRIMARY_PIN_STATE_KEY)
+            if message["type"] == "http.response.start" and primary_until is not None:
+                cookie = Response()
+                cookie.set_cookie(
+                    key=READ_YOUR_WRITES_COOKIE,
+                    value=str(primary_until),
+                    max_age=settings.DB_READ_YOUR_WRITES_SECONDS,
+                    httponly=True,
+                    samesite="lax",
+                )
+                MutableHeaders(scope=message).append("set-cookie", cookie.headers["set-cookie"])
+            await send(message)
+
+        await self.app(scope, receive, send_response)
@@ -0,0 +1,40 @@
+import re
+import uuid
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.monitoring.logs import request_id
+
+REQUEST_ID_HEADER: str = "X-Request-ID"
+REQUEST_ID_PATTERN: re.Pattern = re.compile(r"^[A-Za-z0-9._-]{1,128}$")
+
+
+class RequestIdMiddleware:
+    """
+    Tag the request with the caller's `X-Request-ID`, or a new one, so that every log record it produces can be
+    correlated, and return it in the response.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        current_request_id = Headers(scope=scope).get(REQUEST_ID_HEADER, "")
+        if not REQUEST_ID_PATTERN.match(current_request_id):
+            current_request_id = uuid.uuid4().hex
+
+        async def send_response(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append(REQUEST_ID_HEADER, current_request_id)
+            await send(message)
+
+        token = request_id.set(current_request_id)
+        try:
+            await self.app(scope, receive, send_response)
+        finally:
+            request_id.reset(token)
@@ -0,0 +1,62 @@
+import typing
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.monitoring.tracing import STATUS_ERROR, start_root_span, stop_root_span
+
+
+class TracingMiddleware:
+    """
+    Open the server span of sampled requests, continuing the caller's W3C `traceparent`, and return the span's
+    `traceparent` to the client. Only callers whose address is in `trusted_upstreams` decide whether their requests
+    are sampled. The exporter lives on `app.state.trace_exporter`, created by the startup handler.
+    """
+
+    def __init__(self, app: ASGIApp, sample_rate: float, trusted_upstreams: typing.Iterable[str] = ()):
+        self.app = app
+        self.sample_rate = sample_rate
+        self.trusted_upstreams = frozenset(trusted_upstreams)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        exporter = getattr(scope["app"].state, "trace_exporter", None) if "app" in scope else None
+        if scope["type"] != "http" or exporter is None:
+            await self.app(scope, receive, send)
+            return
+
+        traceparent = Headers(scope=scope).get("traceparent")
+        client = scope.get("client")
+        root = start_root_span(
+            exporter,
+            f"{scope['method']} {scope['path']}",
+            traceparent,
+            self.sample_rate,
+            is_parent_trusted=client is not None and client[0] in self.trusted_upstreams,
+        )
+        if root is None:
+            await self.app(scope, receive, send)
+            return
+
+        span, token = root
+
+        async def send_response(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                span.attributes["http.status_code"] = message["status"]
+                if message["status"] >= 500:
+                    span.status = STATUS_ERROR
+                MutableHeaders(scope=message).append("traceparent", span.traceparent)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_response)
+        except BaseException:
+            span.status = STATUS_ERROR
+            raise
+        finally:
+            route_name = getattr(scope.get("route"), "name", None)
+            if route_name is not None:
+                span.name = f"{scope['method']} {route_name}"
+                span.attributes["http.route"] = route_name
+            span.attributes["http.method"] = scope["method"]
+            span.attributes["http.target"] = scope["path"]
+            stop_root_span(span, token)
@@ -0,0 +1,24 @@
+import typing
+
+import fastapi
+from fastapi.responses import ORJSONResponse
+
+from src.schemas.base import BaseSchemaModel, get_list_adapter
+
+
+def schema_list_response(
+        schema: typing.Type[BaseSchemaModel],
+        rows: typing.Iterable[typing.Any],
+        response_class: typing.Type[fastapi.Response] = ORJSONResponse,
+        status_code: int = fastapi.status.HTTP_200_OK,
+) -> fastapi.Response:
+    """
+    Validate `rows` against `list[schema]` in one pass and render them with `response_class`.
+
+    Returning the response directly skips FastAPI's second validation against `response_model`; keep declaring
+    `response_model` on the route for the OpenAPI schema. Pass the router's `default_response_class` to let each
+    router choose its serializer.
+    """
+    adapter = get_list_adapter(schema)
+    content = adapter.dump_python(adapter.validate_python(list(rows)), mode="json", by_alias=True)
+    return response_class(content=content, status_code=status_code)
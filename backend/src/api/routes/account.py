@@ -2,19 +2,33 @@ from typing import Annotated
 
 import fastapi
 from fastapi import Security
+from fastapi.responses import ORJSONResponse
 
 from src.api.dependencies.auth import get_auth_user
 from src.api.dependencies.repository import get_repository
 from src.api.dependencies.scopes import Scopes
+from src.api.responses import schema_list_response
+from src.config.manager import settings
 from src.repository.models.account import Account
-from src.schemas.account import AccountInUpdate, AccountDetail
+from src.schemas.account import AccountInUpdate, AccountDetail, AccountBatchItem, AccountBatchRequest
 from src.repository.crud.account import AccountCRUDRepository
 from src.repository.exceptions import EntityDoesNotExist
+from src.api.http_exceptions.exc_400 import http_400_exc_batch_too_large_request
 from src.api.http_exceptions.exc_404 import (
     http_404_exc_id_not_found_request,
 )
 
-router = fastapi.APIRouter(prefix="/accounts", tags=["accounts"])
+router = fastapi.APIRouter(prefix="/accounts", tags=["accounts"], default_response_class=ORJSONResponse)
+
+
+async def _get_account_batch(ids: list[int], account_repo: AccountCRUDRepository) -> fastapi.Response:
+    if len(ids) > settings.ACCOUNTS_BATCH_MAX_SIZE:
+        raise await http_400_exc_batch_too_large_request(max_size=settings.ACCOUNTS_BATCH_MAX_SIZE)
+
+    db_accounts = await account_repo.find_all_by_ids(ids)
+    rows = [{"id": id, "found": id in db_accounts, "account": db_accounts.get(id)} for id in ids]
+
+    return schema_list_response(AccountBatchItem, rows, response_class=router.default_response_class)
 
 
 @router.get(
@@ -26,16 +40,10 @@ router = fastapi.APIRouter(prefix="/accounts", tags=["accounts"])
 async def get_accounts(
         account: Annotated[Account, Security(get_auth_user, scopes=[])],
         account_repo: AccountCRUDRepository = fastapi.Depends(get_repository(repo_type=AccountCRUDRepository)),
-) -> list[AccountDetail]:
+) -> fastapi.Response:
     db_accounts = await account_repo.find_all()
-    db_account_list = list()
 
-    for db_account in db_accounts:
-        account = AccountDetail.model_validate(db_account)
-
-        db_account_list.append(account)
-
-    return db_account_list
+    return schema_list_response(AccountDetail, db_accounts, response_class=router.default_response_class)
 
 
 @router.get(
@@ -50,6 +58,39 @@ async def get_me(
     return AccountDetail.model_validate(account)
 
 
+@router.get(
+    path=":batch",
+    name="accounts:read-account-batch",
+    response_model=list[AccountBatchItem],
+    status_code=fastapi.status.HTTP_200_OK,
+)
+async def get_account_batch(
+        ids: list[int] = fastapi.Query(),
+        account_repo: AccountCRUDRepository = fastapi.Depends(get_repository(repo_type=AccountCRUDRepository)),
+) -> fastapi.Response:
+    """
+    Fetch up to `ACCOUNTS_BATCH_MAX_SIZE` accounts with one query. The response has one item per requested id, in
+    request order and including repeated ids; an id without an account comes back with `found: false` and no account.
+    """
+    return await _get_account_batch(ids=ids, account_repo=account_repo)
+
+
+@router.post(
+    path=":batch",
+    name="accounts:read-account-batch-by-body",
+    response_model=list[AccountBatchItem],
+    status_code=fastapi.status.HTTP_200_OK,
+)
+async def post_account_batch(
+        account_batch: AccountBatchRequest,
+        account_repo: AccountCRUDRepository = fastapi.Depends(get_repository(repo_type=AccountCRUDRepository)),
+) -> fastapi.Response:
+    """
+    Same as `GET /accounts:batch`, for id lists too long for a query string.
+    """
+    return await _get_account_batch(ids=account_batch.ids, account_repo=account_repo)
+
+
 @router.get(
     path="/{id}",
     name="accounts:read-account-by-id",
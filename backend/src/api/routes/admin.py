@@ -0,0 +1,189 @@
+import typing
+from typing import Annotated
+
+import fastapi
+from fastapi import Security
+from fastapi.responses import PlainTextResponse
+
+from src.api.dependencies.auth import get_admin_user
+from src.api.dependencies.repository import get_repository
+from src.api.http_exceptions.exc_404 import http_404_exc_memory_snapshot_not_found_request
+from src.api.http_exceptions.exc_409 import http_409_exc_memory_tracing_disabled, http_409_exc_profiler_busy
+from src.config.manager import settings
+from src.monitoring.profiler import render_collapsed_stacks
+from src.repository.account_import import AccountImportFormat, import_accounts, iter_account_rows
+from src.repository.crud.account import AccountCRUDRepository
+from src.repository.models.account import Account
+from src.schemas.account import AccountImportReport
+
+router = fastapi.APIRouter(prefix="/admin", tags=["admin"])
+
+
+@router.post(
+    path="/accounts/import",
+    name="admin:import-accounts",
+    response_model=AccountImportReport,
+    status_code=fastapi.status.HTTP_200_OK,
+)
+async def import_account_list(
+        request: fastapi.Request,
+        account: Annotated[Account, Security(get_admin_user)],
+        account_repo: AccountCRUDRepository = fastapi.Depends(get_repository(repo_type=AccountCRUDRepository)),
+) -> AccountImportReport:
+    """
+    Stream a CSV (`text/csv`, header line required) or NDJSON (`application/x-ndjson`) body of
+    `username`, `email` and `password` rows into the account table.
+    """
+    import_format = AccountImportFormat.from_content_type(request.headers.get("Content-Type"))
+    return await import_accounts(
+        iter_account_rows(request.stream(), import_format),
+        account_repo,
+        executor=request.app.state.hash_executor,
+    )
+
+
+@router.get(
+    path="/db/pool",
+    name="admin:read-db-pool-usage",
+    status_code=fastapi.status.HTTP_200_OK,
+)
+async def get_db_pool_usage(
+        request: fastapi.Request,
+        account: Annotated[Account, Security(get_admin_user)],
+) -> dict[str, typing.Any]:
+    return {
+        **request.app.state.db.pool_usage.snapshot(),
+        "controller": request.app.state.db.pool_controller.snapshot(),
+    }
+
+
+@router.get(
+    path="/db/slow-queries",
+    name="admin:read-slow-queries",
+    status_code=fastapi.status.HTTP_200_OK,
+)
+async def get_slow_queries(
+        request: fastapi.Request,
+        account: Annotated[Account, Security(get_admin_user)],
+) -> dict[str, typing.Any]:
+    """
+    The latest statements over `DB_SLOW_QUERY_THRESHOLD_MS`, newest first, with the plan of the sampled ones.
+    """
+    return request.app.state.db.slow_queries.snapshot()
+
+
+@router.get(
+    path="/loop/blocking",
+    name="admin:read-loop-blocking",
+    status_code=fastapi.status.HTTP_200_OK,
+)
+async def get_loop_blocking(
+        request: fastapi.Request,
+        account: Annotated[Account, Security(get_admin_user)],
+        top: int = fastapi.Query(default=10, ge=1, le=100),
+) -> dict[str, typing.Any]:
+    """
+    The stacks that most often kept the event loop busy for more than `LOOP_BLOCK_THRESHOLD_MS`.
+    """
+    return request.app.state.loop_monitor.snapshot(top=top)
+
+
+@router.post(
+    path="/profile",
+    name="admin:profile-worker",
+    response_class=PlainTextResponse,
+    status_code=fastapi.status.HTTP_200_OK,
+)
+async def profile_worker(
+        request: fastapi.Request,
+        account: Annotated[Account, Security(get_admin_user)],
+        seconds: float = fastapi.Query(default=10.0, gt=0),
+) -> PlainTextResponse:
+    """
+    Sample the worker that serves this request for `seconds` (at most `PROFILER_MAX_SECONDS`) and return its
+    stacks in the collapsed flamegraph format, split into `on-cpu` and `awaiting` roots.
+    """
+    profiler = request.app.state.profiler
+    if profiler.is_running:
+        raise await http_409_exc_profiler_busy()
+
+    stacks = await profiler.profile(duration=min(seconds, settings.PROFILER_MAX_SECONDS))
+    return PlainTextResponse(content=render_collapsed_stacks(stacks))
+
+
+@router.get(
+    path="/memory",
+    name="admin:read-memory-usage",
+    status_code=fastapi.status.HTTP_200_OK,
+)
+async def get_memory_usage(
+        request: fastapi.Request,
+        account: Annotated[Account, Security(get_admin_user)],
+) -> dict[str, typing.Any]:
+    return {
+        **request.app.state.memory_sampler.snapshot(),
+        "snapshots": request.app.state.memory_snapshots.describe(),
+    }
+
+
+@router.post(
+    path="/memory/tracing",
+    name="admin:start-memory-tracing",
+    status_code=fastapi.status.HTTP_204_NO_CONTENT,
+)
+async def start_memory_tracing(
+        request: fastapi.Request,
+        account: Annotated[Account, Security(get_admin_user)],
+) -> None:
+    request.app.state.memory_snapshots.start(frames=settings.TRACEMALLOC_FRAMES)
+
+
+@router.delete(
+    path="/memory/tracing",
+    name="admin:stop-memory-tracing",
+    status_code=fastapi.status.HTTP_204_NO_CONTENT,
+)
+async def stop_memory_tracing(
+        request: fastapi.Request,
+        account: Annotated[Account, Security(get_admin_user)],
+) -> None:
+    request.app.state.memory_snapshots.stop()
+
+
+@router.post(
+    path="/memory/snapshots/{label}",
+    name="admin:take-memory-snapshot",
+    status_code=fastapi.status.HTTP_201_CREATED,
+)
+async def take_memory_snapshot(
+        label: str,
+        request: fastapi.Request,
+        account: Annotated[Account, Security(get_admin_user)],
+) -> dict[str, typing.Any]:
+    memory_snapshots = request.app.state.memory_snapshots
+    if not memory_snapshots.is_tracing:
+        raise await http_409_exc_memory_tracing_disabled()
+    return await memory_snapshots.take(label)
+
+
+@router.get(
+    path="/memory/snapshots/{base}/diff/{target}",
+    name="admin:read-memory-diff",
+    status_code=fastapi.status.HTTP_200_OK,
+)
+async def get_memory_diff(
+        base: str,
+        target: str,
+        request: fastapi.Request,
+        account: Annotated[Account, Security(get_admin_user)],
+        group_by: typing.Literal["lineno", "filename", "traceback"] = "lineno",
+        top: int = fastapi.Query(default=25, ge=1, le=500),
+) -> list[dict[str, typing.Any]]:
+    """
+    The allocations that grew the most from snapshot `base` to snapshot `target`, grouped by line or file.
+    """
+    memory_snapshots = request.app.state.memory_snapshots
+    for label in (base, target):
+        if label not in memory_snapshots.snapshots:
+            raise await http_404_exc_memory_snapshot_not_found_request(label=label)
+    return await memory_snapshots.compare(base, target, group_by=group_by, top=top)
@@ -2,20 +2,24 @@ from typing import Annotated
 
 import fastapi
 from fastapi import Security
+from fastapi.responses import ORJSONResponse
 
 from src.api.dependencies.auth import get_auth_user
 from src.api.dependencies.repository import get_repository
 from src.api.dependencies.scopes import Scopes
+from src.api.responses import schema_list_response
 from src.repository.models.account import Account
-from src.repository.models.application import Application, ApplicationUser
+from src.repository.models.application import Application
 from src.schemas.application import SApplicationAns, SApplicationCreate, SApplication, SApplicationUpdate, \
-    SApplicationUserCreate, SApplicationUserUpdate, SApplicationUser
+    SApplicationUserCreate, SApplicationUserUpdate
 from src.repository.crud.application import ApplicationCRUDRepository
-from src.repository.exceptions import EntityDoesNotExist
+from src.repository.exceptions import EntityAlreadyExists, EntityDoesNotExist, EntityLimitReached
 from src.api.http_exceptions.exc_400 import http_400_exc_bad_email_request
 from src.api.http_exceptions.exc_404 import http_404_exc_id_not_found_request
 
-router = fastapi.APIRouter(prefix="/app", tags=["application"])
+router = fastapi.APIRouter(prefix="/app", tags=["application"], default_response_class=ORJSONResponse)
+
+MAX_ALLOWED_USERS = 30
 
 
 @router.get(
@@ -27,12 +31,10 @@ router = fastapi.APIRouter(prefix="/app", tags=["application"])
 async def get_app_list(
         account: Annotated[Account, Security(get_auth_user, scopes=[Scopes.user_dev_read.str])],
         app_repo: ApplicationCRUDRepository = fastapi.Depends(get_repository(repo_type=ApplicationCRUDRepository)),
-) -> list[SApplicationAns]:
+) -> fastapi.Response:
     apps = await app_repo.find_all(user=account.id)
-    ans_list = list()
-    for app in apps:
-        ans_list.append(SApplicationAns.model_validate(app))
-    return ans_list
+
+    return schema_list_response(SApplicationAns, apps, response_class=router.default_response_class)
 
 
 @router.post(
@@ -127,25 +129,24 @@ async def create_app_user(
         app_user_in_create: SApplicationUserCreate,
         app_repo: ApplicationCRUDRepository = fastapi.Depends(get_repository(repo_type=ApplicationCRUDRepository)),
 ) -> dict[str, str]:
-    app = await app_repo.find_by_id_or_none(app_id, user=account.id)
-    if app is None:
+    if not await app_repo.is_owned_by(app_id, user=account.id):
         raise await http_404_exc_id_not_found_request(app_id)
 
-    for allowed_user in app.allowed_users.copy():
-        if allowed_user.email == app_user_in_create.email:
-            raise await http_400_exc_bad_email_request(app_user_in_create.email)
-
-    app.allowed_users.append(ApplicationUser(**app_user_in_create.model_dump()))
-    await app_repo.commit_changes()
+    try:
+        await app_repo.add_allowed_user(app_id, data=app_user_in_create.model_dump(), max_users=MAX_ALLOWED_USERS)
+    except EntityLimitReached:
+        raise fastapi.HTTPException(status_code=400, detail="You have added the maximum number of users. To increase the allowed amount, your application must exit development mode")
+    except EntityAlreadyExists:
+        raise await http_400_exc_bad_email_request(app_user_in_create.email)
     return {"notification": "allowed user has been created"}
 
 
 @router.patch(
     path="/{app_id}/allowed_user/{app_user_id}",
-    name="app:create-applications-user",
+    name="app:update-applications-user",
     status_code=fastapi.status.HTTP_200_OK,
 )
-async def create_app_user(
+async def update_app_user(
         app_id: int,
         app_user_id: int,
         account: Annotated[
@@ -154,48 +155,36 @@ async def create_app_user(
         upp_user_update: SApplicationUserUpdate,
         app_repo: ApplicationCRUDRepository = fastapi.Depends(get_repository(repo_type=ApplicationCRUDRepository)),
 ) -> dict[str, str]:
-    app = await app_repo.find_by_id_or_none(app_id, user=account.id)
-    if app is None:
+    if not await app_repo.is_owned_by(app_id, user=account.id):
         raise await http_404_exc_id_not_found_request(app_id)
-    if len(app.allowed_users) >= 30:
-        raise fastapi.HTTPException(status_code=400, detail="You have added the maximum number of users. To increase the allowed amount, your application must exit development mode")
 
-    for allowed_user in app.allowed_users.copy():
-        s_app_user = SApplicationUser.model_validate(allowed_user)
-        if s_app_user.id == app_user_id:
-            app_user: ApplicationUser = allowed_user
-            app.allowed_users.remove(allowed_user)
-            break
-    else:
+    try:
+        await app_repo.update_allowed_user(app_id, app_user_id, data_to_update=upp_user_update.model_dump())
+    except EntityDoesNotExist:
         raise await http_404_exc_id_not_found_request(app_user_id)
-    app_user.fullname = upp_user_update.fullname if upp_user_update.fullname is not None else app_user.fullname
-    app_user.email = upp_user_update.email if upp_user_update.email is not None else app_user.email
-
-    app.allowed_users.append(app_user)
-    await app_repo.commit_changes()
+    except EntityAlreadyExists:
+        # Only a changed email can collide with another allowed user
+        assert upp_user_update.email is not None
+        raise await http_400_exc_bad_email_request(upp_user_update.email)
     return {"notification": "allowed user has been updated"}
 
 
 @router.delete(
     path="/{app_id}/allowed_user/{app_user_id}",
-    name="app:delete-application-by-id",
+    name="app:delete-applications-user",
     status_code=fastapi.status.HTTP_200_OK,
 )
-async def delete_app(
+async def delete_app_user(
         app_id: int,
-        app_user_id,
+        app_user_id: int,
         account: Annotated[Account, Security(get_auth_user, scopes=Scopes.get_scopes_strings(Scopes.USER_DEV))],
         app_repo: ApplicationCRUDRepository = fastapi.Depends(get_repository(repo_type=ApplicationCRUDRepository)),
 ) -> dict[str, str]:
-    app = await app_repo.find_by_id_or_none(app_id, user=account.id)
-    if app is None:
+    if not await app_repo.is_owned_by(app_id, user=account.id):
         raise await http_404_exc_id_not_found_request(app_id)
 
-    for allowed_user in app.allowed_users.copy():
-        if allowed_user.id == app_user_id:
-            app.allowed_users.remove(allowed_user)
-            break
-    else:
+    try:
+        await app_repo.delete_allowed_user(app_id, app_user_id)
+    except EntityDoesNotExist:
         raise await http_404_exc_id_not_found_request(app_user_id)
-    await app_repo.commit_changes()
     return {"notification": "allowed user has been deleted"}
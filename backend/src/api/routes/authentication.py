@@ -20,15 +20,14 @@ from src.api.dependencies.repository import get_repository
 from src.api.dependencies.scopes import Scopes
 from src.api.dependencies.session import get_async_session
 from src.config.manager import settings
-from src.repository.models.application import ApplicationUser
+from src.monitoring.queries import query_budget
 from src.schemas.account import AccountInCreate, AccountDetail
 from src.schemas.jwt import Tokens, SRefreshSession
 from src.repository.crud.account import AccountCRUDRepository
 from src.repository.crud.application import ApplicationCRUDRepository
 from src.repository.crud.refresh_session import RefreshCRUDRepository
-from src.repository.database import redis_client
 from src.securities.jwt import JWTGenerator, AuthTypes
-from src.repository.exceptions import EntityAlreadyExists
+from src.repository.exceptions import EntityAlreadyExists, EntityDoesNotExist
 from src.api.http_exceptions.exc_400 import http_400_exc_bad_email_request, http_400_exc_bad_username_request
 from src.api.http_exceptions.exc_401 import http_401_exc_bad_token_request, http_401_exc_expired_token_request
 
@@ -80,13 +79,8 @@ async def authorize(
             '/api/login' + params,
             status_code=fastapi.status.HTTP_302_FOUND)
 
-    if app.mode == "dev":
-        allowed_user = False
-        for app_user in app.allowed_users:  # type: ApplicationUser
-            if app_user.email == user.email:
-                allowed_user = True
-        if not allowed_user:
-            return "INVALID_CLIENT: email not allowed"
+    if app.mode == "dev" and not await app_repo.is_allowed_user(application_id=app.id, email=user.email):
+        return "INVALID_CLIENT: email not allowed"
 
     if response_type.lower().strip() == "token":
         tokens = await get_token_from_account(client_id=client_id, account=user, scope=scope, app_repo=app_repo)
@@ -100,7 +94,7 @@ async def authorize(
     code = secrets.token_urlsafe(64)
 
     data_dict = {'user_id': user.id, 'scope': scope, 'redirect_uri': redirect_uri, "code_challenge": code_challenge}
-    await redis_client.setex(name=f"code:{code}", value=json.dumps(data_dict), time=datetime.timedelta(minutes=5))
+    await request.app.state.redis.setex(name=f"code:{code}", value=json.dumps(data_dict), time=datetime.timedelta(minutes=5))
 
     return fastapi.responses.RedirectResponse(
         f"{redirect_uri}?code={code}&state={state}",
@@ -114,6 +108,7 @@ async def authorize(
     status_code=fastapi.status.HTTP_200_OK,
     response_model_exclude_none=True,
 )
+@query_budget(5)
 async def get_tokens(
         response: fastapi.Response,
         request: fastapi.Request,
@@ -194,7 +189,7 @@ async def refresh_tokens(
         raise await http_401_exc_bad_token_request()
     try:
         refresh_session = await refresh_session_repo.get_by_token(refresh_token=refresh_token)
-    except Exception:
+    except EntityDoesNotExist:
         raise await http_401_exc_bad_token_request()
 
     if refresh_session.expires_in < datetime.datetime.utcnow().timestamp():
@@ -208,7 +203,7 @@ async def refresh_tokens(
 
     try:
         db_account = await account_repo.find_by_id(id=refresh_session.account)
-    except Exception:
+    except EntityDoesNotExist:
         await refresh_session_repo.delete_by_id(refresh_session.id)
         raise await http_401_exc_bad_token_request()
 
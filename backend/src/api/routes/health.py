@@ -0,0 +1,32 @@
+import typing
+
+import fastapi
+
+router = fastapi.APIRouter(prefix="/health", tags=["health"])
+
+
+@router.get(
+    path="/live",
+    name="health:live",
+    status_code=fastapi.status.HTTP_200_OK,
+)
+async def get_liveness() -> dict[str, str]:
+    """
+    Answers as long as the event loop does; never touches a dependency.
+    """
+    return {"status": "alive"}
+
+
+@router.get(
+    path="/ready",
+    name="health:ready",
+    status_code=fastapi.status.HTTP_200_OK,
+)
+async def get_readiness(request: fastapi.Request, response: fastapi.Response) -> dict[str, typing.Any]:
+    """
+    Report the latest background probe of the database, Redis and warm-up; 503 until all of them pass.
+    """
+    health = request.app.state.health
+    if not health.is_ready:
+        response.status_code = fastapi.status.HTTP_503_SERVICE_UNAVAILABLE
+    return health.snapshot()
@@ -0,0 +1,26 @@
+import fastapi
+from fastapi.responses import PlainTextResponse
+
+from src.monitoring.aggregation import merge_dumps, read_worker_dumps
+from src.monitoring.metrics import REGISTRY, render_prometheus_text
+
+router = fastapi.APIRouter(tags=["monitoring"])
+
+
+@router.get(
+    path="/metrics",
+    name="monitoring:read-metrics",
+    response_class=PlainTextResponse,
+    status_code=fastapi.status.HTTP_200_OK,
+)
+async def get_metrics(request: fastapi.Request) -> PlainTextResponse:
+    """
+    Prometheus text exposition of this worker's metrics, summed with the other workers' when
+    `METRICS_MULTIPROCESS_DIR` is set.
+    """
+    dump = REGISTRY.dump()
+    publisher = getattr(request.app.state, "metrics_publisher", None)
+    if publisher is not None:
+        dump = merge_dumps([dump, *read_worker_dumps(publisher.directory, max_age=publisher.max_age)])
+
+    return PlainTextResponse(content=render_prometheus_text(dump), media_type="text/plain; version=0.0.4")
@@ -1,14 +1,81 @@
+import asyncio
 import typing
 
 import fastapi
 import loguru
 
-from src.repository.events import dispose_db_connection, initialize_db_connection
+from src.config.health import HealthProbe
+from src.config.logs import configure_logging, stop_logging
+from src.config.manager import settings
+from src.config.warmup import warm_up_backend
+from src.monitoring.aggregation import MetricsPublisher
+from src.monitoring.loop_lag import LoopLagMonitor
+from src.monitoring.memory import MemorySampler, MemorySnapshots
+from src.monitoring.profiler import StackSampler
+from src.monitoring.tracing import TraceExporter
+from src.monitoring.metrics import REGISTRY
+from src.repository.account_import import create_hash_executor
+from src.repository.purge import ExpiredSessionPurger
+from src.repository.events import (
+    dispose_db_connection,
+    dispose_redis_connection,
+    initialize_db_connection,
+    initialize_redis_connection,
+)
 
 
 def execute_backend_server_event_handler(backend_app: fastapi.FastAPI) -> typing.Any:
     async def launch_backend_server_events() -> None:
+        backend_app.state.log_sink = configure_logging()
+
+        backend_app.state.loop_monitor = LoopLagMonitor(
+            interval=settings.LOOP_MONITOR_INTERVAL_SECONDS,
+            threshold_ms=settings.LOOP_BLOCK_THRESHOLD_MS,
+        )
+        if settings.IS_LOOP_MONITOR_ENABLED:
+            backend_app.state.loop_monitor.start()
+        backend_app.state.profiler = StackSampler(interval=settings.PROFILER_SAMPLE_INTERVAL_MS / 1000)
+        backend_app.state.memory_snapshots = MemorySnapshots(capacity=settings.MEMORY_SNAPSHOTS_MAX)
+        backend_app.state.memory_sampler = MemorySampler(interval=settings.MEMORY_SAMPLE_INTERVAL_SECONDS)
+        backend_app.state.memory_sampler.start()
+
         await initialize_db_connection(backend_app=backend_app)
+        backend_app.state.hash_executor = create_hash_executor()
+        await initialize_redis_connection(backend_app=backend_app)
+        if settings.IS_WARM_UP_ENABLED:
+            await warm_up_backend(backend_app=backend_app)
+
+        backend_app.state.health = HealthProbe(
+            backend_app=backend_app,
+            interval=settings.HEALTH_PROBE_INTERVAL_SECONDS,
+            timeout=settings.HEALTH_PROBE_TIMEOUT_SECONDS,
+        )
+        backend_app.state.health.start()
+
+        if settings.REFRESH_SESSION_PURGE_INTERVAL_SECONDS > 0:
+            backend_app.state.session_purger = ExpiredSessionPurger(
+                async_engine=backend_app.state.db.async_engine,
+                interval=settings.REFRESH_SESSION_PURGE_INTERVAL_SECONDS,
+                batch_size=settings.REFRESH_SESSION_PURGE_BATCH_SIZE,
+            )
+            backend_app.state.session_purger.start()
+
+        if settings.IS_TRACING_ENABLED:
+            backend_app.state.trace_exporter = TraceExporter(
+                service_name=settings.TITLE,
+                interval=settings.TRACING_EXPORT_INTERVAL_SECONDS,
+                path=settings.TRACING_EXPORT_PATH,
+                url=settings.TRACING_EXPORT_URL,
+            )
+            backend_app.state.trace_exporter.start()
+
+        if settings.IS_METRICS_ENABLED and settings.METRICS_MULTIPROCESS_DIR:
+            backend_app.state.metrics_publisher = MetricsPublisher(
+                registry=REGISTRY,
+                directory=settings.METRICS_MULTIPROCESS_DIR,
+                interval=settings.METRICS_PUBLISH_INTERVAL_SECONDS,
+            )
+            backend_app.state.metrics_publisher.start()
 
     return launch_backend_server_events
 
@@ -16,6 +83,18 @@ def execute_backend_server_event_handler(backend_app: fastapi.FastAPI) -> typing
 def terminate_backend_server_event_handler(backend_app: fastapi.FastAPI) -> typing.Any:
     @loguru.logger.catch
     async def stop_backend_server_events() -> None:
+        await backend_app.state.health.stop()
+        if getattr(backend_app.state, "session_purger", None) is not None:
+            await backend_app.state.session_purger.stop()
+        if getattr(backend_app.state, "metrics_publisher", None) is not None:
+            await backend_app.state.metrics_publisher.stop()
+        if getattr(backend_app.state, "trace_exporter", None) is not None:
+            await backend_app.state.trace_exporter.stop()
+        await asyncio.to_thread(backend_app.state.hash_executor.shutdown, wait=True, cancel_futures=True)
         await dispose_db_connection(backend_app=backend_app)
+        await dispose_redis_connection(backend_app=backend_app)
+        await backend_app.state.memory_sampler.stop()
+        await backend_app.state.loop_monitor.stop()
+        stop_logging(backend_app.state.log_sink)
 
     return stop_backend_server_events
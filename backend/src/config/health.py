@@ -0,0 +1,113 @@
+import asyncio
+import time
+import typing
+
+import fastapi
+import loguru
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import QueuePool
+
+from src.config.manager import settings
+from src.repository.engine import create_single_connection_engine
+
+
+class HealthProbe:
+    """
+    Check the database, Redis and warm-up state of the app every `interval` seconds in the background and keep
+    the latest results, so that readiness probes read them instead of touching the dependencies themselves.
+
+    The database is checked over a dedicated single-connection engine, so a probe never waits behind user requests
+    for a pool connection, and a saturated pool never fails the probe.
+    """
+
+    def __init__(self, backend_app: fastapi.FastAPI, interval: float, timeout: float):
+        self.backend_app = backend_app
+        self.interval = interval
+        self.timeout = timeout
+        self.results: dict[str, dict[str, typing.Any]] = dict()
+        self.checked_at: float | None = None
+        self._engine: AsyncEngine | None = None
+        self._task: asyncio.Task | None = None
+
+    def _create_probe_engine(self) -> AsyncEngine:
+        return create_single_connection_engine(url=self.backend_app.state.db.set_async_db_uri, name="health")
+
+    async def _check_db(self) -> dict[str, typing.Any]:
+        async with self._engine.connect() as connection:  # type: ignore
+            await connection.exec_driver_sql("SELECT 1")
+
+        pool = self.backend_app.state.db.async_engine.pool
+        if not isinstance(pool, QueuePool):
+            return {}
+        return {"pool_size": pool.size(), "checked_out": pool.checkedout(), "overflow": pool.overflow()}
+
+    async def _check_redis(self) -> dict[str, typing.Any]:
+        await self.backend_app.state.redis.ping()
+        return {}
+
+    async def _check_warm_up(self) -> dict[str, typing.Any]:
+        if not settings.IS_WARM_UP_ENABLED:
+            return {"skipped": True}
+        warm_up = getattr(self.backend_app.state, "warm_up", None)
+        if warm_up is None:
+            raise RuntimeError("Warm-up has not finished")
+        return warm_up
+
+    async def _run_check(self, check: typing.Callable[[], typing.Awaitable[dict]]) -> dict[str, typing.Any]:
+        started_at = time.perf_counter()
+        try:
+            details = await asyncio.wait_for(check(), timeout=self.timeout)
+        except Exception as e:
+            return {"ok": False, "error": repr(e), "latency_ms": round((time.perf_counter() - started_at) * 1000, 3)}
+        return {"ok": True, "latency_ms": round((time.perf_counter() - started_at) * 1000, 3), **details}
+
+    async def probe(self) -> None:
+        db, redis, warm_up = await asyncio.gather(
+            self._run_check(self._check_db),
+            self._run_check(self._check_redis),
+            self._run_check(self._check_warm_up),
+        )
+        self.results = {"db": db, "redis": redis, "warm_up": warm_up}
+        self.checked_at = time.time()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.probe()
+            except Exception as e:
+                loguru.logger.exception(f"Health Probe --- probe failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        if self._task is not None:
+            return
+        self._engine = self._create_probe_engine()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._engine is not None:
+            await self._engine.dispose()
+            self._engine = None
+
+    @property
+    def is_fresh(self) -> bool:
+        # A probe loop that stopped updating must not keep reporting its last good result
+        return self.checked_at is not None and time.time() - self.checked_at <= 3 * self.interval + self.timeout
+
+    @property
+    def is_ready(self) -> bool:
+        return self.is_fresh and bool(self.results) and all(result["ok"] for result in self.results.values())
+
+    def snapshot(self) -> dict[str, typing.Any]:
+        return {
+            "status": "ready" if self.is_ready else "unavailable",
+            "checked_at": self.checked_at,
+            "checks": self.results,
+        }
@@ -0,0 +1,44 @@
+import logging
+import sys
+
+import loguru
+
+from src.config.manager import settings
+from src.monitoring.logs import InterceptHandler, JsonQueueSink, LogFilter, add_request_id
+
+
+def configure_logging() -> JsonQueueSink | None:
+    """
+    Send the app's `loguru` records and the standard `logging` records of `LOGGERS` through one filtered sink:
+    JSON lines written by a background thread with `IS_JSON_LOGS_ENABLED`, plain text on stderr otherwise (for
+    development; `loguru`'s `enqueue=True` costs more per call than it saves, see `tests/benchmarks/bench_logging`).
+    Returns the JSON sink, which must be stopped on shutdown to flush it.
+    """
+    log_filter = LogFilter(
+        rate_per_second=settings.LOG_RATE_LIMIT_PER_SECOND,
+        burst=settings.LOG_RATE_LIMIT_BURST,
+        sample_rates=settings.LOG_SAMPLE_RATES,
+    )
+    loguru.logger.remove()
+    loguru.logger.configure(patcher=add_request_id)
+
+    json_sink = None
+    if settings.IS_JSON_LOGS_ENABLED:
+        json_sink = JsonQueueSink(max_queue=settings.LOG_QUEUE_SIZE)
+        json_sink.start()
+        loguru.logger.add(json_sink, level=settings.LOGGING_LEVEL, filter=log_filter, format="{message}")
+    else:
+        loguru.logger.add(sys.stderr, level=settings.LOGGING_LEVEL, filter=log_filter)
+
+    for logger_name in settings.LOGGERS:
+        std_logger = logging.getLogger(logger_name)
+        std_logger.handlers = [InterceptHandler()]
+        std_logger.propagate = False
+
+    return json_sink
+
+
+def stop_logging(json_sink: JsonQueueSink | None) -> None:
+    loguru.logger.remove()
+    if json_sink is not None:
+        json_sink.stop()
@@ -1,16 +1,22 @@
+import typing
 from functools import lru_cache
 
 import decouple
 
-from src.config.settings.base import BackendBaseSettings
-from src.config.settings.mode import Environment, BackendDevSettings, BackendProdSettings, BackendStageSettings
+from src.config.settings.enums import Environment
+
+if typing.TYPE_CHECKING:
+    from src.config.settings.base import BackendBaseSettings
 
 
 class BackendSettingsFactory:
     def __init__(self, environment: str):
         self.environment = environment
 
-    def __call__(self) -> BackendBaseSettings:
+    def __call__(self) -> "BackendBaseSettings":
+        # Imported here: defining the settings classes already reads the environment
+        from src.config.settings.mode import BackendDevSettings, BackendProdSettings, BackendStageSettings
+
         if self.environment == Environment.DEVELOPMENT.value:
             return BackendDevSettings()
         elif self.environment == Environment.STAGING.value:
@@ -19,8 +25,18 @@ class BackendSettingsFactory:
 
 
 @lru_cache()
-def get_settings() -> BackendBaseSettings:
+def get_settings() -> "BackendBaseSettings":
     return BackendSettingsFactory(environment=decouple.config("ENVIRONMENT", default="DEV", cast=str))()  # type: ignore
 
 
-settings: BackendBaseSettings = get_settings()
+class LazySettings:
+    """
+    Stand-in for the settings object that only reads and validates the environment on first attribute access, so
+    that importing a module never does. `get_settings.cache_clear()` makes the next access read it again.
+    """
+
+    def __getattr__(self, name: str) -> typing.Any:
+        return getattr(get_settings(), name)
+
+
+settings: "BackendBaseSettings" = LazySettings()  # type: ignore
@@ -1,13 +1,28 @@
 import logging
+import os
 import pathlib
+import typing
 
 import decouple
 import pydantic
 from pydantic_settings import BaseSettings
 
+from src.config.settings.enums import DatabaseEngineProfile, ServerHttp, ServerLauncher, ServerLoop
+
 ROOT_DIR: pathlib.Path = pathlib.Path(__file__).parent.parent.parent.parent.parent.resolve()
 
 
+def parse_float_mapping(value: str) -> dict[str, float]:
+    """
+    Parse `name=number` pairs separated by commas, e.g. `admin:import-accounts=300,accounts:read-accounts=2`.
+    """
+    mapping = dict()
+    for item in decouple.Csv()(value):
+        name, _, number = item.rpartition("=")
+        mapping[name.strip()] = float(number)
+    return mapping
+
+
 class BackendBaseSettings(BaseSettings):
     TITLE: str = "PATTERN-FAST-API-PROJECT+JWT"
     VERSION: str = "0.1.0"
@@ -17,7 +32,19 @@ class BackendBaseSettings(BaseSettings):
 
     SERVER_HOST: str = decouple.config("BACKEND_SERVER_HOST", cast=str)  # type: ignore
     SERVER_PORT: int = decouple.config("BACKEND_SERVER_PORT", cast=int)  # type: ignore
+    # 0 sizes the workers from the CPUs available to the process
     SERVER_WORKERS: int = decouple.config("BACKEND_SERVER_WORKERS", cast=int)  # type: ignore
+    SERVER_LAUNCHER: ServerLauncher = decouple.config("BACKEND_SERVER_LAUNCHER", default="uvicorn", cast=ServerLauncher)  # type: ignore
+    SERVER_LOOP: ServerLoop = decouple.config("BACKEND_SERVER_LOOP", default="uvloop", cast=decouple.Choices(typing.get_args(ServerLoop)))  # type: ignore
+    SERVER_HTTP: ServerHttp = decouple.config("BACKEND_SERVER_HTTP", default="httptools", cast=decouple.Choices(typing.get_args(ServerHttp)))  # type: ignore
+    SERVER_BACKLOG: int = decouple.config("BACKEND_SERVER_BACKLOG", default=2048, cast=int)  # type: ignore
+    # Longer than the idle timeout of the usual load balancers (60 s), so that they never reuse a closed connection
+    SERVER_KEEP_ALIVE_SECONDS: int = decouple.config("BACKEND_SERVER_KEEP_ALIVE_SECONDS", default=65, cast=int)  # type: ignore
+    SERVER_GRACEFUL_TIMEOUT_SECONDS: int = decouple.config("BACKEND_SERVER_GRACEFUL_TIMEOUT_SECONDS", default=30, cast=int)  # type: ignore
+    SERVER_WORKER_BOOT_TIMEOUT_SECONDS: float = decouple.config("BACKEND_SERVER_WORKER_BOOT_TIMEOUT_SECONDS", default=60.0, cast=float)  # type: ignore
+    SERVER_MAX_REQUESTS: int = decouple.config("BACKEND_SERVER_MAX_REQUESTS", default=0, cast=int)  # type: ignore
+    SERVER_WORKER_MIN_UPTIME_SECONDS: float = decouple.config("BACKEND_SERVER_WORKER_MIN_UPTIME_SECONDS", default=10.0, cast=float)  # type: ignore
+    SERVER_WORKER_MAX_CRASHES: int = decouple.config("BACKEND_SERVER_WORKER_MAX_CRASHES", default=5, cast=int)  # type: ignore
     API_PREFIX: str = "/api"
     DOCS_URL: str = "/docs"
     OPENAPI_URL: str = "/openapi.json"
@@ -33,7 +60,24 @@ class BackendBaseSettings(BaseSettings):
     DB_POSTGRES_PORT: int = decouple.config("POSTGRES_PORT", cast=int)  # type: ignore
     DB_POSTGRES_SCHEMA: str = decouple.config("POSTGRES_SCHEMA", cast=str)  # type: ignore
     DB_TIMEOUT: int = decouple.config("DB_TIMEOUT", cast=int)  # type: ignore
+    DB_ROUTE_TIMEOUTS: dict[str, float] = decouple.config("DB_ROUTE_TIMEOUTS", default="", cast=parse_float_mapping)  # type: ignore
+    DB_TIMEOUT_RETRY_AFTER_SECONDS: int = decouple.config("DB_TIMEOUT_RETRY_AFTER_SECONDS", default=5, cast=int)  # type: ignore
     DB_POSTGRES_USERNAME: str = decouple.config("POSTGRES_USERNAME", cast=str)  # type: ignore
+    DB_ENGINE_PROFILE: DatabaseEngineProfile = decouple.config("DB_ENGINE_PROFILE", default="direct", cast=DatabaseEngineProfile)  # type: ignore
+    DB_POOL_RECYCLE_SECONDS: int = decouple.config("DB_POOL_RECYCLE_SECONDS", default=1800, cast=int)  # type: ignore
+    DB_STATEMENT_CACHE_SIZE: int = decouple.config("DB_STATEMENT_CACHE_SIZE", default=256, cast=int)  # type: ignore
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = decouple.config("DB_PREPARED_STATEMENT_CACHE_SIZE", default=256, cast=int)  # type: ignore
+    IS_DB_JIT: bool = decouple.config("IS_DB_JIT", default=False, cast=bool)  # type: ignore
+    IS_DB_POOL_CONTROLLER_ENABLED: bool = decouple.config("IS_DB_POOL_CONTROLLER_ENABLED", default=True, cast=bool)  # type: ignore
+    DB_POOL_CONTROLLER_INTERVAL_SECONDS: float = decouple.config("DB_POOL_CONTROLLER_INTERVAL_SECONDS", default=5.0, cast=float)  # type: ignore
+    DB_POOL_CONTROLLER_STEP: int = decouple.config("DB_POOL_CONTROLLER_STEP", default=2, cast=int)  # type: ignore
+    DB_POOL_MIN_OVERFLOW: int = decouple.config("DB_POOL_MIN_OVERFLOW", default=0, cast=int)  # type: ignore
+    DB_POOL_WAIT_HIGH_MS: float = decouple.config("DB_POOL_WAIT_HIGH_MS", default=20.0, cast=float)  # type: ignore
+    DB_POOL_WAIT_LOW_MS: float = decouple.config("DB_POOL_WAIT_LOW_MS", default=2.0, cast=float)  # type: ignore
+    DB_POOL_LOW_UTILIZATION: float = decouple.config("DB_POOL_LOW_UTILIZATION", default=0.5, cast=float)  # type: ignore
+    DB_POSTGRES_REPLICA_URIS: list[str] = decouple.config("POSTGRES_REPLICA_URIS", default="", cast=decouple.Csv())  # type: ignore
+    DB_REPLICA_RETRY_SECONDS: int = decouple.config("DB_REPLICA_RETRY_SECONDS", default=30, cast=int)  # type: ignore
+    DB_READ_YOUR_WRITES_SECONDS: int = decouple.config("DB_READ_YOUR_WRITES_SECONDS", default=5, cast=int)  # type: ignore
 
     REDIS_HOST: str = decouple.config("REDIS_HOST", cast=str)  # type: ignore
     REDIS_PASSWORD: str = decouple.config("REDIS_PASSWORD", cast=str)  # type: ignore
@@ -44,6 +88,51 @@ class BackendBaseSettings(BaseSettings):
     IS_DB_FORCE_ROLLBACK: bool = decouple.config("IS_DB_FORCE_ROLLBACK", cast=bool)  # type: ignore
     IS_DB_EXPIRE_ON_COMMIT: bool = decouple.config("IS_DB_EXPIRE_ON_COMMIT", cast=bool)  # type: ignore
 
+    IS_WARM_UP_ENABLED: bool = decouple.config("IS_WARM_UP_ENABLED", default=True, cast=bool)  # type: ignore
+    WARM_UP_CLIENT_IDS: list[str] = decouple.config("WARM_UP_CLIENT_IDS", default="", cast=decouple.Csv())  # type: ignore
+
+    HEALTH_PROBE_INTERVAL_SECONDS: float = decouple.config("HEALTH_PROBE_INTERVAL_SECONDS", default=5.0, cast=float)  # type: ignore
+    HEALTH_PROBE_TIMEOUT_SECONDS: float = decouple.config("HEALTH_PROBE_TIMEOUT_SECONDS", default=2.0, cast=float)  # type: ignore
+
+    IS_METRICS_ENABLED: bool = decouple.config("IS_METRICS_ENABLED", default=True, cast=bool)  # type: ignore
+    METRICS_MULTIPROCESS_DIR: str = decouple.config("METRICS_MULTIPROCESS_DIR", default="", cast=str)  # type: ignore
+    METRICS_PUBLISH_INTERVAL_SECONDS: float = decouple.config("METRICS_PUBLISH_INTERVAL_SECONDS", default=5.0, cast=float)  # type: ignore
+
+    DB_SLOW_QUERY_THRESHOLD_MS: float = decouple.config("DB_SLOW_QUERY_THRESHOLD_MS", default=200.0, cast=float)  # type: ignore
+    DB_SLOW_QUERY_LOG_SIZE: int = decouple.config("DB_SLOW_QUERY_LOG_SIZE", default=100, cast=int)  # type: ignore
+    DB_SLOW_QUERY_EXPLAIN_SAMPLE_RATE: float = decouple.config("DB_SLOW_QUERY_EXPLAIN_SAMPLE_RATE", default=0.1, cast=float)  # type: ignore
+
+    IS_LOOP_MONITOR_ENABLED: bool = decouple.config("IS_LOOP_MONITOR_ENABLED", default=True, cast=bool)  # type: ignore
+    LOOP_MONITOR_INTERVAL_SECONDS: float = decouple.config("LOOP_MONITOR_INTERVAL_SECONDS", default=0.5, cast=float)  # type: ignore
+    LOOP_BLOCK_THRESHOLD_MS: float = decouple.config("LOOP_BLOCK_THRESHOLD_MS", default=100.0, cast=float)  # type: ignore
+
+    PROFILER_SAMPLE_INTERVAL_MS: float = decouple.config("PROFILER_SAMPLE_INTERVAL_MS", default=10.0, cast=float)  # type: ignore
+    PROFILER_MAX_SECONDS: float = decouple.config("PROFILER_MAX_SECONDS", default=60.0, cast=float)  # type: ignore
+
+    MEMORY_SAMPLE_INTERVAL_SECONDS: float = decouple.config("MEMORY_SAMPLE_INTERVAL_SECONDS", default=10.0, cast=float)  # type: ignore
+    MEMORY_SNAPSHOTS_MAX: int = decouple.config("MEMORY_SNAPSHOTS_MAX", default=4, cast=int)  # type: ignore
+    TRACEMALLOC_FRAMES: int = decouple.config("TRACEMALLOC_FRAMES", default=1, cast=int)  # type: ignore
+
+    IS_SERVER_TIMING_ENABLED: bool = decouple.config("IS_SERVER_TIMING_ENABLED", default=False, cast=bool)  # type: ignore
+    SERVER_TIMING_LOG_SAMPLE_RATE: float = decouple.config("SERVER_TIMING_LOG_SAMPLE_RATE", default=0.0, cast=float)  # type: ignore
+
+    IS_QUERY_TRACKING_ENABLED: bool = decouple.config("IS_QUERY_TRACKING_ENABLED", default=True, cast=bool)  # type: ignore
+    QUERY_REPEAT_WARNING_THRESHOLD: int = decouple.config("QUERY_REPEAT_WARNING_THRESHOLD", default=5, cast=int)  # type: ignore
+
+    IS_TRACING_ENABLED: bool = decouple.config("IS_TRACING_ENABLED", default=False, cast=bool)  # type: ignore
+    TRACING_SAMPLE_RATE: float = decouple.config("TRACING_SAMPLE_RATE", default=0.05, cast=float)  # type: ignore
+    TRACING_TRUSTED_UPSTREAMS: list[str] = decouple.config("TRACING_TRUSTED_UPSTREAMS", default="", cast=decouple.Csv())  # type: ignore
+    TRACING_EXPORT_PATH: str = decouple.config("TRACING_EXPORT_PATH", default="", cast=str)  # type: ignore
+    TRACING_EXPORT_URL: str = decouple.config("TRACING_EXPORT_URL", default="", cast=str)  # type: ignore
+    TRACING_EXPORT_INTERVAL_SECONDS: float = decouple.config("TRACING_EXPORT_INTERVAL_SECONDS", default=5.0, cast=float)  # type: ignore
+
+    REFRESH_SESSION_PURGE_INTERVAL_SECONDS: float = decouple.config("REFRESH_SESSION_PURGE_INTERVAL_SECONDS", default=3600.0, cast=float)  # type: ignore
+    REFRESH_SESSION_PURGE_BATCH_SIZE: int = decouple.config("REFRESH_SESSION_PURGE_BATCH_SIZE", default=1000, cast=int)  # type: ignore
+
+    ACCOUNTS_BATCH_MAX_SIZE: int = decouple.config("ACCOUNTS_BATCH_MAX_SIZE", default=100, cast=int)  # type: ignore
+    BULK_IMPORT_BATCH_SIZE: int = decouple.config("BULK_IMPORT_BATCH_SIZE", default=1000, cast=int)  # type: ignore
+    BULK_IMPORT_HASH_WORKERS: int = decouple.config("BULK_IMPORT_HASH_WORKERS", default=0, cast=int)  # type: ignore
+
     API_TOKEN: str = decouple.config("API_TOKEN", cast=str)  # type: ignore
     AUTH_TOKEN: str = decouple.config("AUTH_TOKEN", cast=str)  # type: ignore
     JWT_TOKEN_PREFIX: str = decouple.config("JWT_TOKEN_PREFIX", cast=str)  # type: ignore
@@ -76,6 +165,12 @@ class BackendBaseSettings(BaseSettings):
 
     LOGGING_LEVEL: int = logging.INFO
     LOGGERS: tuple[str, str] = ("uvicorn.asgi", "uvicorn.access")
+    IS_JSON_LOGS_ENABLED: bool = decouple.config("IS_JSON_LOGS_ENABLED", default=False, cast=bool)  # type: ignore
+    LOG_QUEUE_SIZE: int = decouple.config("LOG_QUEUE_SIZE", default=10000, cast=int)  # type: ignore
+    LOG_RATE_LIMIT_PER_SECOND: float = decouple.config("LOG_RATE_LIMIT_PER_SECOND", default=100.0, cast=float)  # type: ignore
+    LOG_RATE_LIMIT_BURST: int = decouple.config("LOG_RATE_LIMIT_BURST", default=500, cast=int)  # type: ignore
+    # `module.prefix=share` pairs, e.g. `src.repository.events=0.1`
+    LOG_SAMPLE_RATES: dict[str, float] = decouple.config("LOG_SAMPLE_RATES", default="", cast=parse_float_mapping)  # type: ignore
 
     HASHING_ALGORITHM_LAYER_1: str = decouple.config("HASHING_ALGORITHM_LAYER_1", cast=str)  # type: ignore
     HASHING_ALGORITHM_LAYER_2: str = decouple.config("HASHING_ALGORITHM_LAYER_2", cast=str)  # type: ignore
@@ -88,6 +183,15 @@ class BackendBaseSettings(BaseSettings):
         validate_assignment: bool = True
         extra: str = 'ignore'
 
+    @property
+    def server_worker_count(self) -> int:
+        if self.SERVER_WORKERS > 0:
+            return self.SERVER_WORKERS
+        try:
+            return len(os.sched_getaffinity(0))
+        except AttributeError:
+            return os.cpu_count() or 1
+
     @property
     def set_backend_app_attributes(self) -> dict[str, str | bool | None]:
         """
@@ -0,0 +1,24 @@
+import enum
+import typing
+
+
+class Environment(str, enum.Enum):
+    PRODUCTION: str = "PROD"  # type: ignore
+    DEVELOPMENT: str = "DEV"  # type: ignore
+    STAGING: str = "STAGE"  # type:ignore
+
+
+class DatabaseEngineProfile(str, enum.Enum):
+    DIRECT: str = "direct"  # type: ignore
+    PGBOUNCER_TRANSACTION: str = "pgbouncer-transaction"  # type: ignore
+    SERVERLESS: str = "serverless"  # type: ignore
+
+
+class ServerLauncher(str, enum.Enum):
+    UVICORN: str = "uvicorn"  # type: ignore
+    PREFORK: str = "prefork"  # type: ignore
+
+
+# The event loop and HTTP protocol implementations uvicorn accepts
+ServerLoop = typing.Literal["none", "auto", "asyncio", "uvloop"]
+ServerHttp = typing.Literal["auto", "h11", "httptools"]
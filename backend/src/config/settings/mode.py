@@ -1,11 +1,5 @@
-import enum
 from src.config.settings.base import BackendBaseSettings
-
-
-class Environment(str, enum.Enum):
-    PRODUCTION: str = "PROD"  # type: ignore
-    DEVELOPMENT: str = "DEV"  # type: ignore
-    STAGING: str = "STAGE"  # type:ignore
+from src.config.settings.enums import Environment
 
 
 class BackendDevSettings(BackendBaseSettings):
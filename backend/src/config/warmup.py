@@ -0,0 +1,92 @@
+import asyncio
+import contextlib
+import time
+import typing
+
+import fastapi
+import loguru
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import configure_mappers
+
+from src.api.routes.login import templates
+from src.config.manager import settings
+from src.repository.crud.account import AccountCRUDRepository
+from src.repository.crud.application import ApplicationCRUDRepository
+from src.securities.jwt import JWTGenerator
+
+
+async def _open_db_connections(engine: AsyncEngine, count: int) -> None:
+    async with contextlib.AsyncExitStack() as stack:
+        connections = [await stack.enter_async_context(engine.connect()) for _ in range(count)]
+        await asyncio.gather(*(connection.exec_driver_sql("SELECT 1") for connection in connections))
+
+
+async def warm_up_db_pool(backend_app: fastapi.FastAPI) -> None:
+    for engine in [backend_app.state.db.async_engine, *backend_app.state.db.replicas.engines]:
+        await _open_db_connections(engine, count=settings.DB_POOL_SIZE)
+
+
+async def warm_up_redis(backend_app: fastapi.FastAPI) -> None:
+    await backend_app.state.redis.ping()
+
+
+async def warm_up_mappers(backend_app: fastapi.FastAPI) -> None:
+    configure_mappers()
+
+
+async def warm_up_templates(backend_app: fastapi.FastAPI) -> None:
+    for template_name in templates.env.list_templates():
+        templates.get_template(template_name)
+
+
+async def warm_up_jwt(backend_app: fastapi.FastAPI) -> None:
+    token = JWTGenerator._generate_jwt_token(jwt_data={"sub": "warm-up"})
+    JWTGenerator.retrieve_data_from_token(token)
+
+
+async def warm_up_statements(backend_app: fastapi.FastAPI) -> None:
+    """
+    Build the cached repository selects and run the client lookup once, so that SQLAlchemy has compiled the hot
+    statements before the first request needs them.
+    """
+    AccountCRUDRepository._get_select_statement({"id": 0})
+    AccountCRUDRepository._get_select_statement({"username": ""})
+
+    async with backend_app.state.db.async_session_factory() as async_session:
+        app_repo = ApplicationCRUDRepository(async_session=async_session)
+        for client_id in settings.WARM_UP_CLIENT_IDS or [settings.CLIENT_ID]:
+            await app_repo.find_by_client_id_or_none(client_id=client_id)
+
+
+WARM_UP_STEPS: list[tuple[str, typing.Callable[[fastapi.FastAPI], typing.Awaitable[None]]]] = [
+    ("db pool", warm_up_db_pool),
+    ("redis", warm_up_redis),
+    ("mappers", warm_up_mappers),
+    ("templates", warm_up_templates),
+    ("jwt", warm_up_jwt),
+    ("statements", warm_up_statements),
+]
+
+
+async def warm_up_backend(backend_app: fastapi.FastAPI) -> None:
+    """
+    Pay the first-request costs before the worker starts serving. A failing step is logged and skipped, since a
+    cold path is still a working one.
+    """
+    loguru.logger.info("Warm-up --- Starting . . .")
+    started_at = time.perf_counter()
+    failed_steps = list()
+
+    for step_name, step in WARM_UP_STEPS:
+        step_started_at = time.perf_counter()
+        try:
+            await step(backend_app)
+        except Exception as e:
+            loguru.logger.warning(f"Warm-up --- {step_name} failed: {e!r}")
+            failed_steps.append(step_name)
+            continue
+        loguru.logger.info(f"Warm-up --- {step_name} done in {(time.perf_counter() - step_started_at) * 1000:.1f} ms")
+
+    duration_ms = round((time.perf_counter() - started_at) * 1000, 1)
+    backend_app.state.warm_up = {"finished": True, "failed_steps": failed_steps, "duration_ms": duration_ms}
+    loguru.logger.info(f"Warm-up --- Finished in {duration_ms} ms")
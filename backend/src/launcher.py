@@ -0,0 +1,262 @@
+"""
+Pre-fork production server: the parent process imports and builds the application once, binds the listening
+socket and forks the workers, which share the parent's memory pages copy-on-write instead of each importing the
+whole stack. Every worker runs uvicorn on the shared socket with its own event loop and its own database and Redis
+connections, opened by the lifespan handler after the fork.
+
+    python -m src.launcher          # or `BACKEND_SERVER_LAUNCHER=prefork python -m src.main`
+
+The parent never collects garbage: `gc` is disabled before the application is built, everything is frozen right
+before each fork and the collector is enabled again in the worker.
+
+Signals to the parent: `SIGTERM`/`SIGINT` stop the workers gracefully, `SIGHUP` restarts them one at a time, each
+new worker being ready (warm-up included) before the one it replaces is stopped. Workers that exit, e.g. after
+`SERVER_MAX_REQUESTS`, are replaced. A worker that exits within `SERVER_WORKER_MIN_UPTIME_SECONDS` counts as a
+crash: every consecutive crash doubles the delay before workers are respawned, and after
+`SERVER_WORKER_MAX_CRASHES` of them the parent stops with a non-zero status instead of respawning forever.
+"""
+import asyncio
+import contextlib
+import gc
+import os
+import random
+import select
+import signal
+import socket
+import sys
+import time
+import typing
+
+import fastapi
+import loguru
+import uvicorn
+
+from src.config.manager import settings
+
+
+class PreforkServer:
+    # Delay before respawning after the first crash, doubled for every further consecutive crash
+    RESPAWN_BACKOFF_SECONDS: typing.ClassVar[float] = 0.5
+    RESPAWN_BACKOFF_MAX_SECONDS: typing.ClassVar[float] = 30.0
+
+    def __init__(self, app: fastapi.FastAPI, workers: int):
+        self.app = app
+        self.worker_count = workers
+        # Start time of every running worker
+        self.workers: dict[int, float] = dict()
+        # Workers asked to stop, which must not be replaced when they exit
+        self._retiring: set[int] = set()
+        self.socket: socket.socket | None = None
+        self.crashes: int = 0
+        self.exit_code: int = 0
+        self._last_crash_at = float("-inf")
+        self._pending_respawns: int = 0
+        self._respawn_at: float = 0.0
+        self._should_exit = False
+        self._should_restart = False
+
+    def _create_config(self) -> uvicorn.Config:
+        max_requests = settings.SERVER_MAX_REQUESTS
+        if max_requests:
+            # Jittered so that the workers started together do not all restart together
+            max_requests += random.randint(0, max_requests // 10)
+        return uvicorn.Config(
+            app=self.app,
+            host=settings.SERVER_HOST,
+            port=settings.SERVER_PORT,
+            loop=settings.SERVER_LOOP,
+            http=settings.SERVER_HTTP,
+            backlog=settings.SERVER_BACKLOG,
+            timeout_keep_alive=settings.SERVER_KEEP_ALIVE_SECONDS,
+            timeout_graceful_shutdown=settings.SERVER_GRACEFUL_TIMEOUT_SECONDS,
+            limit_max_requests=max_requests or None,
+            log_level=settings.LOGGING_LEVEL,
+            proxy_headers=True,
+        )
+
+    @staticmethod
+    async def _serve(server: uvicorn.Server, listening_socket: socket.socket, ready_fd: int) -> None:
+        serve_task = asyncio.create_task(server.serve(sockets=[listening_socket]))
+        while not server.started and not serve_task.done():
+            await asyncio.sleep(0.05)
+        # The parent only listens for readiness during rolling restarts
+        with contextlib.suppress(BrokenPipeError):
+            if server.started:
+                os.write(ready_fd, b"1")
+        os.close(ready_fd)
+        await serve_task
+
+    def _run_worker(self, ready_fd: int) -> None:
+        for signum in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP):
+            signal.signal(signum, signal.SIG_DFL)
+        random.seed()
+        gc.enable()
+
+        config = self._create_config()
+        config.setup_event_loop()
+        asyncio.run(self._serve(uvicorn.Server(config), self.socket, ready_fd))  # type: ignore
+
+    def _spawn_worker(self) -> tuple[int, int]:
+        ready_read_fd, ready_write_fd = os.pipe()
+        # Everything the parent holds is shared with the worker: out of the collector's generations, the worker's
+        # collections never write to those pages
+        gc.freeze()
+        pid = os.fork()
+        if pid == 0:
+            os.close(ready_read_fd)
+            exit_code = 0
+            try:
+                self._run_worker(ready_write_fd)
+            except BaseException:
+                loguru.logger.exception("Prefork Server --- worker crashed")
+                exit_code = 1
+            finally:
+                os._exit(exit_code)
+
+        os.close(ready_write_fd)
+        self.workers[pid] = time.monotonic()
+        return pid, ready_read_fd
+
+    def _wait_until_ready(self, pid: int, ready_fd: int) -> bool:
+        try:
+            readable, _, _ = select.select([ready_fd], [], [], settings.SERVER_WORKER_BOOT_TIMEOUT_SECONDS)
+            is_ready = bool(readable) and os.read(ready_fd, 1) == b"1"
+        finally:
+            os.close(ready_fd)
+        if not is_ready:
+            loguru.logger.error(f"Prefork Server --- worker {pid} did not become ready")
+        return is_ready
+
+    def _signal_worker(self, pid: int, signum: int) -> None:
+        try:
+            os.kill(pid, signum)
+        except ProcessLookupError:
+            pass
+
+    def _stop_worker(self, pid: int) -> None:
+        self._retiring.add(pid)
+        self._signal_worker(pid, signal.SIGTERM)
+
+    def _reap_workers(self) -> list[float]:
+        """
+        Collect the workers that exited and return the start times of those that exited on their own and must be
+        replaced.
+        """
+        exited = list()
+        while self.workers:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+            if pid == 0:
+                break
+            started_at = self.workers.pop(pid, None)
+            if started_at is None:
+                continue
+            exit_code = os.waitstatus_to_exitcode(status)
+            if pid in self._retiring:
+                self._retiring.discard(pid)
+            else:
+                exited.append(started_at)
+                loguru.logger.warning(f"Prefork Server --- worker {pid} exited with status {exit_code}")
+        return exited
+
+    def _schedule_respawn(self, started_at: float) -> None:
+        """
+        Queue the replacement of a worker that exited on its own. Workers that crash together (all of them failing
+        at boot, say) count as one crash: only a worker started after the last counted crash adds another.
+        """
+        self._pending_respawns += 1
+        now = time.monotonic()
+        if now - started_at >= settings.SERVER_WORKER_MIN_UPTIME_SECONDS:
+            self.crashes = 0
+            return
+        if started_at <= self._last_crash_at:
+            return
+
+        self.crashes += 1
+        self._last_crash_at = now
+        if self.crashes >= settings.SERVER_WORKER_MAX_CRASHES:
+            loguru.logger.error(
+                f"Prefork Server --- workers crashed within {settings.SERVER_WORKER_MIN_UPTIME_SECONDS}s"
+                f" {self.crashes} times in a row, giving up"
+            )
+            self.exit_code = 1
+            self._should_exit = True
+            return
+        delay = min(self.RESPAWN_BACKOFF_MAX_SECONDS, self.RESPAWN_BACKOFF_SECONDS * 2 ** (self.crashes - 1))
+        self._respawn_at = now + delay
+        loguru.logger.warning(f"Prefork Server --- worker crash {self.crashes} in a row, respawning in {delay}s")
+
+    def _respawn_workers(self) -> None:
+        if self._pending_respawns and time.monotonic() >= self._respawn_at:
+            for _ in range(self._pending_respawns):
+                os.close(self._spawn_worker()[1])
+            self._pending_respawns = 0
+
+    def _rolling_restart(self) -> None:
+        loguru.logger.info("Prefork Server --- Rolling restart . . .")
+        for old_pid in list(self.workers):
+            new_pid, ready_fd = self._spawn_worker()
+            if not self._wait_until_ready(new_pid, ready_fd):
+                # Keep the old worker serving rather than trading it for a broken one
+                self._stop_worker(new_pid)
+                loguru.logger.error("Prefork Server --- Rolling restart aborted")
+                return
+            self._stop_worker(old_pid)
+        loguru.logger.info("Prefork Server --- Rolling restart done")
+
+    def _handle_signal(self, signum: int, frame: typing.Any) -> None:
+        if signum == signal.SIGHUP:
+            self._should_restart = True
+        else:
+            self._should_exit = True
+
+    def _shutdown(self) -> None:
+        for pid in list(self.workers):
+            self._stop_worker(pid)
+        deadline = time.monotonic() + settings.SERVER_GRACEFUL_TIMEOUT_SECONDS + 5
+        while self.workers and time.monotonic() < deadline:
+            self._reap_workers()
+            time.sleep(0.1)
+        for pid in self.workers:
+            self._signal_worker(pid, signal.SIGKILL)
+        self.socket.close()  # type: ignore
+
+    def run(self) -> None:
+        config = self._create_config()
+        self.socket = config.bind_socket()
+        for signum in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP):
+            signal.signal(signum, self._handle_signal)
+
+        loguru.logger.info(f"Prefork Server --- Starting {self.worker_count} workers on {self.socket.getsockname()}")
+        for _ in range(self.worker_count):
+            os.close(self._spawn_worker()[1])
+
+        while not self._should_exit:
+            time.sleep(0.2)
+            if self._should_restart:
+                self._should_restart = False
+                self._rolling_restart()
+            for started_at in self._reap_workers():
+                self._schedule_respawn(started_at)
+            if not self._should_exit:
+                self._respawn_workers()
+
+        loguru.logger.info("Prefork Server --- Stopping . . .")
+        self._shutdown()
+
+
+def run_prefork_server() -> None:
+    # No collections in the parent: freed objects would leave holes in the pages the workers share (see `gc.freeze`)
+    gc.disable()
+    # Imported here: the launcher module itself stays importable without building the application
+    from src.main import initialize_backend_application
+
+    server = PreforkServer(app=initialize_backend_application(), workers=settings.server_worker_count)
+    server.run()
+    sys.exit(server.exit_code)
+
+
+if __name__ == "__main__":
+    run_prefork_server()
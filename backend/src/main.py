@@ -1,16 +1,51 @@
+import functools
+import typing
+
 import fastapi
 import uvicorn
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.staticfiles import StaticFiles
 
 from src.api.endpoints import router as api_endpoint_router
+from src.api.middlewares.disconnect import CancelOnDisconnectMiddleware
+from src.api.middlewares.metrics import MetricsMiddleware
+from src.api.middlewares.queries import QueryTrackingMiddleware
+from src.api.middlewares.read_your_writes import ReadYourWritesMiddleware
+from src.api.middlewares.request_id import RequestIdMiddleware
+from src.api.middlewares.server_timing import ServerTimingMiddleware
+from src.api.middlewares.tracing import TracingMiddleware
+from src.api.routes.health import router as health_router
+from src.api.routes.metrics import router as metrics_router
 from src.config.events import execute_backend_server_event_handler, terminate_backend_server_event_handler
 from src.config.manager import settings
+from src.config.settings.enums import Environment, ServerLauncher
 
 
 def initialize_backend_application() -> fastapi.FastAPI:
+    """
+    Build a new application. Nothing is connected here: the database engine and the Redis client are created by
+    the startup handler and live on `app.state`, so every application owns its own resources.
+    """
     app = fastapi.FastAPI(**settings.set_backend_app_attributes)  # type: ignore
 
+    app.add_middleware(ReadYourWritesMiddleware)
+    app.add_middleware(CancelOnDisconnectMiddleware)
+    if settings.IS_TRACING_ENABLED:
+        app.add_middleware(
+            TracingMiddleware,
+            sample_rate=settings.TRACING_SAMPLE_RATE,
+            trusted_upstreams=settings.TRACING_TRUSTED_UPSTREAMS,
+        )
+    if settings.IS_SERVER_TIMING_ENABLED:
+        app.add_middleware(ServerTimingMiddleware, log_sample_rate=settings.SERVER_TIMING_LOG_SAMPLE_RATE)
+    if settings.IS_QUERY_TRACKING_ENABLED:
+        repeat_threshold = settings.QUERY_REPEAT_WARNING_THRESHOLD
+        app.add_middleware(
+            QueryTrackingMiddleware,
+            repeat_threshold=repeat_threshold if settings.ENVIRONMENT == Environment.DEVELOPMENT else 0,  # type: ignore
+        )
+    if settings.IS_METRICS_ENABLED:
+        app.add_middleware(MetricsMiddleware)
     app.add_middleware(
         CORSMiddleware,
         allow_origins=settings.ALLOWED_ORIGINS,
@@ -18,6 +53,7 @@ def initialize_backend_application() -> fastapi.FastAPI:
         allow_methods=settings.ALLOWED_METHODS,
         allow_headers=settings.ALLOWED_HEADERS,
     )
+    app.add_middleware(RequestIdMiddleware)
 
     app.add_event_handler(
         "startup",
@@ -30,18 +66,42 @@ def initialize_backend_application() -> fastapi.FastAPI:
 
     app.mount("/static", StaticFiles(directory="static", html=True), name="static")
     app.include_router(router=api_endpoint_router, prefix=settings.API_PREFIX)
+    # Probes hit fixed paths outside of the versioned API
+    app.include_router(router=health_router)
+    if settings.IS_METRICS_ENABLED:
+        app.include_router(router=metrics_router)
 
     return app
 
 
-backend_app: fastapi.FastAPI = initialize_backend_application()
+@functools.lru_cache()
+def get_backend_application() -> fastapi.FastAPI:
+    return initialize_backend_application()
+
+
+def __getattr__(name: str) -> typing.Any:
+    # `main:backend_app` keeps working, but the application is only built when it is first asked for
+    if name == "backend_app":
+        return get_backend_application()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 if __name__ == "__main__":
-    uvicorn.run(
-        app="main:backend_app",
-        host=settings.SERVER_HOST,
-        port=settings.SERVER_PORT,
-        reload=settings.DEBUG,
-        workers=settings.SERVER_WORKERS,
-        log_level=settings.LOGGING_LEVEL,
-    )
+    if settings.SERVER_LAUNCHER == ServerLauncher.PREFORK:
+        from src.launcher import run_prefork_server
+
+        run_prefork_server()
+    else:
+        uvicorn.run(
+            app="main:initialize_backend_application",
+            factory=True,
+            host=settings.SERVER_HOST,
+            port=settings.SERVER_PORT,
+            reload=settings.DEBUG,
+            workers=settings.server_worker_count,
+            loop=settings.SERVER_LOOP,
+            http=settings.SERVER_HTTP,
+            backlog=settings.SERVER_BACKLOG,
+            timeout_keep_alive=settings.SERVER_KEEP_ALIVE_SECONDS,
+            log_level=settings.LOGGING_LEVEL,
+        )
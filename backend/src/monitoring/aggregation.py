@@ -0,0 +1,112 @@
+import asyncio
+import os
+import pathlib
+import time
+import typing
+
+import loguru
+import orjson
+
+from src.monitoring.metrics import MetricsRegistry
+
+WORKER_DUMP_PREFIX: str = "metrics-"
+
+
+def _worker_dump_path(directory: str, pid: int) -> pathlib.Path:
+    return pathlib.Path(directory) / f"{WORKER_DUMP_PREFIX}{pid}.json"
+
+
+def write_worker_dump(directory: str, dump: dict[str, typing.Any]) -> None:
+    """
+    Publish this worker's registry dump for the other workers; written to a temporary file and renamed, so that a
+    reader never sees half of it.
+    """
+    path = _worker_dump_path(directory, os.getpid())
+    temporary_path = path.with_suffix(".tmp")
+    temporary_path.write_bytes(orjson.dumps(dump))
+    os.replace(temporary_path, path)
+
+
+def remove_worker_dump(directory: str) -> None:
+    _worker_dump_path(directory, os.getpid()).unlink(missing_ok=True)
+
+
+def read_worker_dumps(directory: str, max_age: float) -> list[dict[str, typing.Any]]:
+    """
+    Read the dumps of every other worker, skipping the ones that have not been refreshed for `max_age` seconds.
+    """
+    own_path = _worker_dump_path(directory, os.getpid())
+    dumps = list()
+    for path in pathlib.Path(directory).glob(f"{WORKER_DUMP_PREFIX}*.json"):
+        try:
+            if path == own_path or time.time() - path.stat().st_mtime > max_age:
+                continue
+            dumps.append(orjson.loads(path.read_bytes()))
+        except (OSError, orjson.JSONDecodeError):
+            continue
+    return dumps
+
+
+def merge_dumps(dumps: list[dict[str, typing.Any]]) -> dict[str, typing.Any]:
+    """
+    Sum the samples of several workers label set by label set: counters and gauges add up, histograms add up
+    bucket by bucket.
+    """
+    merged: dict[str, typing.Any] = dict()
+    for dump in dumps:
+        for name, family in dump.items():
+            merged_family = merged.setdefault(name, {**family, "values": dict()})
+            for label_values, value in family["values"]:
+                key = tuple(label_values)
+                current = merged_family["values"].get(key)
+                if current is None:
+                    merged_family["values"][key] = list(value) if isinstance(value, list) else value
+                elif isinstance(value, list):
+                    merged_family["values"][key] = [a + b for a, b in zip(current, value)]
+                else:
+                    merged_family["values"][key] = current + value
+
+    for family in merged.values():
+        family["values"] = [[list(label_values), value] for label_values, value in family["values"].items()]
+    return merged
+
+
+class MetricsPublisher:
+    """
+    Write the worker's registry dump into the shared `directory` every `interval` seconds, so that whichever
+    worker answers `/metrics` can add up all of them.
+    """
+
+    def __init__(self, registry: MetricsRegistry, directory: str, interval: float):
+        self.registry = registry
+        self.directory = directory
+        self.interval = interval
+        self._task: asyncio.Task | None = None
+
+    @property
+    def max_age(self) -> float:
+        return 3 * self.interval
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                write_worker_dump(self.directory, self.registry.dump())
+            except OSError as e:
+                loguru.logger.warning(f"Metrics --- unable to publish worker metrics: {e!r}")
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        if self._task is None:
+            os.makedirs(self.directory, exist_ok=True)
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        remove_worker_dump(self.directory)
@@ -0,0 +1,162 @@
+import collections
+import contextvars
+import logging
+import queue
+import random
+import sys
+import threading
+import time
+import traceback
+import typing
+
+import loguru
+import orjson
+
+# Set per request by `RequestIdMiddleware` and copied into every record logged while handling it
+request_id: contextvars.ContextVar[str | None] = contextvars.ContextVar("request_id", default=None)
+
+WARNING_LEVEL_NO: int = logging.WARNING
+
+
+def add_request_id(record: "loguru.Record") -> None:
+    """
+    `loguru` patcher: it runs in the thread that logs, where the request's context is still current.
+    """
+    current_request_id = request_id.get()
+    if current_request_id is not None:
+        record["extra"]["request_id"] = current_request_id
+
+
+class InterceptHandler(logging.Handler):
+    """
+    Route standard `logging` records (uvicorn, SQLAlchemy) into `loguru`, so that they reach the same sinks.
+    """
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            level: str | int = loguru.logger.level(record.levelname).name
+        except ValueError:
+            level = record.levelno
+        loguru.logger.opt(depth=6, exception=record.exc_info).log(level, record.getMessage())
+
+
+class LogFilter:
+    """
+    Drop part of the high-volume records below WARNING, per logger (the module name):
+
+    - sampling: keep a `sample_rates[logger]` share of them (the longest matching module prefix wins), or the
+      `sample_rate` bound on the record, `logger.bind(sample_rate=0.01).info(...)`;
+    - rate limiting: a token bucket lets each logger through `rate_per_second` on average, with bursts of `burst`.
+
+    Warnings and errors are always kept.
+    """
+
+    def __init__(self, rate_per_second: float, burst: int, sample_rates: dict[str, float]):
+        self.rate_per_second = rate_per_second
+        self.burst = burst
+        self.sample_rates = sample_rates
+        self.suppressed: collections.Counter[str] = collections.Counter()
+        self._buckets: dict[str, list[float]] = dict()
+        self._logger_sample_rates: dict[str, float] = dict()
+
+    def _get_sample_rate(self, name: str) -> float:
+        sample_rate = self._logger_sample_rates.get(name)
+        if sample_rate is None:
+            prefixes = [prefix for prefix in self.sample_rates if name == prefix or name.startswith(f"{prefix}.")]
+            sample_rate = self.sample_rates[max(prefixes, key=len)] if prefixes else 1.0
+            self._logger_sample_rates[name] = sample_rate
+        return sample_rate
+
+    def _take_token(self, name: str) -> bool:
+        now = time.monotonic()
+        bucket = self._buckets.get(name)
+        if bucket is None:
+            bucket = self._buckets[name] = [float(self.burst), now]
+        bucket[0] = min(float(self.burst), bucket[0] + (now - bucket[1]) * self.rate_per_second)
+        bucket[1] = now
+        if bucket[0] < 1:
+            return False
+        bucket[0] -= 1
+        return True
+
+    def __call__(self, record: "loguru.Record") -> bool:
+        if record["level"].no >= WARNING_LEVEL_NO:
+            return True
+
+        name = record["name"] or ""
+        sample_rate = record["extra"].get("sample_rate", self._get_sample_rate(name))
+        if sample_rate < 1.0 and random.random() >= sample_rate:
+            return False
+        if self.rate_per_second and not self._take_token(name):
+            self.suppressed[name] += 1
+            return False
+        return True
+
+
+class JsonQueueSink:
+    """
+    `loguru` sink writing one JSON object per line. The logging call only turns the record into a dict and puts
+    it on a bounded queue; a writer thread encodes and writes the lines in batches, so a slow stream never blocks
+    the event loop. When the queue is full, records are dropped and counted rather than waited for.
+    """
+
+    def __init__(self, stream: typing.TextIO | None = None, max_queue: int = 10_000, batch_size: int = 256):
+        self.stream = stream or sys.stdout
+        self.batch_size = batch_size
+        self.dropped: int = 0
+        self._queue: queue.Queue[dict[str, typing.Any] | None] = queue.Queue(maxsize=max_queue)
+        self._thread: threading.Thread | None = None
+
+    def __call__(self, message: typing.Any) -> None:
+        record = message.record
+        entry = {
+            "time": record["time"].isoformat(),
+            "level": record["level"].name,
+            "logger": record["name"],
+            "function": record["function"],
+            "line": record["line"],
+            "message": record["message"],
+            **record["extra"],
+        }
+        if record["exception"] is not None:
+            entry["exception"] = "".join(traceback.format_exception(*record["exception"]))
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            self.dropped += 1
+
+    def _write_batches(self) -> None:
+        stream = self.stream.buffer if hasattr(self.stream, "buffer") else None
+        while True:
+            entry = self._queue.get()
+            batch = list()
+            while entry is not None:
+                batch.append(orjson.dumps(entry, default=str))
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    entry = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+
+            if batch:
+                lines = b"\n".join(batch) + b"\n"
+                if stream is not None:
+                    stream.write(lines)
+                else:
+                    self.stream.write(lines.decode())
+                self.stream.flush()
+            if entry is None:
+                return
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._write_batches, name="json-log-writer", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        if self._thread is None:
+            return
+        self._queue.put(None)
+        self._thread.join(timeout=timeout)
+        self._thread = None
@@ -0,0 +1,106 @@
+import asyncio
+import collections
+import sys
+import threading
+import time
+import traceback
+import typing
+
+import loguru
+
+from src.monitoring.metrics import EVENT_LOOP_BLOCKS, EVENT_LOOP_LAG
+
+
+class LoopLagMonitor:
+    """
+    Detect synchronous work blocking the event loop (password hashing, template rendering, token decoding...).
+
+    A heartbeat task sleeps for `interval` and records how late it woke up as the loop lag. A monitor thread
+    watches the heartbeat: when it is more than `threshold_ms` overdue, the loop is stuck in some callback right
+    now, so the thread grabs the stack of the loop thread and counts it. The stacks that blocked the loop most
+    often are kept for the admin route.
+    """
+
+    def __init__(self, interval: float, threshold_ms: float, stack_depth: int = 12, max_stacks: int = 256):
+        self.interval = interval
+        self.threshold = threshold_ms / 1000
+        self.stack_depth = stack_depth
+        self.max_stacks = max_stacks
+
+        self.stacks: collections.Counter[tuple[str, ...]] = collections.Counter()
+        self.max_lag: float = 0.0
+        self._lock = threading.Lock()
+        self._last_beat: float = time.monotonic()
+        self._loop_thread_id: int | None = None
+        self._task: asyncio.Task | None = None
+        self._thread: threading.Thread | None = None
+        self._stopped = threading.Event()
+
+    async def _beat(self) -> None:
+        while True:
+            started_at = time.monotonic()
+            self._last_beat = started_at
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, time.monotonic() - started_at - self.interval)
+            self._last_beat = time.monotonic()
+
+            EVENT_LOOP_LAG.observe(lag)
+            self.max_lag = max(self.max_lag, lag)
+            if lag >= self.threshold:
+                EVENT_LOOP_BLOCKS.inc()
+
+    def _capture_loop_stack(self) -> tuple[str, ...] | None:
+        frame = sys._current_frames().get(self._loop_thread_id)  # type: ignore
+        if frame is None:
+            return None
+        summary = traceback.extract_stack(frame)[-self.stack_depth:]
+        return tuple(f"{entry.filename}:{entry.lineno} in {entry.name}" for entry in summary)
+
+    def _watch(self) -> None:
+        captured_beat = None
+        while not self._stopped.wait(self.threshold / 2):
+            last_beat = self._last_beat
+            if last_beat == captured_beat or time.monotonic() - last_beat < self.interval + self.threshold:
+                continue
+            # One capture per blocking episode: the heartbeat has not moved since
+            captured_beat = last_beat
+            stack = self._capture_loop_stack()
+            if stack is None:
+                continue
+            with self._lock:
+                if stack in self.stacks or len(self.stacks) < self.max_stacks:
+                    self.stacks[stack] += 1
+            loguru.logger.warning(f"Event Loop Monitor --- loop blocked at {stack[-1]}")
+
+    def start(self) -> None:
+        if self._task is not None:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._stopped.clear()
+        self._task = asyncio.create_task(self._beat())
+        self._thread = threading.Thread(target=self._watch, name="event-loop-monitor", daemon=True)
+        self._thread.start()
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._stopped.set()
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self._thread.join(timeout=1)  # type: ignore
+        self._thread = None
+
+    def snapshot(self, top: int = 10) -> dict[str, typing.Any]:
+        with self._lock:
+            top_stacks = self.stacks.most_common(top)
+        return {
+            "enabled": self._task is not None,
+            "threshold_ms": self.threshold * 1000,
+            "max_lag_ms": round(self.max_lag * 1000, 3),
+            "blocking_stacks": [{"count": count, "stack": list(stack)} for stack, count in top_stacks],
+        }
@@ -0,0 +1,138 @@
+import asyncio
+import collections
+import functools
+import gc
+import os
+import time
+import tracemalloc
+import typing
+
+import loguru
+
+from src.monitoring.metrics import GC_COLLECTIONS, GC_OBJECTS, PROCESS_RSS_BYTES
+
+# Allocations made by tracemalloc itself and by the import machinery are noise in a diff
+SNAPSHOT_FILTERS: list[tracemalloc.Filter] = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+]
+
+
+def read_rss_bytes() -> int:
+    try:
+        with open("/proc/self/statm", "rb") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+class MemorySnapshots:
+    """
+    Labeled `tracemalloc` snapshots of the worker, to find what grows between two points in time. Tracing slows
+    every allocation down, so it only runs between `start()` and `stop()`; at most `capacity` snapshots are kept.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.snapshots: collections.OrderedDict[str, tuple[float, tracemalloc.Snapshot]] = collections.OrderedDict()
+
+    @property
+    def is_tracing(self) -> bool:
+        return tracemalloc.is_tracing()
+
+    def start(self, frames: int) -> None:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+
+    def stop(self) -> None:
+        tracemalloc.stop()
+        self.snapshots.clear()
+
+    async def take(self, label: str) -> dict[str, typing.Any]:
+        # Walking every traced block takes a while; a thread lets the loop keep serving in between
+        snapshot = await asyncio.to_thread(lambda: tracemalloc.take_snapshot().filter_traces(SNAPSHOT_FILTERS))
+        self.snapshots.pop(label, None)
+        self.snapshots[label] = (time.time(), snapshot)
+        while len(self.snapshots) > self.capacity:
+            self.snapshots.popitem(last=False)
+
+        traced_size, peak_size = tracemalloc.get_traced_memory()
+        return {"label": label, "traced_kb": traced_size // 1024, "peak_kb": peak_size // 1024}
+
+    async def compare(self, base: str, target: str, group_by: str, top: int) -> list[dict[str, typing.Any]]:
+        _, base_snapshot = self.snapshots[base]
+        _, target_snapshot = self.snapshots[target]
+        differences = await asyncio.to_thread(target_snapshot.compare_to, base_snapshot, group_by)
+        return [
+            {
+                "location": str(difference.traceback[0]),
+                "size_diff_kb": round(difference.size_diff / 1024, 1),
+                "size_kb": round(difference.size / 1024, 1),
+                "count_diff": difference.count_diff,
+                "count": difference.count,
+            }
+            for difference in differences[:top]
+        ]
+
+    def describe(self) -> list[dict[str, typing.Any]]:
+        return [{"label": label, "taken_at": taken_at} for label, (taken_at, _) in self.snapshots.items()]
+
+
+def _read_gc_collections(generation: int) -> float:
+    return gc.get_stats()[generation]["collections"]
+
+
+class MemorySampler:
+    """
+    Sample the RSS and the garbage collector state of the worker every `interval` seconds into the metrics, and
+    keep the recent RSS samples so that a slow creep shows without a metrics backend.
+    """
+
+    def __init__(self, interval: float, history: int = 360):
+        self.interval = interval
+        self.rss_history: collections.deque[tuple[float, int]] = collections.deque(maxlen=history)
+        self._task: asyncio.Task | None = None
+
+    def sample(self) -> None:
+        rss = read_rss_bytes()
+        self.rss_history.append((time.time(), rss))
+        PROCESS_RSS_BYTES.set(rss)
+
+        for generation, count in enumerate(gc.get_count()):
+            GC_OBJECTS.set(count, str(generation))
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                self.sample()
+            except Exception as e:
+                loguru.logger.exception(f"Memory Sampler --- sample failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        # The interpreter already counts collections; the counter reads them when it is collected
+        for generation in range(len(gc.get_stats())):
+            GC_COLLECTIONS.set_function(functools.partial(_read_gc_collections, generation), str(generation))
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def snapshot(self) -> dict[str, typing.Any]:
+        return {
+            "rss_bytes": read_rss_bytes(),
+            "rss_history": [{"at": at, "rss_bytes": rss} for at, rss in self.rss_history],
+            "gc_counts": list(gc.get_count()),
+            "gc_collections": [stats["collections"] for stats in gc.get_stats()],
+            "tracemalloc": tracemalloc.is_tracing(),
+        }
@@ -0,0 +1,210 @@
+import bisect
+import math
+import typing
+
+LabelValues = tuple[str, ...]
+
+DEFAULT_BUCKETS: tuple[float, ...] = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+
+class Metric:
+    """
+    A metric family. Values are kept in plain dicts and updated without locks: every worker runs a single event
+    loop and only that loop records metrics, so an update is never interleaved with another one. Workers are
+    aggregated from their dumps instead (see `src.monitoring.aggregation`).
+    """
+
+    kind: typing.ClassVar[str] = "untyped"
+
+    def __init__(self, name: str, documentation: str, label_names: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = label_names
+        self.values: dict[LabelValues, typing.Any] = dict()
+        self._functions: dict[LabelValues, typing.Callable[[], float]] = dict()
+
+    def set_function(self, function: typing.Callable[[], float], *label_values: str) -> None:
+        """
+        Read the value from `function` at collection time, for state that is already tracked elsewhere.
+        """
+        self._functions[label_values] = function
+
+    def dump(self) -> dict[str, typing.Any]:
+        for label_values, function in self._functions.items():
+            self.values[label_values] = float(function())
+        return {
+            "kind": self.kind,
+            "documentation": self.documentation,
+            "label_names": list(self.label_names),
+            "values": [[list(label_values), value] for label_values, value in self.values.items()],
+        }
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, *label_values: str, amount: float = 1.0) -> None:
+        self.values[label_values] = self.values.get(label_values, 0.0) + amount
+
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def set(self, value: float, *label_values: str) -> None:
+        self.values[label_values] = value
+
+    def inc(self, *label_values: str, amount: float = 1.0) -> None:
+        self.values[label_values] = self.values.get(label_values, 0.0) + amount
+
+    def dec(self, *label_values: str, amount: float = 1.0) -> None:
+        self.inc(*label_values, amount=-amount)
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(
+            self,
+            name: str,
+            documentation: str,
+            label_names: tuple[str, ...] = (),
+            buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, label_names)
+        self.buckets = buckets
+
+    def observe(self, value: float, *label_values: str) -> None:
+        # [count per bucket..., count above the last bucket, sum]
+        data = self.values.get(label_values)
+        if data is None:
+            data = self.values[label_values] = [0] * (len(self.buckets) + 1) + [0.0]
+        data[bisect.bisect_left(self.buckets, value)] += 1
+        data[-1] += value
+
+    def dump(self) -> dict[str, typing.Any]:
+        return {**super().dump(), "buckets": list(self.buckets)}
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.metrics: dict[str, Metric] = dict()
+
+    def _register(self, metric: Metric) -> typing.Any:
+        if metric.name in self.metrics:
+            raise ValueError(f"Metric `{metric.name}` is already registered!")
+        self.metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, label_names: tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter(name, documentation, label_names))
+
+    def gauge(self, name: str, documentation: str, label_names: tuple[str, ...] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, label_names))
+
+    def histogram(
+            self,
+            name: str,
+            documentation: str,
+            label_names: tuple[str, ...] = (),
+            buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, label_names, buckets))
+
+    def dump(self) -> dict[str, dict[str, typing.Any]]:
+        return {name: metric.dump() for name, metric in self.metrics.items()}
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(label_names: typing.Iterable[str], label_values: typing.Iterable[str], **extra: str) -> str:
+    pairs = [*zip(label_names, label_values), *extra.items()]
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape_label_value(str(value))}"' for name, value in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+def render_prometheus_text(dump: dict[str, dict[str, typing.Any]]) -> str:
+    """
+    Render a registry dump (possibly merged from several workers) in the Prometheus text exposition format.
+    """
+    lines = list()
+    for name, family in dump.items():
+        lines.append(f"# HELP {name} {family['documentation']}")
+        lines.append(f"# TYPE {name} {family['kind']}")
+        label_names = family["label_names"]
+
+        for label_values, value in family["values"]:
+            if family["kind"] != "histogram":
+                lines.append(f"{name}{_format_labels(label_names, label_values)} {_format_value(value)}")
+                continue
+
+            cumulative = 0
+            for upper_bound, bucket_count in zip([*family["buckets"], math.inf], value[:-1]):
+                cumulative += bucket_count
+                labels = _format_labels(label_names, label_values, le=_format_value(upper_bound))
+                lines.append(f"{name}_bucket{labels} {cumulative}")
+            lines.append(f"{name}_sum{_format_labels(label_names, label_values)} {_format_value(value[-1])}")
+            lines.append(f"{name}_count{_format_labels(label_names, label_values)} {cumulative}")
+
+    return "\n".join(lines) + "\n"
+
+
+REGISTRY: MetricsRegistry = MetricsRegistry()
+
+HTTP_REQUESTS = REGISTRY.counter(
+    "http_requests_total", "Handled HTTP requests.", ("route", "method", "status")
+)
+HTTP_REQUEST_DURATION = REGISTRY.histogram(
+    "http_request_duration_seconds", "HTTP request latency by route name.", ("route", "method")
+)
+HTTP_REQUESTS_IN_FLIGHT = REGISTRY.gauge(
+    "http_requests_in_flight", "HTTP requests currently being handled."
+)
+DB_POOL_CONNECTIONS = REGISTRY.gauge(
+    "db_pool_connections", "Primary pool connections by state.", ("state",)
+)
+DB_POOL_CHECKOUT_WAIT = REGISTRY.histogram(
+    "db_pool_checkout_wait_seconds", "Time spent waiting for a pool connection, by engine.", ("engine",)
+)
+DB_REQUEST_STATEMENTS = REGISTRY.histogram(
+    "db_request_statements",
+    "Database statements run per HTTP request.",
+    ("route",),
+    buckets=(1, 2, 3, 5, 8, 13, 21, 34, 55, 89),
+)
+DB_REQUEST_DURATION = REGISTRY.histogram(
+    "db_request_duration_seconds", "Time spent in database statements per HTTP request.", ("route",)
+)
+OPERATION_DURATION = REGISTRY.histogram(
+    "app_operation_duration_seconds",
+    "Duration of expensive operations: password hashing, JWT signing and verification, Redis commands.",
+    ("kind", "operation"),
+)
+CACHE_REQUESTS = REGISTRY.counter(
+    "app_cache_requests_total", "In-process cache lookups by result.", ("cache", "result")
+)
+EVENT_LOOP_LAG = REGISTRY.histogram(
+    "event_loop_lag_seconds", "How late the event loop heartbeat woke up."
+)
+EVENT_LOOP_BLOCKS = REGISTRY.counter(
+    "event_loop_blocks_total", "Heartbeats delayed by more than the blocking threshold."
+)
+PROCESS_RSS_BYTES = REGISTRY.gauge(
+    "process_resident_memory_bytes", "Resident set size of the worker."
+)
+GC_OBJECTS = REGISTRY.gauge(
+    "python_gc_objects_pending", "Allocations counted towards the next collection, by generation.", ("generation",)
+)
+GC_COLLECTIONS = REGISTRY.counter(
+    "python_gc_collections_total", "Collections run since the worker started, by generation.", ("generation",)
+)
@@ -0,0 +1,116 @@
+import asyncio
+import collections
+import pathlib
+import sys
+import threading
+import time
+import types
+import typing
+
+ON_CPU_ROOT: str = "on-cpu"
+AWAITING_ROOT: str = "awaiting"
+
+
+def _label(code: types.CodeType) -> str:
+    # Keyed by the function, not the current line, so that one function is one node of the flamegraph
+    return f"{code.co_qualname} ({pathlib.Path(code.co_filename).name}:{code.co_firstlineno})"
+
+
+def _thread_stack(frame: types.FrameType | None) -> list[str]:
+    stack = list()
+    while frame is not None:
+        stack.append(_label(frame.f_code))
+        frame = frame.f_back
+    return stack[::-1]
+
+
+def _await_stack(task: asyncio.Task) -> list[str]:
+    """
+    Walk the chain of coroutines a suspended task is awaiting, from its root coroutine (the endpoint, for a request
+    task) down to the innermost `await`.
+    """
+    stack = list()
+    awaitable: typing.Any = task.get_coro()
+    while awaitable is not None:
+        frame = getattr(awaitable, "cr_frame", None) or getattr(awaitable, "gi_frame", None) or getattr(
+            awaitable, "ag_frame", None
+        )
+        if frame is None:
+            break
+        stack.append(_label(frame.f_code))
+        awaitable = getattr(awaitable, "cr_await", None) or getattr(awaitable, "gi_yieldfrom", None) or getattr(
+            awaitable, "ag_await", None
+        )
+    return stack
+
+
+class StackSampler:
+    """
+    Statistical profiler for a running worker. Every `interval` seconds:
+
+    - a thread samples the stack the event loop thread is executing (`on-cpu`, including synchronous work such as
+      hashing that runs inside a coroutine);
+    - a task on the loop samples the `await` chain of every suspended task (`awaiting`), so that time a request
+      spends waiting on the database or Redis is attributed to the endpoint that awaits it.
+
+    Only one profile runs at a time per worker.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._lock = asyncio.Lock()
+
+    @property
+    def is_running(self) -> bool:
+        return self._lock.locked()
+
+    def _sample_loop_thread(self, thread_id: int, stacks: collections.Counter[str], stopped: threading.Event) -> None:
+        while not stopped.wait(self.interval):
+            frame = sys._current_frames().get(thread_id)
+            if frame is not None:
+                stacks[";".join([ON_CPU_ROOT, *_thread_stack(frame)])] += 1
+
+    def _sample_tasks(self, stacks: collections.Counter[str]) -> None:
+        current_task = asyncio.current_task()
+        for task in asyncio.all_tasks():
+            if task is current_task:
+                continue
+            stack = _await_stack(task)
+            if stack:
+                stacks[";".join([AWAITING_ROOT, *stack])] += 1
+
+    async def profile(self, duration: float) -> collections.Counter[str]:
+        """
+        Sample the worker for `duration` seconds and return the count of every collapsed stack.
+        """
+        if self.is_running:
+            raise RuntimeError("A profile is already running")
+
+        async with self._lock:
+            thread_stacks: collections.Counter[str] = collections.Counter()
+            task_stacks: collections.Counter[str] = collections.Counter()
+            stopped = threading.Event()
+            thread = threading.Thread(
+                target=self._sample_loop_thread,
+                args=(threading.get_ident(), thread_stacks, stopped),
+                name="stack-sampler",
+                daemon=True,
+            )
+            thread.start()
+            try:
+                deadline = time.monotonic() + duration
+                while time.monotonic() < deadline:
+                    self._sample_tasks(task_stacks)
+                    await asyncio.sleep(self.interval)
+            finally:
+                stopped.set()
+                thread.join()
+
+        return thread_stacks + task_stacks
+
+
+def render_collapsed_stacks(stacks: collections.Counter[str]) -> str:
+    """
+    Render stacks in the collapsed format read by `flamegraph.pl` and speedscope: `root;caller;callee count`.
+    """
+    return "".join(f"{stack} {count}\n" for stack, count in stacks.most_common())
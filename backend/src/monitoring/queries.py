@@ -0,0 +1,100 @@
+import collections
+import contextlib
+import contextvars
+import functools
+import typing
+
+import loguru
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+class QueryStats:
+    """
+    Statements sent to the database while the collector was active, their total time and how often each statement
+    shape repeated. SQLAlchemy renders bound values as placeholders, so the statement text is its shape.
+    """
+
+    __slots__ = ("count", "duration", "shapes")
+
+    def __init__(self):
+        self.count: int = 0
+        self.duration: float = 0.0
+        self.shapes: collections.Counter[str] = collections.Counter()
+
+    def add(self, statement: str, duration: float) -> None:
+        self.count += 1
+        self.duration += duration
+        self.shapes[statement] += 1
+
+    def repeated_shapes(self, threshold: int) -> list[tuple[str, int]]:
+        return [(statement, count) for statement, count in self.shapes.most_common() if count >= threshold]
+
+
+# Collectors are nested (a request, and a budget inside one of its routes), so every active one gets the statement
+_active_query_stats: contextvars.ContextVar[tuple[QueryStats, ...]] = contextvars.ContextVar(
+    "active_query_stats", default=()
+)
+
+
+def record_statement(statement: str, duration: float) -> None:
+    for stats in _active_query_stats.get():
+        stats.add(statement, duration)
+
+
+@contextlib.contextmanager
+def track_queries() -> typing.Iterator[QueryStats]:
+    """
+    Count the statements run inside the block: `with track_queries() as stats: ...`.
+    """
+    stats = QueryStats()
+    token = _active_query_stats.set((*_active_query_stats.get(), stats))
+    try:
+        yield stats
+    finally:
+        _active_query_stats.reset(token)
+
+
+def _describe_budget_overrun(name: str, max_queries: int, stats: QueryStats) -> str:
+    statement, count = stats.shapes.most_common(1)[0]
+    return f"{name} ran {stats.count} statements (budget {max_queries}), most repeated {count}x: {statement}"
+
+
+def query_budget(max_queries: int, *, strict: bool = False) -> typing.Callable:
+    """
+    Decorate an async route or repository function with the number of statements it is allowed to run. An overrun
+    is logged, or raises `QueryBudgetExceeded` with `strict`.
+    """
+
+    def decorator(function: typing.Callable[..., typing.Awaitable]) -> typing.Callable[..., typing.Awaitable]:
+        @functools.wraps(function)
+        async def wrapper(*args: typing.Any, **kwargs: typing.Any) -> typing.Any:
+            with track_queries() as stats:
+                result = await function(*args, **kwargs)
+
+            if stats.count > max_queries:
+                message = _describe_budget_overrun(function.__qualname__, max_queries, stats)
+                if strict:
+                    raise QueryBudgetExceeded(message)
+                loguru.logger.warning(f"Query Budget --- {message}")
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+@contextlib.contextmanager
+def assert_query_budget(max_queries: int) -> typing.Iterator[QueryStats]:
+    """
+    Test helper failing the test when the block runs more than `max_queries` statements:
+
+        with assert_query_budget(4):
+            await async_client.post("/api/auth/token", data=...)
+    """
+    with track_queries() as stats:
+        yield stats
+    if stats.count > max_queries:
+        raise QueryBudgetExceeded(_describe_budget_overrun("block", max_queries, stats))
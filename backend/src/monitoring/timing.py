@@ -0,0 +1,59 @@
+import contextlib
+import contextvars
+import time
+import typing
+
+from src.monitoring.metrics import OPERATION_DURATION
+from src.monitoring.tracing import span
+
+
+class RequestTimings:
+    """
+    Time spent per kind of work (`db`, `hash`, `jwt`, `redis`) during one request.
+    """
+
+    __slots__ = ("durations",)
+
+    def __init__(self):
+        self.durations: dict[str, float] = dict()
+
+    def add(self, kind: str, duration: float) -> None:
+        self.durations[kind] = self.durations.get(kind, 0.0) + duration
+
+
+# Holds the collector of the request being handled; the object is shared, not copied, by tasks and threads the
+# request spawns, so their timings land in it too
+_request_timings: contextvars.ContextVar[RequestTimings | None] = contextvars.ContextVar(
+    "request_timings", default=None
+)
+
+
+def start_request_timings() -> tuple[RequestTimings, contextvars.Token]:
+    timings = RequestTimings()
+    return timings, _request_timings.set(timings)
+
+
+def stop_request_timings(token: contextvars.Token) -> None:
+    _request_timings.reset(token)
+
+
+def record_duration(kind: str, duration: float) -> None:
+    timings = _request_timings.get()
+    if timings is not None:
+        timings.add(kind, duration)
+
+
+@contextlib.contextmanager
+def measure(kind: str, operation: str) -> typing.Iterator[None]:
+    """
+    Time the wrapped block into `app_operation_duration_seconds{kind, operation}` and into the current request's
+    timings, and trace it as a `kind.operation` span.
+    """
+    started_at = time.perf_counter()
+    try:
+        with span(f"{kind}.{operation}"):
+            yield
+    finally:
+        duration = time.perf_counter() - started_at
+        OPERATION_DURATION.observe(duration, kind, operation)
+        record_duration(kind, duration)
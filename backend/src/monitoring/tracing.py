@@ -0,0 +1,263 @@
+import asyncio
+import collections
+import contextlib
+import contextvars
+import functools
+import os
+import random
+import re
+import time
+import typing
+import urllib.request
+
+import loguru
+import orjson
+
+TRACEPARENT_PATTERN: re.Pattern = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+
+SPAN_KIND_INTERNAL: int = 1
+SPAN_KIND_SERVER: int = 2
+STATUS_OK: int = 1
+STATUS_ERROR: int = 2
+
+
+class Span:
+    __slots__ = (
+        "exporter", "trace_id", "span_id", "parent_span_id", "name", "kind", "attributes", "start_ns", "end_ns",
+        "status",
+    )
+
+    def __init__(
+            self,
+            exporter: "TraceExporter",
+            trace_id: str,
+            name: str,
+            parent_span_id: str | None = None,
+            kind: int = SPAN_KIND_INTERNAL,
+            attributes: dict[str, typing.Any] | None = None,
+    ):
+        self.exporter = exporter
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_span_id = parent_span_id
+        self.name = name
+        self.kind = kind
+        self.attributes = attributes or dict()
+        self.start_ns = time.time_ns()
+        self.end_ns = 0
+        self.status = STATUS_OK
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    def end(self) -> None:
+        self.end_ns = time.time_ns()
+        self.exporter.export(self)
+
+    def to_otlp(self) -> dict[str, typing.Any]:
+        otlp_span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": [{"key": key, "value": _to_otlp_value(value)} for key, value in self.attributes.items()],
+            "status": {"code": self.status},
+        }
+        if self.parent_span_id:
+            otlp_span["parentSpanId"] = self.parent_span_id
+        return otlp_span
+
+
+def _to_otlp_value(value: typing.Any) -> dict[str, typing.Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+# Only set for sampled requests: everywhere else a span costs one context variable lookup
+_current_span: contextvars.ContextVar[Span | None] = contextvars.ContextVar("current_span", default=None)
+
+
+def parse_traceparent(header: str | None) -> tuple[str, str, bool] | None:
+    """
+    Parse a W3C `traceparent` header into `(trace_id, parent_span_id, sampled)`.
+    """
+    match = TRACEPARENT_PATTERN.match(header.strip().lower()) if header else None
+    if match is None or match.group(1) == "0" * 32 or match.group(2) == "0" * 16:
+        return None
+    return match.group(1), match.group(2), bool(int(match.group(3), 16) & 1)
+
+
+def start_root_span(
+        exporter: "TraceExporter",
+        name: str,
+        traceparent: str | None,
+        sample_rate: float,
+        is_parent_trusted: bool = False,
+) -> tuple[Span, contextvars.Token] | None:
+    """
+    Start the server span of a request, continuing the caller's trace when it sent a `traceparent` header; return
+    `None` when the request is not sampled. The caller's sampling decision is only followed when
+    `is_parent_trusted`, otherwise any client could force every one of its requests to be traced: other requests
+    are sampled at `sample_rate`.
+    """
+    parent = parse_traceparent(traceparent)
+    if parent is not None:
+        trace_id, parent_span_id, parent_sampled = parent
+    else:
+        trace_id, parent_span_id, parent_sampled = os.urandom(16).hex(), None, False
+    sampled = parent_sampled if parent is not None and is_parent_trusted else random.random() < sample_rate
+    if not sampled:
+        return None
+
+    span = Span(exporter, trace_id, name, parent_span_id=parent_span_id, kind=SPAN_KIND_SERVER)
+    return span, _current_span.set(span)
+
+
+def stop_root_span(span: Span, token: contextvars.Token) -> None:
+    _current_span.reset(token)
+    span.end()
+
+
+@contextlib.contextmanager
+def span(name: str, **attributes: typing.Any) -> typing.Iterator[Span | None]:
+    parent = _current_span.get()
+    if parent is None:
+        yield None
+        return
+
+    child = Span(parent.exporter, parent.trace_id, name, parent_span_id=parent.span_id, attributes=attributes)
+    token = _current_span.set(child)
+    try:
+        yield child
+    except BaseException as e:
+        child.status = STATUS_ERROR
+        child.attributes["exception.type"] = type(e).__name__
+        raise
+    finally:
+        _current_span.reset(token)
+        child.end()
+
+
+def traced(
+        function: typing.Callable[..., typing.Awaitable], name: str | None = None
+) -> typing.Callable[..., typing.Awaitable]:
+    """
+    Run an async function (a dependency, a repository method) inside a span named `name`, by default after the
+    function. The signature is kept, so FastAPI still resolves the dependencies of a decorated dependency, and the
+    undecorated function stays reachable as `__untraced__`.
+    """
+    span_name = name or function.__qualname__
+
+    @functools.wraps(function)
+    async def wrapper(*args: typing.Any, **kwargs: typing.Any) -> typing.Any:
+        if _current_span.get() is None:
+            return await function(*args, **kwargs)
+        with span(span_name):
+            return await function(*args, **kwargs)
+
+    wrapper.__untraced__ = function  # type: ignore
+    return wrapper
+
+
+class TraceExporter:
+    """
+    Batch finished spans and write them as OTLP/JSON `ExportTraceServiceRequest`s every `interval` seconds, or
+    as soon as `batch_size` spans are waiting: appended as one line per batch to `path`, or posted to the OTLP/HTTP
+    endpoint `url` (`http://collector:4318/v1/traces`). At most `max_queue` spans wait; newer ones are dropped.
+    """
+
+    def __init__(
+            self,
+            service_name: str,
+            interval: float,
+            path: str = "",
+            url: str = "",
+            batch_size: int = 512,
+            max_queue: int = 8192,
+    ):
+        self.service_name = service_name
+        self.interval = interval
+        self.path = path
+        self.url = url
+        self.batch_size = batch_size
+        self.max_queue = max_queue
+        self.dropped: int = 0
+        # Spans may end in threads (crypto run off the loop): `deque.append`/`popleft` are thread-safe
+        self._queue: collections.deque[Span] = collections.deque()
+        self._flush_requested = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    def export(self, span: Span) -> None:
+        if len(self._queue) >= self.max_queue:
+            self.dropped += 1
+            return
+        self._queue.append(span)
+        if len(self._queue) == self.batch_size:
+            try:
+                asyncio.get_running_loop().call_soon(self._flush_requested.set)
+            except RuntimeError:
+                # Ended in a thread: the periodic flush picks the batch up
+                pass
+
+    def _drain(self) -> list[Span]:
+        spans: list[Span] = list()
+        while self._queue and len(spans) < self.batch_size:
+            spans.append(self._queue.popleft())
+        return spans
+
+    def _encode(self, spans: list[Span]) -> bytes:
+        return orjson.dumps({
+            "resourceSpans": [{
+                "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": self.service_name}}]},
+                "scopeSpans": [{"scope": {"name": __name__}, "spans": [span.to_otlp() for span in spans]}],
+            }]
+        })
+
+    def _write(self, payload: bytes) -> None:
+        if self.path:
+            with open(self.path, "ab") as export_file:
+                export_file.write(payload + b"\n")
+        if self.url:
+            request = urllib.request.Request(
+                self.url, data=payload, headers={"Content-Type": "application/json"}, method="POST"
+            )
+            with urllib.request.urlopen(request, timeout=self.interval):
+                pass
+
+    async def flush(self) -> None:
+        while self._queue:
+            payload = self._encode(self._drain())
+            try:
+                await asyncio.to_thread(self._write, payload)
+            except Exception as e:
+                loguru.logger.warning(f"Trace Exporter --- export failed: {e!r}")
+
+    async def _run(self) -> None:
+        while True:
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._flush_requested.wait(), timeout=self.interval)
+            self._flush_requested.clear()
+            await self.flush()
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        await self.flush()
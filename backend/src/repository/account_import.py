@@ -0,0 +1,262 @@
+import argparse
+import asyncio
+import codecs
+import csv
+import enum
+import json
+import math
+import multiprocessing
+import os
+import typing
+from concurrent.futures import Executor, ProcessPoolExecutor
+
+import loguru
+import pydantic
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config.manager import settings
+from src.repository.crud.account import AccountCRUDRepository
+from src.repository.database import AsyncDatabase
+from src.schemas.account import AccountImportReport, AccountImportRowError, AccountInCreate
+from src.securities.password import generate_salted_password_hashes
+
+
+class AccountImportFormat(str, enum.Enum):
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+    @classmethod
+    def from_content_type(cls, content_type: str | None) -> "AccountImportFormat":
+        if content_type and "ndjson" in content_type.lower():
+            return cls.NDJSON
+        return cls.CSV
+
+
+async def iter_lines(chunks: typing.AsyncIterator[bytes]) -> typing.AsyncIterator[str]:
+    """
+    Split a stream of byte chunks into text lines without buffering the whole body.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    tail = ""
+    async for chunk in chunks:
+        tail += decoder.decode(chunk)
+        *lines, tail = tail.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+    tail += decoder.decode(b"", final=True)
+    if tail:
+        yield tail.rstrip("\r")
+
+
+async def iter_csv_records(lines: typing.AsyncIterator[str]) -> typing.AsyncIterator[str]:
+    """
+    Join the lines of RFC 4180 records whose quoted fields contain line breaks: a record goes on while it has an
+    odd number of quotes, escaped quotes (`""`) counting twice. A record still open at the end of the stream is
+    yielded as it is and fails to parse.
+    """
+    record_lines: list[str] = list()
+    quotes = 0
+    async for line in lines:
+        record_lines.append(line)
+        quotes += line.count('"')
+        if quotes % 2 == 0:
+            yield "\n".join(record_lines)
+            record_lines, quotes = list(), 0
+    if record_lines:
+        yield "\n".join(record_lines)
+
+
+def _parse_csv_record(record: str) -> list[str]:
+    return next(csv.reader([record], strict=True))
+
+
+async def iter_account_rows(
+        chunks: typing.AsyncIterator[bytes],
+        import_format: AccountImportFormat,
+) -> typing.AsyncIterator[tuple[int, dict | str]]:
+    """
+    Yield `(row_number, row)` pairs parsed from a CSV (with a header line) or NDJSON stream. A row that cannot be
+    parsed is yielded as the error message instead of a dict, so that it ends up in the import report.
+    """
+    fieldnames: list[str] | None = None
+    row_number = 0
+    lines = iter_lines(chunks)
+    records = iter_csv_records(lines) if import_format == AccountImportFormat.CSV else lines
+    async for line in records:
+        if not line.strip():
+            continue
+
+        if import_format == AccountImportFormat.CSV and fieldnames is None:
+            fieldnames = [name.strip() for name in _parse_csv_record(line)]
+            continue
+
+        row_number += 1
+        if import_format == AccountImportFormat.NDJSON:
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield row_number, f"Invalid JSON: {e.msg}"
+                continue
+            yield row_number, row if isinstance(row, dict) else "Row must be a JSON object"
+        else:
+            try:
+                values = _parse_csv_record(line)
+            except csv.Error as e:
+                yield row_number, f"Invalid CSV: {e}"
+                continue
+            if len(values) != len(fieldnames):  # type: ignore
+                yield row_number, f"Expected {len(fieldnames)} columns, got {len(values)}"  # type: ignore
+                continue
+            yield row_number, dict(zip(fieldnames, values))  # type: ignore
+
+
+def get_hash_worker_count() -> int:
+    """
+    `BULK_IMPORT_HASH_WORKERS`, or this server worker's share of the CPUs, so that imports running in every server
+    worker at once do not oversubscribe the machine.
+    """
+    return settings.BULK_IMPORT_HASH_WORKERS or max(1, (os.cpu_count() or 1) // settings.server_worker_count)
+
+
+def create_hash_executor(workers: int | None = None) -> ProcessPoolExecutor:
+    """
+    The process pool hashing imported passwords. Its processes are spawned rather than forked: a server worker runs
+    background threads (loop monitor, log writer, trace exporter) whose locks a forked child could inherit held.
+    """
+    return ProcessPoolExecutor(
+        max_workers=workers or get_hash_worker_count(),
+        mp_context=multiprocessing.get_context("spawn"),
+    )
+
+
+def _format_validation_error(error: pydantic.ValidationError) -> str:
+    return "; ".join(f"{'.'.join(str(loc) for loc in err['loc'])}: {err['msg']}" for err in error.errors())
+
+
+async def _hash_passwords(executor: Executor, passwords: list[str], workers: int) -> list[tuple[str, str]]:
+    loop = asyncio.get_running_loop()
+    chunk_size = max(1, math.ceil(len(passwords) / workers))
+    chunks = [passwords[i:i + chunk_size] for i in range(0, len(passwords), chunk_size)]
+    hashed_chunks = await asyncio.gather(
+        *(loop.run_in_executor(executor, generate_salted_password_hashes, chunk) for chunk in chunks)
+    )
+    return [hashes for hashed_chunk in hashed_chunks for hashes in hashed_chunk]
+
+
+async def _import_batch(
+        batch: list[tuple[int, dict | str]],
+        account_repo: AccountCRUDRepository,
+        executor: Executor,
+        workers: int,
+        report: AccountImportReport,
+) -> None:
+    accounts: list[tuple[int, AccountInCreate]] = list()
+    seen_usernames: set[str] = set()
+    seen_emails: set[str] = set()
+    for row_number, row in batch:
+        if isinstance(row, str):
+            report.errors.append(AccountImportRowError(row=row_number, detail=row))
+            continue
+        try:
+            account = AccountInCreate.model_validate(row)
+        except pydantic.ValidationError as e:
+            report.errors.append(AccountImportRowError(row=row_number, detail=_format_validation_error(e)))
+            continue
+
+        # Usernames and emails are unique case-insensitively, like the `lower()` indexes of the account table
+        username, email = account.username.lower(), account.email.lower()
+        if username in seen_usernames or email in seen_emails:
+            report.errors.append(AccountImportRowError(row=row_number, detail="Duplicated username or email in import"))
+            continue
+        seen_usernames.add(username)
+        seen_emails.add(email)
+        accounts.append((row_number, account))
+
+    if not accounts:
+        return
+
+    hashes = await _hash_passwords(executor, [account.password for _, account in accounts], workers)
+    records = [
+        (account.email, account.username, hashed_password, hash_salt)
+        for (_, account), (hash_salt, hashed_password) in zip(accounts, hashes)
+    ]
+    created_usernames = await account_repo.bulk_create(records)
+
+    report.created += len(created_usernames)
+    for row_number, account in accounts:
+        if account.username not in created_usernames:
+            report.errors.append(
+                AccountImportRowError(row=row_number, detail="The username or email is already registered")
+            )
+
+
+async def import_accounts(
+        rows: typing.AsyncIterator[tuple[int, dict | str]],
+        account_repo: AccountCRUDRepository,
+        executor: Executor,
+        workers: int | None = None,
+        batch_size: int | None = None,
+) -> AccountImportReport:
+    """
+    Validate rows with `AccountInCreate` in batches, hash their passwords in `workers` chunks on `executor` (see
+    `create_hash_executor`) and load every batch with `AccountCRUDRepository.bulk_create`. Rows are never rejected as
+    a whole batch; every failure is reported with its row number.
+    """
+    batch_size = batch_size or settings.BULK_IMPORT_BATCH_SIZE
+    workers = workers or get_hash_worker_count()
+    report = AccountImportReport()
+
+    batch: list[tuple[int, dict | str]] = list()
+    async for row in rows:
+        batch.append(row)
+        report.received += 1
+        if len(batch) >= batch_size:
+            await _import_batch(batch, account_repo, executor, workers, report)
+            batch = list()
+    if batch:
+        await _import_batch(batch, account_repo, executor, workers, report)
+
+    report.errors.sort(key=lambda error: error.row)
+    return report
+
+
+async def _read_file(path: str, chunk_size: int = 64 * 1024) -> typing.AsyncIterator[bytes]:
+    with open(path, "rb") as file:
+        while chunk := file.read(chunk_size):
+            yield chunk
+
+
+async def _main(path: str, import_format: AccountImportFormat, batch_size: int) -> None:
+    db = AsyncDatabase()
+    # The CLI owns the machine: one hashing process per CPU
+    workers = settings.BULK_IMPORT_HASH_WORKERS or os.cpu_count() or 1
+    with create_hash_executor(workers) as executor:
+        async with AsyncSession(bind=db.async_engine) as session:
+            report = await import_accounts(
+                iter_account_rows(_read_file(path), import_format),
+                AccountCRUDRepository(async_session=session),
+                executor=executor,
+                workers=workers,
+                batch_size=batch_size,
+            )
+    await db.async_engine.dispose()
+
+    loguru.logger.info(f"Account Import --- {report.created} of {report.received} rows created")
+    for error in report.errors:
+        loguru.logger.warning(f"Account Import --- row {error.row}: {error.detail}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk import accounts from a CSV or NDJSON file.")
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=[f.value for f in AccountImportFormat], default=None)
+    parser.add_argument("--batch-size", type=int, default=settings.BULK_IMPORT_BATCH_SIZE)
+    args = parser.parse_args()
+
+    if args.format:
+        file_format = AccountImportFormat(args.format)
+    elif args.path.endswith((".ndjson", ".jsonl")):
+        file_format = AccountImportFormat.NDJSON
+    else:
+        file_format = AccountImportFormat.CSV
+    asyncio.run(_main(args.path, file_format, args.batch_size))
@@ -1,11 +1,15 @@
+import loguru
 import sqlalchemy
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.repository.models.account import Account
+from src.repository.models.account import Account, RoleNames
 from src.repository.crud.base import BaseCRUDRepository
 from src.securities.password import PasswordGenerator
 from src.repository.exceptions import EntityAlreadyExists
 
+_IMPORT_STAGING_TABLE = "account_import"
+_IMPORT_STAGING_COLUMNS = ("email", "username", "_hashed_password", "_hash_salt")
+
 
 class AccountCRUDRepository(BaseCRUDRepository[Account]):
     model: Account = Account
@@ -30,19 +34,84 @@ class AccountCRUDRepository(BaseCRUDRepository[Account]):
 
         return new_account
 
+    async def bulk_create(self, records: list[tuple[str, str, str, str]]) -> set[str]:
+        """
+        Load `(email, username, hashed_password, hash_salt)` records with a single COPY into a temporary staging
+        table and merge them into `account` with one statement. Rows that collide with an existing email or username
+        are skipped; the usernames that were actually inserted are returned.
+        """
+        connection = await self.async_session.connection()
+        await connection.exec_driver_sql(
+            f"CREATE TEMPORARY TABLE IF NOT EXISTS {_IMPORT_STAGING_TABLE} ("
+            "email VARCHAR(64) NOT NULL, "
+            "username VARCHAR(64) NOT NULL, "
+            "_hashed_password VARCHAR(1024) NOT NULL, "
+            "_hash_salt VARCHAR(1024) NOT NULL"
+            ") ON COMMIT DROP"
+        )
+
+        raw_connection = await connection.get_raw_connection()
+        driver_connection = raw_connection.driver_connection
+        assert driver_connection is not None, "COPY needs a live asyncpg connection"
+        await driver_connection.copy_records_to_table(
+            _IMPORT_STAGING_TABLE,
+            records=records,
+            columns=_IMPORT_STAGING_COLUMNS,
+        )
+
+        merge_query = await connection.exec_driver_sql(
+            f"INSERT INTO {Account.__tablename__} "
+            "(email, username, _hashed_password, _hash_salt, role, is_active, is_logged_in) "
+            f"SELECT email, username, _hashed_password, _hash_salt, '{RoleNames.USER.name}', true, false "
+            f"FROM {_IMPORT_STAGING_TABLE} "
+            "ON CONFLICT DO NOTHING "
+            "RETURNING username"
+        )
+        created_usernames = set(merge_query.scalars().all())
+        await self.async_session.commit()
+
+        return created_usernames
+
     async def find_by_email(self, email: str, **filter_by) -> Account:
         return await self.find_by_field(field_name="email", field_value=email, **filter_by)
 
     async def find_by_username(self, username: str, **filter_by) -> Account:
         return await self.find_by_field(field_name="username", field_value=username, **filter_by)
 
-    async def find_by_username_or_none(self, username: str, **filter_by) -> Account:
-        return await self.find_by_field_or_none(field_name="username", field_value=username, **filter_by)
+    async def find_by_username_or_none(self, username: str, primary_only: bool = False, **filter_by) -> Account:
+        return await self.find_by_field_or_none(
+            field_name="username", field_value=username, primary_only=primary_only, **filter_by
+        )
+
+    async def find_by_login_identifier(self, identifier: str) -> Account | None:
+        """
+        Resolve either a username or an email, case-insensitively, with one query served by the unique
+        `lower(username)` and `lower(email)` indexes. An identifier that is one account's username and another
+        account's email is ambiguous and resolves to no account at all.
+        """
+        login = identifier.lower()
+        username_match = sqlalchemy.func.lower(Account.username) == login
+        email_match = sqlalchemy.func.lower(Account.email) == login
+        stmt = sqlalchemy.select(Account).where(sqlalchemy.or_(username_match, email_match)).limit(2)
+        # Credentials are never checked against a lagging replica
+        query = await self.async_session.execute(statement=stmt, bind_arguments={"primary_only": True})
+        accounts = query.scalars().all()
+        await self.release_connection()
+
+        if len(accounts) > 1:
+            loguru.logger.warning(f"Login identifier `{identifier}` matches more than one account")
+            return None
+        return accounts[0] if accounts else None
 
     async def is_email_taken(self, email: str) -> bool:
-        email_stmt = sqlalchemy.select(Account.email).select_from(Account).where(Account.email == email)
+        email_stmt = (
+            sqlalchemy.select(Account.email)
+            .select_from(Account)
+            .where(sqlalchemy.func.lower(Account.email) == email.lower())
+        )
         email_query = await self.async_session.execute(email_stmt)
         db_email = email_query.scalar()
+        await self.release_connection()
 
         if db_email is not None:
             raise EntityAlreadyExists(f"The email `{email}` is already registered!")  # type: ignore
@@ -50,9 +119,14 @@ class AccountCRUDRepository(BaseCRUDRepository[Account]):
         return True
 
     async def is_username_taken(self, username: str) -> bool:
-        username_stmt = sqlalchemy.select(Account.username).select_from(Account).where(Account.username == username)
+        username_stmt = (
+            sqlalchemy.select(Account.username)
+            .select_from(Account)
+            .where(sqlalchemy.func.lower(Account.username) == username.lower())
+        )
         username_query = await self.async_session.execute(username_stmt)
         db_username = username_query.scalar()
+        await self.release_connection()
 
         if db_username is not None:
             raise EntityAlreadyExists(f"The username `{username}` is already registered!")  # type: ignore
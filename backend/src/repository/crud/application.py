@@ -1,11 +1,13 @@
 import typing
 
 import sqlalchemy
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import joinedload
 
-from src.repository.models.application import Application
+from src.repository.models.application import Application, ApplicationUser
 from src.repository.crud.base import BaseCRUDRepository
-from src.repository.exceptions import EntityDoesNotExist
+from src.repository.exceptions import EntityAlreadyExists, EntityDoesNotExist, EntityLimitReached
 
 
 class ApplicationCRUDRepository(BaseCRUDRepository[Application]):
@@ -19,6 +21,7 @@ class ApplicationCRUDRepository(BaseCRUDRepository[Application]):
                 .options(joinedload(Application.allowed_users)))
         query = await self.async_session.execute(statement=stmt)
         result = query.scalar()
+        await self.release_connection()
         return result
 
     async def find_by_id(self, id: int, **filter_by) -> Application:
@@ -39,8 +42,112 @@ class ApplicationCRUDRepository(BaseCRUDRepository[Application]):
         stmt = (sqlalchemy
                 .select(Application)
                 .where(Application.client_id == client_id)
-                .filter_by(**filter_by)
-                .options(joinedload(Application.allowed_users)))
+                .filter_by(**filter_by))
         query = await self.async_session.execute(statement=stmt)
         result = query.scalar()
+        await self.release_connection()
+        return result
+
+    async def is_owned_by(self, id: int, user: int) -> bool:
+        stmt = sqlalchemy.select(
+            sqlalchemy.exists().where(Application.id == id, Application.user == user)
+        )
+        query = await self.async_session.execute(statement=stmt)
+        result = query.scalar_one()
+        await self.release_connection()
+        return result
+
+    async def is_allowed_user(self, application_id: int, email: str) -> bool:
+        """
+        Check the dev-mode allowlist with an `EXISTS` served by the `(application_id, lower(email))` index.
+        """
+        stmt = sqlalchemy.select(
+            sqlalchemy.exists().where(
+                ApplicationUser.application_id == application_id,
+                sqlalchemy.func.lower(ApplicationUser.email) == email.lower(),
+            )
+        )
+        query = await self.async_session.execute(statement=stmt)
+        result = query.scalar_one()
+        await self.release_connection()
+        return result
+
+    @staticmethod
+    def _count_allowed_users_stmt(application_id: int) -> sqlalchemy.Select:
+        return (sqlalchemy
+                .select(sqlalchemy.func.count())
+                .select_from(ApplicationUser)
+                .where(ApplicationUser.application_id == application_id))
+
+    async def count_allowed_users(self, application_id: int) -> int:
+        stmt = self._count_allowed_users_stmt(application_id)
+        query = await self.async_session.execute(statement=stmt)
+        result = query.scalar_one()
+        await self.release_connection()
         return result
+
+    async def add_allowed_user(
+            self, application_id: int, data: dict, max_users: int | None = None, commit_changes: bool = True
+    ) -> int:
+        """
+        Add an email to the dev-mode allowlist. With `max_users`, the application row is locked before counting its
+        users, so that concurrent requests cannot both pass the check and overshoot the limit.
+        """
+        if max_users is not None:
+            lock_stmt = sqlalchemy.select(Application.id).where(Application.id == application_id).with_for_update()
+            await self.async_session.execute(statement=lock_stmt)
+            # Counted without `release_connection`, which would commit and drop the lock
+            count_stmt = self._count_allowed_users_stmt(application_id)
+            if (await self.async_session.execute(statement=count_stmt)).scalar_one() >= max_users:
+                await self.async_session.rollback()
+                raise EntityLimitReached(f"The application `{application_id}` already allows {max_users} users!")
+
+        stmt = (postgresql_insert(ApplicationUser)
+                .values(application_id=application_id, **data)
+                .on_conflict_do_nothing(
+                    index_elements=[ApplicationUser.application_id, sqlalchemy.func.lower(ApplicationUser.email)])
+                .returning(ApplicationUser.id))
+        query = await self.async_session.execute(statement=stmt)
+        app_user_id = query.scalar()
+        if app_user_id is None:
+            raise EntityAlreadyExists(f"The email `{data.get('email')}` is already allowed!")
+
+        if commit_changes:
+            await self.async_session.commit()
+        return app_user_id
+
+    async def update_allowed_user(
+            self, application_id: int, id: int, data_to_update: dict, commit_changes: bool = True
+    ) -> None:
+        to_update = {column: value for column, value in data_to_update.items() if value is not None}
+        stmt = (sqlalchemy
+                .update(ApplicationUser)
+                .where(ApplicationUser.id == id, ApplicationUser.application_id == application_id)
+                .returning(ApplicationUser.id))
+        if to_update:
+            stmt = stmt.values(**to_update)
+        else:
+            stmt = stmt.values(id=ApplicationUser.id)
+
+        try:
+            query = await self.async_session.execute(statement=stmt)
+        except IntegrityError as e:
+            await self.async_session.rollback()
+            raise EntityAlreadyExists(f"The email `{to_update.get('email')}` is already allowed!") from e
+        if query.scalar() is None:
+            raise EntityDoesNotExist(f"Object {ApplicationUser.__name__} with id `{id}` does not exist!")
+
+        if commit_changes:
+            await self.async_session.commit()
+
+    async def delete_allowed_user(self, application_id: int, id: int, commit_changes: bool = True) -> None:
+        stmt = (sqlalchemy
+                .delete(ApplicationUser)
+                .where(ApplicationUser.id == id, ApplicationUser.application_id == application_id)
+                .returning(ApplicationUser.id))
+        query = await self.async_session.execute(statement=stmt)
+        if query.scalar() is None:
+            raise EntityDoesNotExist(f"Object {ApplicationUser.__name__} with id `{id}` does not exist!")
+
+        if commit_changes:
+            await self.async_session.commit()
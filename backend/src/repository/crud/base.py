@@ -1,10 +1,14 @@
+import inspect
 import typing
 
 import sqlalchemy
-from sqlalchemy import Update, Delete, ColumnElement
+from sqlalchemy import Update, Delete, ColumnElement, Select
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.sql import functions
 
+from src.monitoring.metrics import CACHE_REQUESTS
+from src.monitoring.tracing import traced
 from src.securities.password import PasswordGenerator
 from src.repository.exceptions import EntityDoesNotExist
 
@@ -14,13 +18,59 @@ T = typing.TypeVar("T")
 class BaseCRUDRepository(typing.Generic[T]):
     model: T = None
 
+    # Prebuilt `SELECT model WHERE ...` statements keyed by model and filter shape
+    _select_statements: typing.ClassVar[dict[tuple, Select]] = dict()
+
     def __init__(self, async_session: AsyncSession):
         super().__init__()
         self.async_session = async_session
 
+    def __init_subclass__(cls, **kwargs: typing.Any) -> None:
+        super().__init_subclass__(**kwargs)
+        _trace_repository_methods(cls)
+
+    @classmethod
+    def _get_select_statement(cls, filter_by: dict[str, typing.Any]) -> tuple[Select, dict[str, typing.Any]]:
+        """
+        Return the cached select for the shape of `filter_by` (field names and which of them are NULL) together with
+        the values to bind. The statement is built once per shape, so later lookups skip SQLAlchemy construction and
+        reuse the memoized cache key of the same statement object.
+        """
+        shape = tuple((field_name, field_value is None) for field_name, field_value in filter_by.items())
+        cache_key = (cls.model, shape)
+        stmt = cls._select_statements.get(cache_key)
+        CACHE_REQUESTS.inc("select_statement", "miss" if stmt is None else "hit")
+
+        if stmt is None:
+            stmt = sqlalchemy.select(cls.model)
+            for field_name, is_null in shape:
+                column: ColumnElement = getattr(cls.model, field_name, None)
+                if column is None:
+                    raise ValueError(f"Field '{field_name}' not found in the model.")
+                stmt = stmt.where(column.is_(None) if is_null else column == sqlalchemy.bindparam(field_name))
+            cls._select_statements[cache_key] = stmt
+
+        params = {field_name: field_value for field_name, field_value in filter_by.items() if field_value is not None}
+        return stmt, params
+
     async def commit_changes(self):
         await self.async_session.commit()
 
+    async def release_connection(self) -> None:
+        """
+        Give the connection back to the pool once read-only work is done, instead of holding it until the end of
+        the request. Loaded objects stay usable because the request session does not expire them on commit, and the
+        next query checks a connection out again on demand. Sessions with pending writes keep their transaction, and
+        with `IS_DB_EXPIRE_ON_COMMIT` on (logged at startup) this is a no-op.
+        """
+        sync_session = self.async_session.sync_session
+        if (
+            self.async_session.in_transaction()
+            and not sync_session.expire_on_commit
+            and not getattr(sync_session, "has_writes", True)
+        ):
+            await self.async_session.commit()
+
     async def create(self, data: dict, commit_changes: bool = True) -> T:
         new_obj = self.model(**data)
 
@@ -32,16 +82,18 @@ class BaseCRUDRepository(typing.Generic[T]):
         return new_obj
 
     async def find_all(self, **filter_by) -> typing.Sequence[T]:
-        stmt = sqlalchemy.select(self.model).filter_by(**filter_by)
-        query = await self.async_session.execute(statement=stmt)
-        result = query.scalars()
+        stmt, params = self._get_select_statement(filter_by)
+        query = await self.async_session.execute(statement=stmt, params=params)
+        result = query.scalars().all()
+        await self.release_connection()
 
-        return result.all()
+        return result
 
     async def find_by_id_or_none(self, id: int, **filter_by) -> typing.Optional[T]:
-        stmt = sqlalchemy.select(self.model).where(self.model.id == id).filter_by(**filter_by)
-        query = await self.async_session.execute(statement=stmt)
+        stmt, params = self._get_select_statement({"id": id, **filter_by})
+        query = await self.async_session.execute(statement=stmt, params=params)
         result = query.scalar()
+        await self.release_connection()
         return result
 
     async def find_by_id(self, id: int, **filter_by) -> T:
@@ -52,16 +104,40 @@ class BaseCRUDRepository(typing.Generic[T]):
 
         return result
 
-    async def find_by_field_or_none(self, field_name: str, field_value: typing.Any, **filter_by) -> typing.Optional[T]:
-        column: ColumnElement = getattr(self.model, field_name, None)
+    async def find_all_by_ids(self, ids: typing.Iterable[int], **filter_by) -> dict[int, T]:
+        """
+        Fetch every object whose id is in `ids` with a single `WHERE id = ANY($1)` query, keyed by id. Repeated ids
+        are queried once and ids without an object are simply missing from the result.
+        """
+        id_list = sqlalchemy.bindparam("ids", value=list(set(ids)), type_=ARRAY(sqlalchemy.Integer))
+        stmt = sqlalchemy.select(self.model).where(self.model.id == sqlalchemy.any_(id_list)).filter_by(**filter_by)
+        query = await self.async_session.execute(statement=stmt)
 
-        if column is None:
-            raise ValueError(f"Field '{field_name}' not found in the model.")
+        result = {obj.id: obj for obj in query.scalars().all()}
+        await self.release_connection()
 
-        stmt = sqlalchemy.select(self.model).where(column == field_value).filter_by(**filter_by)
-        query = await self.async_session.execute(statement=stmt)
+        return result
+
+    async def find_by_field_or_none(
+            self,
+            field_name: str,
+            field_value: typing.Any,
+            replica_ok: bool = False,
+            primary_only: bool = False,
+            **filter_by,
+    ) -> typing.Optional[T]:
+        """
+        With `replica_ok` the lookup may be served by a read replica (see `RequestSession.get_bind`); only pass it
+        for reads that tolerate replication lag. `primary_only` keeps the lookup on the primary even in a read-only
+        request, for reads that must not lag such as credential checks.
+        """
+        stmt, params = self._get_select_statement({field_name: field_value, **filter_by})
+        query = await self.async_session.execute(
+            statement=stmt, params=params, bind_arguments={"replica_ok": replica_ok, "primary_only": primary_only}
+        )
 
         result = query.scalar()
+        await self.release_connection()
 
         return result
 
@@ -132,3 +208,39 @@ class BaseCRUDRepository(typing.Generic[T]):
             await self.async_session.commit()
 
         return f"Object with id '{id}' is successfully deleted!"
+
+    async def delete_by_ids(self, ids: typing.Iterable[int], commit_changes: bool = True, **filter_by) -> int:
+        """
+        Delete every object whose id is in `ids` with a single `DELETE ... WHERE id = ANY($1)`, and return how many
+        rows were deleted.
+        """
+        id_list = sqlalchemy.bindparam("ids", value=list(set(ids)), type_=ARRAY(sqlalchemy.Integer))
+        stmt: Delete = (
+            sqlalchemy.delete(table=self.model)  # type: ignore
+            .where(self.model.id == sqlalchemy.any_(id_list))  # type: ignore
+            .filter_by(**filter_by)
+        )
+        query = await self.async_session.execute(statement=stmt)
+
+        if commit_changes:
+            await self.async_session.commit()
+
+        return query.rowcount
+
+
+def _trace_repository_methods(repository_cls: type) -> None:
+    """
+    Wrap every public coroutine method of a repository class in a span named after the class, the inherited ones
+    included: `AccountCRUDRepository.find_all` runs `BaseCRUDRepository.find_all`. Methods already traced for a
+    parent class are re-wrapped rather than nested, so every call opens exactly one span.
+    """
+    for name in dir(repository_cls):
+        if name.startswith("_"):
+            continue
+        attribute = inspect.getattr_static(repository_cls, name)
+        function = getattr(attribute, "__untraced__", attribute)
+        if inspect.iscoroutinefunction(function):
+            setattr(repository_cls, name, traced(function, name=f"{repository_cls.__name__}.{name}"))
+
+
+_trace_repository_methods(BaseCRUDRepository)
@@ -1,5 +1,6 @@
 from uuid import UUID
 
+import sqlalchemy
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.repository.models.refresh_session import RefreshSession
@@ -7,7 +8,7 @@ from src.repository.crud.base import BaseCRUDRepository
 
 
 class RefreshCRUDRepository(BaseCRUDRepository[RefreshSession]):
-    model = RefreshSession
+    model: type[RefreshSession] = RefreshSession
 
     def __init__(self, async_session: AsyncSession):
         super().__init__(async_session)
@@ -17,3 +18,24 @@ class RefreshCRUDRepository(BaseCRUDRepository[RefreshSession]):
 
     async def get_by_token_or_none(self, refresh_token: UUID) -> RefreshSession:
         return await self.find_by_field_or_none("refresh_token", refresh_token)
+
+    async def delete_expired(self, now: int, limit: int | None = None, commit_changes: bool = True) -> int:
+        """
+        Delete sessions that expired before `now`. With `limit`, delete at most that many rows and skip rows locked by
+        concurrent purges, so that every batch stays a short transaction.
+        """
+        stmt = sqlalchemy.delete(self.model).where(self.model.expires_in < now)
+        if limit is not None:
+            expired_ids = (
+                sqlalchemy.select(self.model.id)
+                .where(self.model.expires_in < now)
+                .limit(limit)
+                .with_for_update(skip_locked=True)
+            )
+            stmt = sqlalchemy.delete(self.model).where(self.model.id.in_(expired_ids.scalar_subquery()))
+        query = await self.async_session.execute(statement=stmt)
+
+        if commit_changes:
+            await self.async_session.commit()
+
+        return query.rowcount
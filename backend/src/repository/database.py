@@ -1,33 +1,173 @@
+import typing
+
 import pydantic
-from redis import asyncio as aioredis
 from redis.asyncio import Redis
+from redis.asyncio.client import Pipeline
+from sqlalchemy import Connection, Select, event
 from sqlalchemy.ext.asyncio import (
     AsyncEngine as SQLAlchemyAsyncEngine,
     AsyncSession as SQLAlchemyAsyncSession,
+    async_sessionmaker as sqlalchemy_async_sessionmaker,
     create_async_engine as create_sqlalchemy_async_engine,
 )
-from sqlalchemy.pool import Pool as SQLAlchemyPool, QueuePool as SQLAlchemyQueuePool
+from sqlalchemy.orm import ORMExecuteState, Session as SQLAlchemySession, SessionTransaction
+from sqlalchemy.pool import Pool as SQLAlchemyPool
 
 from src.config.manager import settings
+from src.monitoring.timing import measure
+from src.repository.engine import get_engine_options
+from src.repository.pool import PoolController, PoolUsageStats
+from src.repository.replicas import ReplicaSet
+from src.repository.slow_queries import SlowQueryLog
+
+
+class RequestSession(SQLAlchemySession):
+    """
+    Session class behind every request-scoped `AsyncSession`. It remembers whether the current transaction has
+    written anything, so that read-only work can give its connection back to the pool early, and routes reads to a
+    replica when one is configured:
+
+    * statements run while flushing or after a write in the same transaction always go to the primary;
+    * `STATEMENT_TIMEOUT_KEY` overrides the engine's `statement_timeout` for every transaction of the session;
+    * a `SELECT` goes to a replica when the request is read-only (`READ_ONLY_KEY`) or the caller passed
+      `bind_arguments={"replica_ok": True}`, unless the client is inside its read-your-writes window
+      (`FORCE_PRIMARY_KEY`) or the caller passed `bind_arguments={"primary_only": True}`.
+    """
+
+    HAS_WRITES_KEY: typing.ClassVar[str] = "has_writes"
+    ON_WRITE_KEY: typing.ClassVar[str] = "on_write"
+    READ_ONLY_KEY: typing.ClassVar[str] = "read_only"
+    FORCE_PRIMARY_KEY: typing.ClassVar[str] = "force_primary"
+    REPLICA_KEY: typing.ClassVar[str] = "replica"
+    STATEMENT_TIMEOUT_KEY: typing.ClassVar[str] = "statement_timeout_ms"
+
+    def __init__(self, *args: typing.Any, replicas: ReplicaSet | None = None, **kwargs: typing.Any):
+        super().__init__(*args, **kwargs)
+        self.replicas = replicas
+
+    @property
+    def has_writes(self) -> bool:
+        return bool(self.info.get(self.HAS_WRITES_KEY)) or bool(self.new or self.dirty or self.deleted)
+
+    def get_bind(  # type: ignore
+            self, mapper=None, *, clause=None, replica_ok: bool = False, primary_only: bool = False, **kw
+    ):
+        if (
+            self.replicas
+            and isinstance(clause, Select)
+            and (replica_ok or self.info.get(self.READ_ONLY_KEY))
+            and not primary_only
+            and not self.info.get(self.FORCE_PRIMARY_KEY)
+            and not self._flushing
+            and not self.has_writes
+        ):
+            replica = self.info.get(self.REPLICA_KEY) or self.replicas.choose()
+            if replica is not None:
+                # Stick to one replica for the rest of the transaction
+                self.info[self.REPLICA_KEY] = replica
+                return replica.sync_engine
+
+        return super().get_bind(mapper, clause=clause, **kw)
+
+
+def _mark_writes(session: SQLAlchemySession) -> None:
+    session.info[RequestSession.HAS_WRITES_KEY] = True
+    on_write = session.info.pop(RequestSession.ON_WRITE_KEY, None)
+    if on_write is not None:
+        on_write()
+
+
+@event.listens_for(RequestSession, "do_orm_execute")
+def mark_session_writes(orm_execute_state: ORMExecuteState) -> None:
+    if not orm_execute_state.is_select:
+        _mark_writes(orm_execute_state.session)
+
+
+@event.listens_for(RequestSession, "after_flush")
+def mark_session_flush(session: SQLAlchemySession, flush_context: typing.Any) -> None:
+    _mark_writes(session)
+
+
+@event.listens_for(RequestSession, "after_begin")
+def apply_statement_timeout(session: SQLAlchemySession, transaction: SessionTransaction, connection: Connection) -> None:
+    statement_timeout_ms = session.info.get(RequestSession.STATEMENT_TIMEOUT_KEY)
+    if statement_timeout_ms is not None:
+        connection.exec_driver_sql(f"SET LOCAL statement_timeout = {int(statement_timeout_ms)}")
+
+
+@event.listens_for(RequestSession, "after_transaction_end")
+def reset_session_writes(session: SQLAlchemySession, transaction: SessionTransaction) -> None:
+    if transaction.parent is None:
+        session.info.pop(RequestSession.HAS_WRITES_KEY, None)
+        session.info.pop(RequestSession.REPLICA_KEY, None)
 
 
 class AsyncDatabase:
     def __init__(self):
-        self.postgres_uri: pydantic.PostgresDsn = (f"{settings.DB_POSTGRES_SCHEMA}://"
-                                                   f"{settings.DB_POSTGRES_USERNAME}:"
-                                                   f"{settings.DB_POSTGRES_PASSWORD}@"
-                                                   f"{settings.DB_POSTGRES_HOST}:"
-                                                   f"{settings.DB_POSTGRES_PORT}/"
-                                                   f"{settings.DB_POSTGRES_NAME}")
-        self.async_engine: SQLAlchemyAsyncEngine = create_sqlalchemy_async_engine(
-            url=self.set_async_db_uri,
-            echo=settings.IS_DB_ECHO_LOG,
-            pool_size=settings.DB_POOL_SIZE,
-            max_overflow=settings.DB_POOL_OVERFLOW,
-            poolclass=SQLAlchemyQueuePool,
+        self.postgres_uri: pydantic.PostgresDsn = self.build_postgres_uri()
+        self.async_engine: SQLAlchemyAsyncEngine = self._create_engine(url=self.set_async_db_uri, name="primary")
+        self.replicas: ReplicaSet = ReplicaSet(
+            engines=[
+                self._create_engine(url=self.to_async_db_uri(uri), name="replica")
+                for uri in settings.DB_POSTGRES_REPLICA_URIS
+            ],
+            retry_after=settings.DB_REPLICA_RETRY_SECONDS,
+        )
+        self.async_session_factory: sqlalchemy_async_sessionmaker[SQLAlchemyAsyncSession] = (
+            sqlalchemy_async_sessionmaker(
+                bind=self.async_engine,
+                sync_session_class=RequestSession,
+                expire_on_commit=settings.IS_DB_EXPIRE_ON_COMMIT,
+                replicas=self.replicas,
+            )
         )
-        self.async_session: SQLAlchemyAsyncSession = SQLAlchemyAsyncSession(bind=self.async_engine)
         self.pool: SQLAlchemyPool = self.async_engine.pool
+        self.pool_usage: PoolUsageStats = PoolUsageStats()
+        self.pool_controller: PoolController = PoolController(
+            engine=self.async_engine,
+            min_overflow=settings.DB_POOL_MIN_OVERFLOW,
+            max_overflow=self.max_pool_overflow,
+            interval=settings.DB_POOL_CONTROLLER_INTERVAL_SECONDS,
+            step=settings.DB_POOL_CONTROLLER_STEP,
+            wait_high_ms=settings.DB_POOL_WAIT_HIGH_MS,
+            wait_low_ms=settings.DB_POOL_WAIT_LOW_MS,
+            low_utilization=settings.DB_POOL_LOW_UTILIZATION,
+        )
+        self.slow_queries: SlowQueryLog = SlowQueryLog(
+            threshold_ms=settings.DB_SLOW_QUERY_THRESHOLD_MS,
+            capacity=settings.DB_SLOW_QUERY_LOG_SIZE,
+            explain_sample_rate=settings.DB_SLOW_QUERY_EXPLAIN_SAMPLE_RATE,
+            explain_timeout=settings.DB_TIMEOUT,
+        )
+
+    @staticmethod
+    def _create_engine(url: str | pydantic.PostgresDsn, name: str) -> SQLAlchemyAsyncEngine:
+        return create_sqlalchemy_async_engine(url=url, **get_engine_options(settings.DB_ENGINE_PROFILE, name=name))
+
+    @property
+    def max_pool_overflow(self) -> int:
+        """
+        The overflow that keeps every worker within its share of `DB_MAX_POOL_CON` connections.
+        """
+        per_worker_connections = settings.DB_MAX_POOL_CON // settings.server_worker_count
+        return max(0, per_worker_connections - settings.DB_POOL_SIZE)
+
+    @staticmethod
+    def build_postgres_uri() -> pydantic.PostgresDsn:
+        return (f"{settings.DB_POSTGRES_SCHEMA}://"
+                f"{settings.DB_POSTGRES_USERNAME}:"
+                f"{settings.DB_POSTGRES_PASSWORD}@"
+                f"{settings.DB_POSTGRES_HOST}:"
+                f"{settings.DB_POSTGRES_PORT}/"
+                f"{settings.DB_POSTGRES_NAME}")  # type: ignore
+
+    @classmethod
+    def build_async_db_uri(cls) -> str | pydantic.PostgresDsn:
+        return cls.to_async_db_uri(cls.build_postgres_uri())
+
+    @staticmethod
+    def to_async_db_uri(uri: str | pydantic.PostgresDsn) -> str | pydantic.PostgresDsn:
+        return str(uri).replace("postgresql://", "postgresql+asyncpg://") if uri else uri
 
     @property
     def set_async_db_uri(self) -> str | pydantic.PostgresDsn:
@@ -36,12 +176,27 @@ class AsyncDatabase:
 
             `postgresql://` => `postgresql+asyncpg://`
         """
-        return (
-            self.postgres_uri.replace("postgresql://", "postgresql+asyncpg://")
-            if self.postgres_uri
-            else self.postgres_uri
-        )
+        return self.to_async_db_uri(self.postgres_uri)
+
+
+class InstrumentedPipeline(Pipeline):
+    async def execute(self, raise_on_error: bool = True) -> list[typing.Any]:
+        with measure("redis", "pipeline"):
+            return await super().execute(raise_on_error=raise_on_error)
+
+
+class InstrumentedRedis(Redis):
+    """
+    Redis client that times every command, and every pipeline as a whole.
+    """
+
+    async def execute_command(self, *args: typing.Any, **options: typing.Any) -> typing.Any:
+        with measure("redis", str(args[0]).lower()):
+            return await super().execute_command(*args, **options)
+
+    def pipeline(self, transaction: bool = True, shard_hint: str | None = None) -> Pipeline:
+        return InstrumentedPipeline(self.connection_pool, self.response_callbacks, transaction, shard_hint)
 
 
-async_db: AsyncDatabase = AsyncDatabase()
-redis_client: Redis = aioredis.from_url(url=settings.REDIS_URL)
+def create_redis_client() -> Redis:
+    return InstrumentedRedis.from_url(url=settings.REDIS_URL)
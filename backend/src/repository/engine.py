@@ -0,0 +1,79 @@
+import typing
+import uuid
+
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from src.config.manager import settings
+from src.config.settings.enums import DatabaseEngineProfile
+from src.repository.pool import InstrumentedAsyncQueuePool
+
+
+def _pgbouncer_statement_name() -> str:
+    # PgBouncer may hand the next transaction a different server connection, so names must never collide
+    return f"__asyncpg_{uuid.uuid4()}__"
+
+
+def get_engine_options(profile: DatabaseEngineProfile | None = None, name: str = "primary") -> dict[str, typing.Any]:
+    """
+    Keyword arguments for `create_async_engine` for each deployment profile. `DB_TIMEOUT` (seconds) bounds both
+    opening a connection and every statement run on it, and `name` tells the engine's pool apart in logs and
+    metrics.
+
+    * `direct` - the app talks straight to Postgres: an asyncio queue pool with pre-ping and recycling, sized at
+      runtime by `PoolController`, and both the asyncpg statement cache and SQLAlchemy's prepared statement cache
+      enabled;
+    * `pgbouncer-transaction` - behind PgBouncer in transaction mode, where server-side prepared statements do not
+      survive between transactions: both caches are turned off and statement names are made unique. PgBouncer
+      rejects unknown startup parameters, so `jit` has to be set on the role (`ALTER ROLE ... SET jit = off`) and
+      the statement timeout is set per transaction instead (see `get_async_session`);
+    * `serverless` - short-lived processes that must not keep connections open between invocations: `NullPool`.
+    """
+    profile = profile or settings.DB_ENGINE_PROFILE
+    connect_args: dict[str, typing.Any] = {
+        "timeout": settings.DB_TIMEOUT,
+        "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        "prepared_statement_cache_size": settings.DB_PREPARED_STATEMENT_CACHE_SIZE,
+        "server_settings": {
+            "jit": "on" if settings.IS_DB_JIT else "off",
+            "statement_timeout": str(settings.DB_TIMEOUT * 1000),
+        },
+    }
+    options: dict[str, typing.Any] = {
+        "echo": settings.IS_DB_ECHO_LOG,
+        "connect_args": connect_args,
+    }
+
+    if profile == DatabaseEngineProfile.SERVERLESS:
+        options["poolclass"] = NullPool
+        return options
+
+    options.update(
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_POOL_OVERFLOW,
+        pool_pre_ping=True,
+        pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+        pool_logging_name=name,
+    )
+
+    if profile == DatabaseEngineProfile.PGBOUNCER_TRANSACTION:
+        connect_args.update(
+            statement_cache_size=0,
+            prepared_statement_cache_size=0,
+            prepared_statement_name_func=_pgbouncer_statement_name,
+        )
+        del connect_args["server_settings"]
+
+    return options
+
+
+def create_single_connection_engine(url: typing.Any, name: str) -> AsyncEngine:
+    """
+    An engine with the options of the current profile but at most one connection, for background work (health
+    probes, slow query plans) that must never wait behind requests for a connection of the main pool.
+    """
+    options = get_engine_options(name=name)
+    if options["poolclass"] is not NullPool:
+        options.update(pool_size=1, max_overflow=0)
+    return create_async_engine(url=url, **options)
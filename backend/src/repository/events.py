@@ -1,32 +1,99 @@
+import time
+import typing
+
 import fastapi
 import loguru
 from sqlalchemy import event
 from sqlalchemy.dialects.postgresql.asyncpg import AsyncAdapt_asyncpg_connection
-from sqlalchemy.ext.asyncio import AsyncConnection
+from sqlalchemy.engine import ExceptionContext
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+from sqlalchemy.pool import PoolProxiedConnection, QueuePool
 from sqlalchemy.pool.base import _ConnectionRecord
 
 from src.config.manager import settings
-from src.config.settings.mode import Environment
+from src.config.settings.enums import Environment
 
-from src.repository.database import async_db
+from src.monitoring.metrics import DB_POOL_CONNECTIONS
+from src.monitoring.queries import record_statement
+from src.monitoring.timing import record_duration
+from src.repository.database import AsyncDatabase, create_redis_client
+from src.repository.pool import get_max_overflow
 from src.repository.base import Base
+from src.repository.slow_queries import SlowQueryLog, describe_error
 from src.repository.test_data import update_bd_in_change, create_initial_test_data, delete_tables
 
 
-@event.listens_for(target=async_db.async_engine.sync_engine, identifier="connect")
-def inspect_db_server_on_connection(
-    db_api_connection: AsyncAdapt_asyncpg_connection, connection_record: _ConnectionRecord
-) -> None:
-    loguru.logger.info(f"New DB API Connection ---\n {db_api_connection}")
-    loguru.logger.info(f"Connection Record ---\n {connection_record}")
-
-
-@event.listens_for(target=async_db.async_engine.sync_engine, identifier="close")
-def inspect_db_server_on_close(
-    db_api_connection: AsyncAdapt_asyncpg_connection, connection_record: _ConnectionRecord
-) -> None:
-    loguru.logger.info(f"Closing DB API Connection ---\n {db_api_connection}")
-    loguru.logger.info(f"Closed Connection Record ---\n {connection_record}")
+def register_db_event_listeners(db: AsyncDatabase) -> None:
+    sync_engine = db.async_engine.sync_engine
+
+    @event.listens_for(target=sync_engine, identifier="connect")
+    def inspect_db_server_on_connection(
+        db_api_connection: AsyncAdapt_asyncpg_connection, connection_record: _ConnectionRecord
+    ) -> None:
+        loguru.logger.debug(f"New DB API Connection ---\n {db_api_connection}")
+        loguru.logger.debug(f"Connection Record ---\n {connection_record}")
+
+    @event.listens_for(target=sync_engine, identifier="close")
+    def inspect_db_server_on_close(
+        db_api_connection: AsyncAdapt_asyncpg_connection, connection_record: _ConnectionRecord
+    ) -> None:
+        loguru.logger.debug(f"Closing DB API Connection ---\n {db_api_connection}")
+        loguru.logger.debug(f"Closed Connection Record ---\n {connection_record}")
+
+    @event.listens_for(target=sync_engine, identifier="checkout")
+    def record_db_connection_checkout(
+        db_api_connection: AsyncAdapt_asyncpg_connection,
+        connection_record: _ConnectionRecord,
+        connection_proxy: PoolProxiedConnection,
+    ) -> None:
+        connection_record.info["checked_out_at"] = time.perf_counter()
+
+    @event.listens_for(target=sync_engine, identifier="checkin")
+    def record_db_connection_checkin(
+        db_api_connection: AsyncAdapt_asyncpg_connection | None, connection_record: _ConnectionRecord
+    ) -> None:
+        checked_out_at = connection_record.info.pop("checked_out_at", None)
+        if checked_out_at is not None:
+            db.pool_usage.record_hold(time.perf_counter() - checked_out_at)
+
+
+def register_db_timing_listeners(engine: AsyncEngine, slow_queries: SlowQueryLog) -> None:
+    @event.listens_for(target=engine.sync_engine, identifier="before_cursor_execute")
+    def start_statement_timer(conn, cursor, statement, parameters, context, executemany) -> None:  # type: ignore
+        conn.info.setdefault("statement_started_at", []).append(time.perf_counter())
+
+    @event.listens_for(target=engine.sync_engine, identifier="after_cursor_execute")
+    def stop_statement_timer(conn, cursor, statement, parameters, context, executemany) -> None:  # type: ignore
+        duration = time.perf_counter() - conn.info["statement_started_at"].pop()
+        record_duration("db", duration)
+        record_statement(statement, duration)
+        slow_queries.record(statement, parameters, duration, url=engine.url)
+
+    @event.listens_for(target=engine.sync_engine, identifier="handle_error")
+    def drop_statement_timer(context: ExceptionContext) -> None:
+        started_at = context.connection.info.get("statement_started_at") if context.connection is not None else None
+        if started_at:
+            duration = time.perf_counter() - started_at.pop()
+            record_duration("db", duration)
+            record_statement(context.statement or "", duration)
+            slow_queries.record(
+                context.statement or "",
+                context.parameters,
+                duration,
+                url=engine.url,
+                error=describe_error(context.original_exception),
+            )
+
+
+def register_db_pool_metrics(db: AsyncDatabase) -> None:
+    def read_pool(read: typing.Callable[[QueuePool], int]) -> typing.Callable[[], float]:
+        # The engine replaces its pool on `dispose()`, so it is looked up on every collection
+        return lambda: read(db.async_engine.pool) if isinstance(db.async_engine.pool, QueuePool) else 0
+
+    DB_POOL_CONNECTIONS.set_function(read_pool(lambda pool: pool.checkedout()), "checked_out")
+    DB_POOL_CONNECTIONS.set_function(read_pool(lambda pool: pool.checkedin()), "idle")
+    DB_POOL_CONNECTIONS.set_function(read_pool(lambda pool: max(0, pool.overflow())), "overflow")
+    DB_POOL_CONNECTIONS.set_function(read_pool(lambda pool: pool.size() + get_max_overflow(pool)), "capacity")
 
 
 async def initialize_db_tables(connection: AsyncConnection) -> None:
@@ -46,17 +113,41 @@ async def initialize_db_tables(connection: AsyncConnection) -> None:
 async def initialize_db_connection(backend_app: fastapi.FastAPI) -> None:
     loguru.logger.info("Database Connection --- Establishing . . .")
 
-    backend_app.state.db = async_db
+    backend_app.state.db = AsyncDatabase()
+    register_db_event_listeners(db=backend_app.state.db)
+    if settings.IS_DB_EXPIRE_ON_COMMIT:
+        loguru.logger.warning(
+            "Database Connection --- IS_DB_EXPIRE_ON_COMMIT is on, so repositories cannot release connections early;"
+            " read-only requests hold theirs until the session closes"
+        )
+    register_db_pool_metrics(db=backend_app.state.db)
+    for engine in [backend_app.state.db.async_engine, *backend_app.state.db.replicas.engines]:
+        register_db_timing_listeners(engine=engine, slow_queries=backend_app.state.db.slow_queries)
 
     async with backend_app.state.db.async_engine.begin() as connection:
         await initialize_db_tables(connection=connection)
 
+    if settings.IS_DB_POOL_CONTROLLER_ENABLED:
+        backend_app.state.db.pool_controller.start()
+
     loguru.logger.info("Database Connection --- Successfully Established!")
 
 
 async def dispose_db_connection(backend_app: fastapi.FastAPI) -> None:
     loguru.logger.info("Database Connection --- Disposing . . .")
 
+    await backend_app.state.db.pool_controller.stop()
     await backend_app.state.db.async_engine.dispose()
+    await backend_app.state.db.replicas.dispose()
+    await backend_app.state.db.slow_queries.dispose()
 
+    loguru.logger.info(f"Database Pool Usage --- {backend_app.state.db.pool_usage.snapshot()}")
     loguru.logger.info("Database Connection --- Successfully Disposed!")
+
+
+async def initialize_redis_connection(backend_app: fastapi.FastAPI) -> None:
+    backend_app.state.redis = create_redis_client()
+
+
+async def dispose_redis_connection(backend_app: fastapi.FastAPI) -> None:
+    await backend_app.state.redis.aclose()
@@ -8,3 +8,9 @@ class EntityAlreadyExists(Exception):
     """
     Throw an exception when the data already exist in the database.
     """
+
+
+class EntityLimitReached(Exception):
+    """
+    Throw an exception when adding the data would exceed a limit enforced in the database.
+    """
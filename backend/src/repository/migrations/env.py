@@ -8,10 +8,10 @@ from sqlalchemy.ext.asyncio import AsyncEngine
 from sqlalchemy.pool import NullPool as SQLAlchemyNullPool
 
 from src.repository.base import Base
-from src.repository.database import async_db
+from src.repository.database import AsyncDatabase
 
 config = context.config
-config.set_main_option(name="sqlalchemy.url", value=str(async_db.set_async_db_uri))
+config.set_main_option(name="sqlalchemy.url", value=str(AsyncDatabase.build_async_db_uri()))
 target_metadata = Base.metadata
 
 if config.config_file_name is not None:
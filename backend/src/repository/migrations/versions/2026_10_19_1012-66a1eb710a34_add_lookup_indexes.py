@@ -0,0 +1,41 @@
+"""Add lookup indexes
+
+Revision ID: 66a1eb710a34
+Revises: ef993acc115e
+Create Date: 2026-10-19 10:12:41.530812
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '66a1eb710a34'
+down_revision = 'ef993acc115e'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.create_index(op.f('ix_refresh_session_account'), 'refresh_session', ['account'], unique=False,
+                        postgresql_concurrently=True, if_not_exists=True)
+        op.create_index(op.f('ix_refresh_session_expires_in'), 'refresh_session', ['expires_in'], unique=False,
+                        postgresql_concurrently=True, if_not_exists=True)
+        op.create_index(op.f('ix_application_user'), 'application', ['user'], unique=False,
+                        postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_application_user_application_id_email', 'application_user', ['application_id', 'email'],
+                        unique=False, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_application_user_application_id_email', table_name='application_user',
+                      postgresql_concurrently=True, if_exists=True)
+        op.drop_index(op.f('ix_application_user'), table_name='application',
+                      postgresql_concurrently=True, if_exists=True)
+        op.drop_index(op.f('ix_refresh_session_expires_in'), table_name='refresh_session',
+                      postgresql_concurrently=True, if_exists=True)
+        op.drop_index(op.f('ix_refresh_session_account'), table_name='refresh_session',
+                      postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,46 @@
+"""Add case-insensitive login indexes
+
+Revision ID: 3b9e27c4d1f0
+Revises: 66a1eb710a34
+Create Date: 2026-10-19 11:47:08.214397
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3b9e27c4d1f0'
+down_revision = '66a1eb710a34'
+branch_labels = None
+depends_on = None
+
+
+def _reject_case_insensitive_duplicates(column: str) -> None:
+    # Accounts own sessions and applications, so colliding rows are not deleted here; they have to be merged by hand
+    duplicates = op.get_bind().execute(sa.text(
+        f"SELECT lower({column}) FROM account GROUP BY lower({column}) HAVING count(*) > 1 LIMIT 20"
+    )).scalars().all()
+    if duplicates:
+        raise RuntimeError(
+            f"Accounts share a case-insensitive {column}, merge or rename them before upgrading: {duplicates}"
+        )
+
+
+def upgrade() -> None:
+    _reject_case_insensitive_duplicates('username')
+    _reject_case_insensitive_duplicates('email')
+
+    with op.get_context().autocommit_block():
+        op.create_index('ix_account_lower_username', 'account', [sa.text('lower(username)')], unique=True,
+                        postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_account_lower_email', 'account', [sa.text('lower(email)')], unique=True,
+                        postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_account_lower_email', table_name='account',
+                      postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_account_lower_username', table_name='account',
+                      postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,48 @@
+"""Unique application user email
+
+Revision ID: c52f0e8a7d16
+Revises: 3b9e27c4d1f0
+Create Date: 2026-10-19 13:09:55.671204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c52f0e8a7d16'
+down_revision = '3b9e27c4d1f0'
+branch_labels = None
+depends_on = None
+
+
+def _reject_case_insensitive_duplicates() -> None:
+    # Either row may be the one a client still relies on, so colliding users are not deleted here
+    duplicates = op.get_bind().execute(sa.text(
+        "SELECT application_id, lower(email) FROM application_user "
+        "GROUP BY application_id, lower(email) HAVING count(*) > 1 LIMIT 20"
+    )).all()
+    if duplicates:
+        raise RuntimeError(
+            "Application users share a case-insensitive email within an application, remove the extra rows before "
+            f"upgrading: {[tuple(duplicate) for duplicate in duplicates]}"
+        )
+
+
+def upgrade() -> None:
+    _reject_case_insensitive_duplicates()
+
+    with op.get_context().autocommit_block():
+        op.create_index('ix_application_user_application_id_lower_email', 'application_user',
+                        ['application_id', sa.text('lower(email)')], unique=True,
+                        postgresql_concurrently=True, if_not_exists=True)
+        op.drop_index('ix_application_user_application_id_email', table_name='application_user',
+                      postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index('ix_application_user_application_id_email', 'application_user', ['application_id', 'email'],
+                        unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.drop_index('ix_application_user_application_id_lower_email', table_name='application_user',
+                      postgresql_concurrently=True, if_exists=True)
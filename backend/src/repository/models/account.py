@@ -53,3 +53,7 @@ class Account(Base):  # type: ignore
 
     def set_hash_salt(self, hash_salt: str) -> None:
         self._hash_salt = hash_salt
+
+
+sqlalchemy.Index("ix_account_lower_username", sqlalchemy.func.lower(Account.username), unique=True)
+sqlalchemy.Index("ix_account_lower_email", sqlalchemy.func.lower(Account.email), unique=True)
@@ -1,6 +1,6 @@
 from typing import List
 
-from sqlalchemy import String, ForeignKey
+from sqlalchemy import String, ForeignKey, Index, func
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -11,7 +11,7 @@ class Application(Base):
     __tablename__ = 'application'
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement="auto")
-    user: Mapped[int] = mapped_column(ForeignKey("account.id", ondelete="CASCADE"), nullable=False)
+    user: Mapped[int] = mapped_column(ForeignKey("account.id", ondelete="CASCADE"), nullable=False, index=True)
     name: Mapped[str] = mapped_column(String(20), nullable=False)
     description: Mapped[str] = mapped_column(String(200), default="", nullable=False)
     website: Mapped[str] = mapped_column(String(200), nullable=False)
@@ -32,3 +32,11 @@ class ApplicationUser(Base):
     email: Mapped[str] = mapped_column(String(length=64), nullable=False, unique=False)
 
     application: Mapped["Application"] = relationship(back_populates="allowed_users")
+
+
+Index(
+    "ix_application_user_application_id_lower_email",
+    ApplicationUser.application_id,
+    func.lower(ApplicationUser.email),
+    unique=True,
+)
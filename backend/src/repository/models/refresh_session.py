@@ -13,7 +13,7 @@ class RefreshSession(Base):
     __tablename__ = "refresh_session"
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement="auto")
-    account: Mapped[int] = mapped_column(ForeignKey("account.id", ondelete="CASCADE"), nullable=False)
+    account: Mapped[int] = mapped_column(ForeignKey("account.id", ondelete="CASCADE"), nullable=False, index=True)
     refresh_token: Mapped[_UUID] = mapped_column(UUID(as_uuid=True), nullable=False, unique=True, default=uuid4)
     scope: Mapped[str] = mapped_column(sqlalchemy.String(255), nullable=False, default="")
     ua: Mapped[str] = mapped_column(sqlalchemy.String(length=255), nullable=False)
@@ -21,6 +21,6 @@ class RefreshSession(Base):
     created_at: Mapped[datetime.datetime] = mapped_column(
         sqlalchemy.DateTime(timezone=True), nullable=False, server_default=sqlalchemy_functions.now()
     )
-    expires_in: Mapped[int] = mapped_column(sqlalchemy.Integer, nullable=False)
+    expires_in: Mapped[int] = mapped_column(sqlalchemy.Integer, nullable=False, index=True)
 
     __mapper_args__ = {"eager_defaults": True}
@@ -0,0 +1,224 @@
+import asyncio
+import collections
+import statistics
+import time
+import typing
+
+import loguru
+from sqlalchemy.ext.asyncio import AsyncEngine as SQLAlchemyAsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from src.monitoring.metrics import DB_POOL_CHECKOUT_WAIT
+
+
+def _percentile(values: list[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+class PoolUsageStats:
+    """
+    Track how long connections stay checked out of the pool, filled from the pool `checkout`/`checkin` events.
+    """
+
+    def __init__(self, window: int = 1024):
+        self.checkouts: int = 0
+        self.total_hold_time: float = 0.0
+        self.max_hold_time: float = 0.0
+        self._recent_hold_times: collections.deque[float] = collections.deque(maxlen=window)
+
+    def record_hold(self, hold_time: float) -> None:
+        self.checkouts += 1
+        self.total_hold_time += hold_time
+        self.max_hold_time = max(self.max_hold_time, hold_time)
+        self._recent_hold_times.append(hold_time)
+
+    def snapshot(self) -> dict[str, float | int]:
+        recent = list(self._recent_hold_times)
+        return {
+            "checkouts": self.checkouts,
+            "hold_time_total_ms": round(self.total_hold_time * 1000, 3),
+            "hold_time_avg_ms": round(self.total_hold_time / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+            "hold_time_max_ms": round(self.max_hold_time * 1000, 3),
+            "recent_hold_time_p50_ms": round(statistics.median(recent) * 1000, 3) if recent else 0.0,
+            "recent_hold_time_p95_ms": round(_percentile(recent, 0.95) * 1000, 3),
+        }
+
+
+def get_max_overflow(pool: QueuePool) -> int:
+    """
+    The overflow limit of `pool`. `QueuePool` only takes it as a constructor argument, so this and `set_max_overflow`
+    are the one place that touches the private attribute; the pool reads it on every checkout, so a new limit
+    applies to the next checkout without rebuilding the pool.
+    """
+    return pool._max_overflow
+
+
+def set_max_overflow(pool: QueuePool, max_overflow: int) -> None:
+    pool._max_overflow = max_overflow
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """
+    `AsyncAdaptedQueuePool` that records how long every checkout waited in the queue for a connection, for
+    `PoolController`. Opening a new connection for a checkout is not waiting on the pool and is left out. The
+    exported histogram is labelled with the engine's `pool_logging_name` (see `get_engine_options`).
+    """
+
+    _CONNECT_TIME_KEY: typing.ClassVar[str] = "connect_time"
+
+    def __init__(self, *args: typing.Any, **kwargs: typing.Any):
+        super().__init__(*args, **kwargs)
+        self.checkout_waits: collections.deque[float] = collections.deque(maxlen=4096)
+
+    def _create_connection(self):  # type: ignore
+        started_at = time.perf_counter()
+        connection_record = super()._create_connection()
+        connection_record.info[self._CONNECT_TIME_KEY] = time.perf_counter() - started_at
+        return connection_record
+
+    def _record_wait(self, wait: float) -> None:
+        self.checkout_waits.append(wait)
+        DB_POOL_CHECKOUT_WAIT.observe(wait, self.logging_name or "unnamed")
+
+    def _do_get(self):  # type: ignore
+        started_at = time.perf_counter()
+        try:
+            connection_record = super()._do_get()
+        except BaseException:
+            # A checkout that timed out waited the whole time
+            self._record_wait(time.perf_counter() - started_at)
+            raise
+        # Only set when this very checkout opened the connection
+        connect_time = connection_record.info.pop(self._CONNECT_TIME_KEY, 0.0)
+        self._record_wait(max(0.0, time.perf_counter() - started_at - connect_time))
+        return connection_record
+
+
+class PoolController:
+    """
+    Grow or shrink the overflow of an engine's pool between `min_overflow` and `max_overflow` from the checkout
+    wait and utilization sampled every `interval` seconds. The pool grows after `grow_after` consecutive samples
+    with a p95 wait above `wait_high_ms` and shrinks after `shrink_after` consecutive quiet samples, so that a
+    single burst does not make it flap. Connections above the new limit are closed as they are checked back in.
+    """
+
+    def __init__(
+            self,
+            engine: SQLAlchemyAsyncEngine,
+            min_overflow: int,
+            max_overflow: int,
+            interval: float,
+            step: int,
+            wait_high_ms: float,
+            wait_low_ms: float,
+            low_utilization: float,
+            grow_after: int = 2,
+            shrink_after: int = 6,
+    ):
+        self.engine = engine
+        self.min_overflow = min_overflow
+        self.max_overflow = max(min_overflow, max_overflow)
+        self.interval = interval
+        self.step = max(1, step)
+        self.wait_high = wait_high_ms / 1000
+        self.wait_low = wait_low_ms / 1000
+        self.low_utilization = low_utilization
+        self.grow_after = grow_after
+        self.shrink_after = shrink_after
+
+        self.decisions: collections.Counter[str] = collections.Counter()
+        self.recent_decisions: collections.deque[dict[str, typing.Any]] = collections.deque(maxlen=32)
+        self._busy_samples: int = 0
+        self._quiet_samples: int = 0
+        self._task: asyncio.Task | None = None
+
+    @property
+    def pool(self) -> InstrumentedAsyncQueuePool | None:
+        # Looked up every time: `engine.dispose()` replaces the pool object
+        pool = self.engine.pool
+        return pool if isinstance(pool, InstrumentedAsyncQueuePool) else None
+
+    def _set_overflow(self, pool: InstrumentedAsyncQueuePool, overflow: int) -> None:
+        set_max_overflow(pool, max(self.min_overflow, min(self.max_overflow, overflow)))
+
+    def tick(self) -> str:
+        pool = self.pool
+        if pool is None:
+            return "unsupported"
+
+        waits = list(pool.checkout_waits)
+        pool.checkout_waits.clear()
+        wait_p95 = _percentile(waits, 0.95)
+        capacity = pool.size() + get_max_overflow(pool)
+        utilization = pool.checkedout() / capacity if capacity else 1.0
+
+        if wait_p95 >= self.wait_high:
+            self._busy_samples += 1
+            self._quiet_samples = 0
+        elif wait_p95 <= self.wait_low and utilization <= self.low_utilization:
+            self._quiet_samples += 1
+            self._busy_samples = 0
+        else:
+            self._busy_samples = self._quiet_samples = 0
+
+        decision = "hold"
+        if self._busy_samples >= self.grow_after:
+            decision = "grow" if get_max_overflow(pool) < self.max_overflow else "capped"
+            self._set_overflow(pool, get_max_overflow(pool) + self.step)
+            self._busy_samples = 0
+        elif self._quiet_samples >= self.shrink_after and get_max_overflow(pool) > self.min_overflow:
+            decision = "shrink"
+            self._set_overflow(pool, get_max_overflow(pool) - self.step)
+            self._quiet_samples = 0
+
+        self.decisions[decision] += 1
+        if decision != "hold":
+            self.recent_decisions.append({
+                "at": time.time(),
+                "decision": decision,
+                "max_overflow": get_max_overflow(pool),
+                "wait_p95_ms": round(wait_p95 * 1000, 3),
+                "utilization": round(utilization, 3),
+            })
+            loguru.logger.info(f"Database Pool Controller --- {self.recent_decisions[-1]}")
+        return decision
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                self.tick()
+            except Exception as e:
+                loguru.logger.exception(f"Database Pool Controller --- tick failed: {e}")
+
+    def start(self) -> None:
+        pool = self.pool
+        if pool is None or self._task is not None:
+            return
+        self._set_overflow(pool, get_max_overflow(pool))
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def snapshot(self) -> dict[str, typing.Any]:
+        pool = self.pool
+        return {
+            "enabled": self._task is not None,
+            "pool_size": pool.size() if pool else None,
+            "max_overflow": get_max_overflow(pool) if pool else None,
+            "overflow_bounds": [self.min_overflow, self.max_overflow],
+            "checked_out": pool.checkedout() if pool else None,
+            "decisions": dict(self.decisions),
+            "recent_decisions": list(self.recent_decisions),
+        }
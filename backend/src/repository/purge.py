@@ -0,0 +1,54 @@
+import asyncio
+import datetime
+
+import loguru
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from src.repository.crud.refresh_session import RefreshCRUDRepository
+
+
+class ExpiredSessionPurger:
+    """
+    Delete expired refresh sessions every `interval` seconds in the background, `batch_size` rows per transaction,
+    so that requests only ever delete their own session.
+    """
+
+    def __init__(self, async_engine: AsyncEngine, interval: float, batch_size: int):
+        self.async_engine = async_engine
+        self.interval = interval
+        self.batch_size = batch_size
+        self._task: asyncio.Task | None = None
+
+    async def purge(self) -> int:
+        now = int(datetime.datetime.utcnow().timestamp())
+        deleted = 0
+        async with AsyncSession(bind=self.async_engine) as session:
+            refresh_session_repo = RefreshCRUDRepository(async_session=session)
+            while True:
+                batch_deleted = await refresh_session_repo.delete_expired(now=now, limit=self.batch_size)
+                deleted += batch_deleted
+                if batch_deleted < self.batch_size:
+                    return deleted
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                deleted = await self.purge()
+                if deleted:
+                    loguru.logger.info(f"Session Purge --- deleted {deleted} expired refresh sessions")
+            except Exception as e:
+                loguru.logger.exception(f"Session Purge --- purge failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
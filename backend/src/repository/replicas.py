@@ -0,0 +1,56 @@
+import itertools
+import time
+
+import loguru
+from sqlalchemy import event
+from sqlalchemy.engine import ExceptionContext
+from sqlalchemy.ext.asyncio import AsyncEngine as SQLAlchemyAsyncEngine
+
+
+class ReplicaSet:
+    """
+    Round-robin over read replica engines. A replica that fails to connect or drops its connection is skipped for
+    `retry_after` seconds before it is tried again.
+    """
+
+    def __init__(self, engines: list[SQLAlchemyAsyncEngine], retry_after: float):
+        self.engines = engines
+        self.retry_after = retry_after
+        self._unhealthy_until: dict[SQLAlchemyAsyncEngine, float] = dict()
+        self._next = itertools.cycle(range(len(engines))) if engines else None
+
+        for engine in engines:
+            event.listen(engine.sync_engine, "handle_error", self._make_error_handler(engine))
+
+    def __bool__(self) -> bool:
+        return bool(self.engines)
+
+    def _make_error_handler(self, engine: SQLAlchemyAsyncEngine):  # type: ignore
+        def mark_replica_on_error(context: ExceptionContext) -> None:
+            if context.is_disconnect or context.connection is None:
+                self.mark_unhealthy(engine)
+
+        return mark_replica_on_error
+
+    def is_healthy(self, engine: SQLAlchemyAsyncEngine) -> bool:
+        return self._unhealthy_until.get(engine, 0.0) <= time.monotonic()
+
+    def mark_unhealthy(self, engine: SQLAlchemyAsyncEngine) -> None:
+        loguru.logger.warning(f"Database Replica --- {engine.url.host} marked unhealthy for {self.retry_after}s")
+        self._unhealthy_until[engine] = time.monotonic() + self.retry_after
+
+    def choose(self) -> SQLAlchemyAsyncEngine | None:
+        """
+        Return the next healthy replica, or `None` when all of them are down and reads must go to the primary.
+        """
+        if self._next is None:
+            return None
+        for _ in range(len(self.engines)):
+            engine = self.engines[next(self._next)]
+            if self.is_healthy(engine):
+                return engine
+        return None
+
+    async def dispose(self) -> None:
+        for engine in self.engines:
+            await engine.dispose()
@@ -0,0 +1,138 @@
+import asyncio
+import collections
+import contextvars
+import json
+import random
+import time
+import typing
+
+import loguru
+from sqlalchemy.engine import URL
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.repository.engine import create_single_connection_engine
+
+# Set by the request session dependency, so that statements can be attributed to the route that ran them
+current_route_name: contextvars.ContextVar[str | None] = contextvars.ContextVar("current_route_name", default=None)
+
+EXPLAINABLE_PREFIXES: tuple[str, ...] = ("select", "with")
+# Raised by Postgres when `statement_timeout` cancels a statement
+QUERY_CANCELED_SQLSTATE: str = "57014"
+
+
+def describe_parameters(parameters: typing.Any) -> typing.Any:
+    """
+    Replace bound values by their type names: the shape shows which filters were used without logging passwords,
+    tokens or emails.
+    """
+    if isinstance(parameters, dict):
+        return {name: type(value).__name__ for name, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (list, tuple, dict)):
+            return {"rows": len(parameters), "row": describe_parameters(parameters[0])}
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__
+
+
+def describe_error(error: BaseException) -> str:
+    """
+    `"timeout"` for a statement cancelled by `statement_timeout`, the exception class name for any other failure.
+    """
+    return "timeout" if getattr(error, "sqlstate", None) == QUERY_CANCELED_SQLSTATE else type(error).__name__
+
+
+class SlowQueryLog:
+    """
+    Keep the last `capacity` statements that ran for at least `threshold_ms`, failed or not, with the shape of their
+    parameters, the route and database that ran them, how they failed and, for an `explain_sample_rate` share of
+    the reads, their `EXPLAIN (FORMAT JSON)` plan. Plans are captured in the background, one at a time, over a
+    single-connection engine to the database that ran the statement (the primary or a replica), so that explaining
+    never competes with requests for pool connections.
+    """
+
+    def __init__(self, threshold_ms: float, capacity: int, explain_sample_rate: float, explain_timeout: float):
+        self.threshold = threshold_ms / 1000
+        self.explain_sample_rate = explain_sample_rate
+        self.explain_timeout = explain_timeout
+        self.entries: collections.deque[dict[str, typing.Any]] = collections.deque(maxlen=capacity)
+        self.recorded: int = 0
+        self._engines: dict[URL, AsyncEngine] = dict()
+        self._explain_task: asyncio.Task | None = None
+
+    @property
+    def is_enabled(self) -> bool:
+        return self.threshold > 0
+
+    def record(
+            self, statement: str, parameters: typing.Any, duration: float, url: URL, error: str | None = None
+    ) -> None:
+        """
+        Keep `statement` if it was slow on the database at `url`; `error` (see `describe_error`) marks a statement
+        that did not complete.
+        """
+        if not self.is_enabled or duration < self.threshold:
+            return
+
+        entry = {
+            "at": time.time(),
+            "duration_ms": round(duration * 1000, 3),
+            "route": current_route_name.get(),
+            "database": url.render_as_string(hide_password=True),
+            "statement": statement,
+            "parameters": describe_parameters(parameters),
+            "error": error,
+            "plan": None,
+        }
+        self.entries.append(entry)
+        self.recorded += 1
+        outcome = f" ({error})" if error else ""
+        loguru.logger.warning(
+            f"Slow Query --- {entry['duration_ms']} ms{outcome} in {entry['route']} on {url.host}: {statement}"
+        )
+
+        if self._should_explain(statement):
+            self._explain_task = asyncio.get_running_loop().create_task(
+                self._explain(entry, url, statement, parameters)
+            )
+
+    def _should_explain(self, statement: str) -> bool:
+        return (
+            random.random() < self.explain_sample_rate
+            and statement.lstrip().lower().startswith(EXPLAINABLE_PREFIXES)
+            and (self._explain_task is None or self._explain_task.done())
+        )
+
+    async def _explain(self, entry: dict[str, typing.Any], url: URL, statement: str, parameters: typing.Any) -> None:
+        engine = self._engines.get(url)
+        if engine is None:
+            engine = self._engines[url] = create_single_connection_engine(url=url, name="explain")
+        try:
+            async with engine.connect() as connection:
+                query = await asyncio.wait_for(
+                    connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters),
+                    timeout=self.explain_timeout,
+                )
+                plan = query.scalar()
+        except Exception as e:
+            entry["plan"] = {"error": repr(e)}
+            return
+        entry["plan"] = json.loads(plan) if isinstance(plan, str) else plan
+
+    async def dispose(self) -> None:
+        if self._explain_task is not None:
+            self._explain_task.cancel()
+            try:
+                await self._explain_task
+            except asyncio.CancelledError:
+                pass
+            self._explain_task = None
+        for engine in self._engines.values():
+            await engine.dispose()
+        self._engines.clear()
+
+    def snapshot(self) -> dict[str, typing.Any]:
+        return {
+            "threshold_ms": self.threshold * 1000,
+            "recorded": self.recorded,
+            "entries": list(reversed(self.entries)),
+        }
@@ -33,3 +33,24 @@ class AccountDetail(BaseSchemaModel):
     is_logged_in: bool
     created_at: datetime.datetime
     updated_at: datetime.datetime | None
+
+
+class AccountBatchRequest(BaseSchemaModel):
+    ids: list[int]
+
+
+class AccountBatchItem(BaseSchemaModel):
+    id: int
+    found: bool
+    account: AccountDetail | None = None
+
+
+class AccountImportRowError(BaseSchemaModel):
+    row: int
+    detail: str
+
+
+class AccountImportReport(BaseSchemaModel):
+    received: int = 0
+    created: int = 0
+    errors: list[AccountImportRowError] = []
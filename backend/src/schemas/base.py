@@ -1,8 +1,10 @@
 import datetime
+import functools
 import typing
 
 import pydantic
 
+from src.monitoring.metrics import CACHE_REQUESTS
 from src.utilities.formatters import format_datetime_into_isoformat
 from src.utilities.formatters import format_dict_key_to_camel_case
 
@@ -14,3 +16,15 @@ class BaseSchemaModel(pydantic.BaseModel):
         json_encoders: dict = {datetime.datetime: format_datetime_into_isoformat}
         alias_generator: typing.Any = format_dict_key_to_camel_case
         from_attributes = True
+
+
+@functools.lru_cache(maxsize=None)
+def get_list_adapter(schema: typing.Type[BaseSchemaModel]) -> pydantic.TypeAdapter:
+    """
+    Return a cached `TypeAdapter(list[schema])` so that whole result sets are validated in a single pass.
+    """
+    return pydantic.TypeAdapter(list[schema])  # type: ignore
+
+
+CACHE_REQUESTS.set_function(lambda: get_list_adapter.cache_info().hits, "list_adapter", "hit")
+CACHE_REQUESTS.set_function(lambda: get_list_adapter.cache_info().misses, "list_adapter", "miss")
@@ -6,6 +6,7 @@ import pydantic
 from jose import jwt as jose_jwt, JWTError, ExpiredSignatureError
 
 from src.config.manager import settings
+from src.monitoring.timing import measure
 from src.repository.models.account import Account
 
 from src.schemas.jwt import SJwtToken
@@ -41,7 +42,8 @@ class JWTGenerator:
             exp=expire,
         )
 
-        return jose_jwt.encode(to_encode, key=settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
+        with measure("jwt", "sign"):
+            return jose_jwt.encode(to_encode, key=settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
 
     @classmethod
     def generate_access_token(cls, sub: Account, auth_type: str, scopes: list) -> str:
@@ -61,16 +63,17 @@ class JWTGenerator:
         )
 
     @classmethod
-    def retrieve_data_from_token(cls, token: str, secret_key: str = settings.JWT_SECRET_KEY) -> dict:
+    def retrieve_data_from_token(cls, token: str, secret_key: str | None = None) -> dict:
         try:
-            payload = jose_jwt.decode(
-                token=token,
-                key=secret_key,
-                algorithms=[settings.JWT_ALGORITHM],
-                options=dict(
-                    verify_sub=False
+            with measure("jwt", "verify"):
+                payload = jose_jwt.decode(
+                    token=token,
+                    key=secret_key or settings.JWT_SECRET_KEY,
+                    algorithms=[settings.JWT_ALGORITHM],
+                    options=dict(
+                        verify_sub=False
+                    )
                 )
-            )
 
         except ExpiredSignatureError as token_expired_error:
             raise ExpiredSignatureError() from token_expired_error
@@ -1,27 +1,36 @@
+import functools
+
 from passlib.context import CryptContext
 
 from src.config.manager import settings
+from src.monitoring.timing import measure
+
+
+@functools.lru_cache()
+def _get_crypt_context(scheme: str) -> CryptContext:
+    return CryptContext(schemes=[scheme], deprecated="auto")
 
 
 class HashGenerator:
-    _hash_ctx_layer_1: CryptContext = CryptContext(
-        schemes=[settings.HASHING_ALGORITHM_LAYER_1], deprecated="auto"
-    )
-    _hash_ctx_layer_2: CryptContext = CryptContext(
-        schemes=[settings.HASHING_ALGORITHM_LAYER_2], deprecated="auto"
-    )
-    _hash_ctx_salt: str = settings.HASHING_SALT
+    @classmethod
+    def _get_hash_ctx_layer_1(cls) -> CryptContext:
+        return _get_crypt_context(settings.HASHING_ALGORITHM_LAYER_1)
+
+    @classmethod
+    def _get_hash_ctx_layer_2(cls) -> CryptContext:
+        return _get_crypt_context(settings.HASHING_ALGORITHM_LAYER_2)
 
     @classmethod
     def _get_hashing_salt(cls) -> str:
-        return cls._hash_ctx_salt
+        return settings.HASHING_SALT
 
     @classmethod
     def generate_password_salt_hash(cls) -> str:
         """
         A function to generate a hash from Bcrypt to append to the user password.
         """
-        return cls._hash_ctx_layer_1.hash(secret=cls._get_hashing_salt())
+        with measure("hash", "salt"):
+            return cls._get_hash_ctx_layer_1().hash(secret=cls._get_hashing_salt())
 
     @classmethod
     def generate_password_hash(cls, hash_salt: str, password: str) -> str:
@@ -29,14 +38,16 @@ class HashGenerator:
         A function that adds the user's password with the layer 1 Bcrypt hash, before
         hash it for the second time using Argon2 algorithm.
         """
-        return cls._hash_ctx_layer_2.hash(secret=hash_salt + password)
+        with measure("hash", "hash"):
+            return cls._get_hash_ctx_layer_2().hash(secret=hash_salt + password)
 
     @classmethod
     def is_password_verified(cls, password: str, hashed_password: str) -> bool:
         """
         A function that decodes users' password and verifies whether it is the correct password.
         """
-        return cls._hash_ctx_layer_2.verify(secret=password, hash=hashed_password)
+        with measure("hash", "verify"):
+            return cls._get_hash_ctx_layer_2().verify(secret=password, hash=hashed_password)
 
 
 class PasswordGenerator:
@@ -51,3 +62,15 @@ class PasswordGenerator:
     @classmethod
     def is_password_authenticated(cls, hash_salt: str, password: str, hashed_password: str) -> bool:
         return HashGenerator.is_password_verified(password=hash_salt + password, hashed_password=hashed_password)
+
+
+def generate_salted_password_hashes(passwords: list[str]) -> list[tuple[str, str]]:
+    """
+    Return a `(hash_salt, hashed_password)` pair for every password. Kept at module level so that it can be
+    shipped to a `ProcessPoolExecutor` worker.
+    """
+    hashes = list()
+    for password in passwords:
+        hash_salt = PasswordGenerator.generate_salt()
+        hashes.append((hash_salt, PasswordGenerator.generate_hashed_password(hash_salt=hash_salt, new_password=password)))
+    return hashes
@@ -0,0 +1,71 @@
+"""
+How long a read-only request keeps its pool connection checked out, with the connection held until the session
+closes (`expire_on_commit=True`, what `IS_DB_EXPIRE_ON_COMMIT` gives) and released early by
+`BaseCRUDRepository.release_connection` (`expire_on_commit=False`). Every simulated request looks an account up and
+then spends `HANDLER_SECONDS` on non-database work. Needs the database configured in the environment.
+
+    PYTHONPATH=backend python -m tests.benchmarks.bench_connection_hold
+"""
+import asyncio
+import time
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from backend.src.repository.crud.account import AccountCRUDRepository
+from backend.src.repository.database import AsyncDatabase, RequestSession
+from backend.src.repository.events import register_db_event_listeners
+from backend.src.repository.pool import PoolUsageStats
+
+REQUESTS = 200
+CONCURRENCY = 20
+HANDLER_SECONDS = 0.02
+
+
+async def simulate_request(session_factory: async_sessionmaker) -> None:
+    async with session_factory() as session:
+        await AccountCRUDRepository(async_session=session).find_by_id_or_none(id=1)
+        await asyncio.sleep(HANDLER_SECONDS)
+
+
+async def measure(db: AsyncDatabase, expire_on_commit: bool) -> tuple[dict[str, float | int], float]:
+    session_factory = async_sessionmaker(
+        bind=db.async_engine,
+        sync_session_class=RequestSession,
+        expire_on_commit=expire_on_commit,
+        replicas=db.replicas,
+    )
+    await simulate_request(session_factory)
+    db.pool_usage = PoolUsageStats()
+
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+
+    async def run_one() -> None:
+        async with semaphore:
+            await simulate_request(session_factory)
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*(run_one() for _ in range(REQUESTS)))
+    return db.pool_usage.snapshot(), time.perf_counter() - started_at
+
+
+def report(name: str, usage: dict[str, float | int], elapsed: float) -> None:
+    print(
+        f"{name:<28} hold avg {usage['hold_time_avg_ms']:8.2f} ms   p95 {usage['recent_hold_time_p95_ms']:8.2f} ms"
+        f"   {REQUESTS / elapsed:8.1f} req/s"
+    )
+
+
+async def main() -> None:
+    db = AsyncDatabase()
+    register_db_event_listeners(db=db)
+    try:
+        report("held until close (before)", *await measure(db, expire_on_commit=True))
+        report("released early (after)", *await measure(db, expire_on_commit=False))
+    finally:
+        await db.async_engine.dispose()
+        await db.replicas.dispose()
+        await db.slow_queries.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
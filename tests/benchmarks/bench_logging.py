@@ -0,0 +1,77 @@
+"""
+Logging overhead per request under load: concurrent simulated requests, each logging a few records with a request
+id, through a synchronous text sink, `loguru`'s own `enqueue=True` sink and the JSON queue sink of
+`src.monitoring.logs`. Sinks write to `os.devnull`, so only the cost paid by the request is measured.
+
+    PYTHONPATH=backend python -m tests.benchmarks.bench_logging
+"""
+import asyncio
+import os
+import time
+import typing
+
+import loguru
+
+from backend.src.monitoring.logs import JsonQueueSink, LogFilter, add_request_id, request_id
+
+CONCURRENCY = 100
+REQUESTS_PER_TASK = 200
+RECORDS_PER_REQUEST = 6
+
+
+async def handle_request(number: int, log: bool) -> None:
+    request_id.set(f"request-{number}")
+    for record_number in range(RECORDS_PER_REQUEST):
+        if log:
+            loguru.logger.info(f"Handling --- step {record_number} of request {number}")
+        await asyncio.sleep(0)
+
+
+async def run_load(log: bool) -> float:
+    async def client(task_number: int) -> None:
+        for request_number in range(REQUESTS_PER_TASK):
+            await handle_request(task_number * REQUESTS_PER_TASK + request_number, log)
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*(client(task_number) for task_number in range(CONCURRENCY)))
+    return time.perf_counter() - started_at
+
+
+def configure(sink: typing.Any, **options: typing.Any) -> None:
+    loguru.logger.remove()
+    loguru.logger.configure(patcher=add_request_id)  # type: ignore
+    loguru.logger.add(sink, level="INFO", **options)
+
+
+def main() -> None:
+    requests = CONCURRENCY * REQUESTS_PER_TASK
+    loguru.logger.remove()
+    baseline = asyncio.run(run_load(log=False))
+
+    with open(os.devnull, "w") as devnull:
+        json_sink = JsonQueueSink(stream=devnull, max_queue=requests * RECORDS_PER_REQUEST)
+        json_sink.start()
+        sinks: list[tuple[str, typing.Callable[[], None]]] = [
+            ("text, synchronous", lambda: configure(devnull)),
+            ("text, loguru enqueue=True", lambda: configure(devnull, enqueue=True)),
+            ("json queue sink", lambda: configure(json_sink, format="{message}")),
+            (
+                "json queue sink, 10% sampled",
+                lambda: configure(
+                    json_sink, format="{message}", filter=LogFilter(0, 0, sample_rates={__name__: 0.1})
+                ),
+            ),
+        ]
+        print(f"{requests} requests x {RECORDS_PER_REQUEST} records, {CONCURRENCY} concurrent")
+        print(f"{'no logging':<32} {baseline / requests * 1e6:8.2f} us/request")
+        for name, set_up in sinks:
+            set_up()
+            duration = asyncio.run(run_load(log=True))
+            overhead = (duration - baseline) / requests * 1e6
+            print(f"{name:<32} {duration / requests * 1e6:8.2f} us/request   overhead {overhead:8.2f} us/request")
+            loguru.logger.remove()
+        json_sink.stop()
+
+
+if __name__ == "__main__":
+    main()
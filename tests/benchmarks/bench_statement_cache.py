@@ -0,0 +1,62 @@
+"""
+Python overhead of building the select for a repository lookup, before and after the statement cache of
+`BaseCRUDRepository`. Only statement construction and SQLAlchemy cache-key generation are measured (no database).
+
+    PYTHONPATH=backend python -m tests.benchmarks.bench_statement_cache
+"""
+import timeit
+
+import sqlalchemy
+
+from backend.src.repository.crud.account import AccountCRUDRepository
+from backend.src.repository.crud.refresh_session import RefreshCRUDRepository
+
+ROUNDS = 20_000
+
+
+def build_by_field(model, field_name: str, field_value, **filter_by):  # type: ignore
+    stmt = sqlalchemy.select(model).where(getattr(model, field_name) == field_value).filter_by(**filter_by)
+    return stmt._generate_cache_key()
+
+
+def build_all(model, **filter_by):  # type: ignore
+    stmt = sqlalchemy.select(model).filter_by(**filter_by)
+    return stmt._generate_cache_key()
+
+
+def cached_lookup(repo_type, filter_by: dict):  # type: ignore
+    stmt, _ = repo_type._get_select_statement(filter_by)
+    return stmt._generate_cache_key()
+
+
+def report(name: str, before: float, after: float) -> None:
+    before_us, after_us = before / ROUNDS * 1e6, after / ROUNDS * 1e6
+    print(f"{name:<40} before {before_us:8.2f} us   after {after_us:8.2f} us   x{before_us / after_us:5.1f}")
+
+
+def main() -> None:
+    model = AccountCRUDRepository.model
+    cases = [
+        (
+            "find_by_field_or_none(username)",
+            lambda: build_by_field(model, "username", "user1"),
+            lambda: cached_lookup(AccountCRUDRepository, {"username": "user1"}),
+        ),
+        (
+            "find_by_id_or_none(id, is_active=...)",
+            lambda: build_by_field(model, "id", 1, is_active=True),
+            lambda: cached_lookup(AccountCRUDRepository, {"id": 1, "is_active": True}),
+        ),
+        (
+            "find_all(account=...)",
+            lambda: build_all(RefreshCRUDRepository.model, account=1),
+            lambda: cached_lookup(RefreshCRUDRepository, {"account": 1}),
+        ),
+    ]
+    for name, before, after in cases:
+        after()
+        report(name, timeit.timeit(before, number=ROUNDS), timeit.timeit(after, number=ROUNDS))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+import uuid
+
+import fastapi
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.src.repository.crud.account import AccountCRUDRepository
+from backend.src.repository.exceptions import EntityAlreadyExists
+
+
+async def test_bulk_create_skips_existing_accounts(initialize_backend_test_application: fastapi.FastAPI) -> None:
+    suffix = uuid.uuid4().hex[:8]
+    records = [
+        (f"first-{suffix}@example.com", f"first-{suffix}", "hashed-password", "hash-salt"),
+        (f"second-{suffix}@example.com", f"second-{suffix}", "hashed-password", "hash-salt"),
+    ]
+
+    async with AsyncSession(bind=initialize_backend_test_application.state.db.async_engine) as session:
+        account_repo = AccountCRUDRepository(async_session=session)
+        try:
+            assert await account_repo.bulk_create(records) == {f"first-{suffix}", f"second-{suffix}"}
+            colliding_records = [
+                (f"third-{suffix}@example.com", f"first-{suffix}", "hashed-password", "hash-salt"),
+                (f"second-{suffix}@example.com", f"fourth-{suffix}", "hashed-password", "hash-salt"),
+                (f"fifth-{suffix}@example.com", f"fifth-{suffix}", "hashed-password", "hash-salt"),
+            ]
+            assert await account_repo.bulk_create(colliding_records) == {f"fifth-{suffix}"}
+
+            account = await account_repo.find_by_username(f"fifth-{suffix}")
+            assert account.email == f"fifth-{suffix}@example.com"
+            assert account.is_active and not account.is_logged_in
+        finally:
+            for username in (f"first-{suffix}", f"second-{suffix}", f"fifth-{suffix}"):
+                account = await account_repo.find_by_username_or_none(username)
+                if account is not None:
+                    await account_repo.delete_by_id(account.id)
+
+
+async def test_find_all_by_ids_skips_missing_and_repeated_ids(
+        initialize_backend_test_application: fastapi.FastAPI,
+) -> None:
+    suffix = uuid.uuid4().hex[:8]
+
+    async with AsyncSession(bind=initialize_backend_test_application.state.db.async_engine) as session:
+        account_repo = AccountCRUDRepository(async_session=session)
+        await account_repo.bulk_create(
+            [(f"batch-{suffix}@example.com", f"batch-{suffix}", "hashed-password", "hash-salt")]
+        )
+        account = await account_repo.find_by_username(f"batch-{suffix}")
+        try:
+            accounts = await account_repo.find_all_by_ids([account.id, 0, account.id])
+
+            assert list(accounts) == [account.id]
+            assert accounts[account.id].username == f"batch-{suffix}"
+        finally:
+            await account_repo.delete_by_id(account.id)
+
+
+async def test_login_identifiers_are_unique_case_insensitively(
+        initialize_backend_test_application: fastapi.FastAPI,
+) -> None:
+    suffix = uuid.uuid4().hex[:8]
+    records = [
+        (f"first-{suffix}@example.com", f"Shared-{suffix}@example.com", "hashed-password", "hash-salt"),
+        (f"shared-{suffix}@example.com", f"second-{suffix}", "hashed-password", "hash-salt"),
+    ]
+
+    async with AsyncSession(bind=initialize_backend_test_application.state.db.async_engine) as session:
+        account_repo = AccountCRUDRepository(async_session=session)
+        await account_repo.bulk_create(records)
+        accounts = [await account_repo.find_by_username(username) for _, username, _, _ in records]
+        try:
+            with pytest.raises(EntityAlreadyExists):
+                await account_repo.is_username_taken(f"SECOND-{suffix}")
+            with pytest.raises(EntityAlreadyExists):
+                await account_repo.is_email_taken(f"First-{suffix}@Example.com")
+
+            assert (await account_repo.find_by_login_identifier(f"SECOND-{suffix}")).id == accounts[1].id
+            assert (await account_repo.find_by_login_identifier(f"FIRST-{suffix}@example.com")).id == accounts[0].id
+            # One account's username is the other one's email
+            assert await account_repo.find_by_login_identifier(f"shared-{suffix}@example.com") is None
+        finally:
+            await account_repo.delete_by_ids([account.id for account in accounts])
@@ -0,0 +1,57 @@
+import typing
+import uuid
+
+import fastapi
+import httpx
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.src.config.manager import settings
+from backend.src.repository.crud.account import AccountCRUDRepository
+
+
+@pytest.fixture(name="account_ids")
+async def account_ids(initialize_backend_test_application: fastapi.FastAPI) -> list[int]:  # type: ignore
+    """
+    Two freshly imported accounts, removed again after the test.
+    """
+    suffix = uuid.uuid4().hex[:8]
+    usernames = [f"first-{suffix}", f"second-{suffix}"]
+
+    async with AsyncSession(bind=initialize_backend_test_application.state.db.async_engine) as session:
+        account_repo = AccountCRUDRepository(async_session=session)
+        await account_repo.bulk_create(
+            [(f"{username}@example.com", username, "hashed-password", "hash-salt") for username in usernames]
+        )
+        ids = [(await account_repo.find_by_username(username)).id for username in usernames]
+        yield ids
+        await account_repo.delete_by_ids(ids)
+
+
+def _summarize(items: list[dict[str, typing.Any]]) -> list[tuple[int, bool]]:
+    return [(item["id"], item["found"]) for item in items]
+
+
+async def test_account_batch_keeps_request_order(async_client: httpx.AsyncClient, account_ids: list[int]) -> None:
+    first_id, second_id = account_ids
+    ids = [second_id, 0, first_id, second_id]
+
+    get_response = await async_client.get("/api/accounts:batch", params={"ids": ids})
+    post_response = await async_client.post("/api/accounts:batch", json={"ids": ids})
+
+    assert get_response.status_code == post_response.status_code == fastapi.status.HTTP_200_OK
+    assert get_response.json() == post_response.json()
+    items = get_response.json()
+    assert _summarize(items) == [(second_id, True), (0, False), (first_id, True), (second_id, True)]
+    assert items[1]["account"] is None
+    assert items[0]["account"] == items[3]["account"]
+    assert items[2]["account"]["id"] == first_id
+
+
+async def test_account_batch_rejects_too_many_ids(async_client: httpx.AsyncClient) -> None:
+    ids = list(range(1, settings.ACCOUNTS_BATCH_MAX_SIZE + 2))
+
+    response = await async_client.post("/api/accounts:batch", json={"ids": ids})
+
+    assert response.status_code == fastapi.status.HTTP_400_BAD_REQUEST
+    assert str(settings.ACCOUNTS_BATCH_MAX_SIZE) in response.json()["detail"]
@@ -0,0 +1,39 @@
+import uuid
+
+import fastapi
+import httpx
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.src.repository.crud.account import AccountCRUDRepository
+from backend.src.securities.password import generate_salted_password_hashes
+
+# The app records statements into the collectors of `src.monitoring.queries`, not of its `backend.src` twin
+from src.monitoring.queries import assert_query_budget
+
+# Login lookup, current sessions, stale session delete, session insert and its refresh
+TOKEN_QUERY_BUDGET: int = 5
+
+
+async def test_password_token_stays_within_its_query_budget(
+        async_client: httpx.AsyncClient, initialize_backend_test_application: fastapi.FastAPI
+) -> None:
+    username = f"budget-{uuid.uuid4().hex[:8]}"
+    [(hash_salt, hashed_password)] = generate_salted_password_hashes(["secret"])
+
+    async with AsyncSession(bind=initialize_backend_test_application.state.db.async_engine) as session:
+        account_repo = AccountCRUDRepository(async_session=session)
+        await account_repo.bulk_create([(f"{username}@example.com", username, hashed_password, hash_salt)])
+        account = await account_repo.find_by_username(username)
+        try:
+            # The second login from the same client also replaces the session of the first one
+            for _ in range(2):
+                with assert_query_budget(TOKEN_QUERY_BUDGET):
+                    response = await async_client.post(
+                        "/api/auth/token",
+                        data={"grant_type": "password", "username": username, "password": "secret"},
+                        headers={"Content-Type": "application/x-www-form-urlencoded"},
+                    )
+
+                assert response.status_code == fastapi.status.HTTP_200_OK
+        finally:
+            await account_repo.delete_by_id(account.id)
@@ -0,0 +1,94 @@
+import json
+import typing
+
+import fastapi
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.src.repository.crud.account import AccountCRUDRepository
+from backend.src.repository.crud.application import ApplicationCRUDRepository
+from backend.src.repository.crud.refresh_session import RefreshCRUDRepository
+
+
+def _collect_index_names(plan: dict) -> set[str]:
+    index_names = {plan["Index Name"]} if "Index Name" in plan else set()
+    for sub_plan in plan.get("Plans", []):
+        index_names |= _collect_index_names(sub_plan)
+    return index_names
+
+
+async def explain_repository_call(
+        app: fastapi.FastAPI,
+        repo_call: typing.Callable[[AsyncSession], typing.Awaitable[typing.Any]],
+) -> set[str]:
+    """
+    Run `repo_call`, capture every statement it sends to the database and return the names of the indexes the
+    planner picks for them. Sequential scans are disabled so that the tiny test tables do not hide a missing index.
+    """
+    statements: list[tuple[str, typing.Any]] = list()
+    sync_engine = app.state.db.async_engine.sync_engine
+
+    def capture_statement(conn, cursor, statement, parameters, context, executemany) -> None:  # type: ignore
+        statements.append((statement, parameters))
+
+    async with AsyncSession(bind=app.state.db.async_engine) as session:
+        event.listen(sync_engine, "before_cursor_execute", capture_statement)
+        try:
+            await repo_call(session)
+        finally:
+            event.remove(sync_engine, "before_cursor_execute", capture_statement)
+        await session.rollback()
+
+        connection = await session.connection()
+        await connection.exec_driver_sql("SET LOCAL enable_seqscan = off")
+        index_names: set[str] = set()
+        for statement, parameters in statements:
+            query = await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters)
+            plan = query.scalar()
+            plan = json.loads(plan) if isinstance(plan, str) else plan
+            index_names |= _collect_index_names(plan[0]["Plan"])
+        await session.rollback()
+
+    return index_names
+
+
+@pytest.mark.parametrize(
+    ("repo_call", "expected_index"),
+    [
+        (lambda session: RefreshCRUDRepository(session).find_all(account=1), "ix_refresh_session_account"),
+        (
+            lambda session: RefreshCRUDRepository(session).delete_expired(now=0, commit_changes=False),
+            "ix_refresh_session_expires_in",
+        ),
+        (
+            lambda session: RefreshCRUDRepository(session).delete_expired(now=0, limit=100, commit_changes=False),
+            "ix_refresh_session_expires_in",
+        ),
+        (lambda session: ApplicationCRUDRepository(session).find_all(user=1), "ix_application_user"),
+        (
+            lambda session: ApplicationCRUDRepository(session).is_allowed_user(1, "User@Example.com"),
+            "ix_application_user_application_id_lower_email",
+        ),
+        (
+            lambda session: ApplicationCRUDRepository(session).count_allowed_users(1),
+            "ix_application_user_application_id_lower_email",
+        ),
+        (
+            lambda session: AccountCRUDRepository(session).find_by_login_identifier("User1"),
+            "ix_account_lower_username",
+        ),
+        (
+            lambda session: AccountCRUDRepository(session).find_by_login_identifier("User1@Exa.com"),
+            "ix_account_lower_email",
+        ),
+    ],
+)
+async def test_repository_lookups_use_index(
+        initialize_backend_test_application: fastapi.FastAPI,
+        repo_call: typing.Callable[[AsyncSession], typing.Awaitable[typing.Any]],
+        expected_index: str,
+) -> None:
+    index_names = await explain_repository_call(initialize_backend_test_application, repo_call)
+
+    assert expected_index in index_names
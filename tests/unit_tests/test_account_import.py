@@ -0,0 +1,107 @@
+import typing
+from concurrent.futures import ThreadPoolExecutor
+
+from backend.src.repository.account_import import AccountImportFormat, import_accounts, iter_account_rows
+
+
+async def _stream(*chunks: bytes) -> typing.AsyncIterator[bytes]:
+    for chunk in chunks:
+        yield chunk
+
+
+async def _collect(rows: typing.AsyncIterator[tuple[int, dict | str]]) -> list[tuple[int, dict | str]]:
+    return [row async for row in rows]
+
+
+class FakeAccountRepository:
+    """
+    Stands in for `AccountCRUDRepository.bulk_create`: usernames in `registered` collide with existing accounts.
+    """
+
+    def __init__(self, registered: set[str]):
+        self.registered = registered
+        self.records: list[tuple[str, str, str, str]] = list()
+
+    async def bulk_create(self, records: list[tuple[str, str, str, str]]) -> set[str]:
+        self.records.extend(records)
+        return {username for _, username, _, _ in records if username not in self.registered}
+
+
+async def test_iter_account_rows_parses_csv_split_across_chunks() -> None:
+    rows = await _collect(
+        iter_account_rows(
+            _stream(
+                b"\xef\xbb\xbfusername, email,password\r\nalice,al",
+                b"ice@example.com,secret\r\n\r\nbob,bob@example.com",
+            ),
+            AccountImportFormat.CSV,
+        )
+    )
+
+    assert rows == [
+        (1, {"username": "alice", "email": "alice@example.com", "password": "secret"}),
+        (2, "Expected 3 columns, got 2"),
+    ]
+
+
+async def test_iter_account_rows_keeps_line_breaks_of_quoted_csv_fields() -> None:
+    rows = await _collect(
+        iter_account_rows(
+            _stream(
+                b'username,email,password\r\ncarol,carol@example.com,"pa""ss\r\n',
+                b'\r\nword"\r\ndave,dave@example.com,"open\r\n',
+            ),
+            AccountImportFormat.CSV,
+        )
+    )
+
+    assert rows[0] == (1, {"username": "carol", "email": "carol@example.com", "password": 'pa"ss\n\nword'})
+    assert rows[1][0] == 2 and str(rows[1][1]).startswith("Invalid CSV")
+
+
+async def test_iter_account_rows_reports_unparsable_ndjson() -> None:
+    rows = await _collect(
+        iter_account_rows(
+            _stream(b'{"username": "alice"}\n[1, 2]\n{"username": \n'),
+            AccountImportFormat.NDJSON,
+        )
+    )
+
+    assert rows[0] == (1, {"username": "alice"})
+    assert rows[1] == (2, "Row must be a JSON object")
+    assert isinstance(rows[2][1], str) and rows[2][1].startswith("Invalid JSON")
+
+
+async def test_import_accounts_reports_every_failed_row() -> None:
+    body = (
+        b"username,email,password\n"
+        b"alice,alice@example.com,secret\n"
+        b"bob,not-an-email,secret\n"
+        b"ALICE,other@example.com,secret\n"
+        b"carol,Alice@Example.com,secret\n"
+        b"taken,taken@example.com,secret\n"
+        b"dave,dave@example.com\n"
+    )
+    account_repo = FakeAccountRepository(registered={"taken"})
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        report = await import_accounts(
+            iter_account_rows(_stream(body), AccountImportFormat.CSV),
+            account_repo,  # type: ignore
+            executor=executor,
+            workers=2,
+            batch_size=4,
+        )
+
+    assert report.received == 6
+    assert report.created == 1
+    errors = {error.row: error.detail for error in report.errors}
+    assert errors.pop(2).startswith("email")
+    assert errors == {
+        3: "Duplicated username or email in import",
+        4: "Duplicated username or email in import",
+        5: "The username or email is already registered",
+        6: "Expected 3 columns, got 2",
+    }
+    assert [username for _, username, _, _ in account_repo.records] == ["alice", "taken"]
+    assert all(hashed_password and hash_salt for _, _, hashed_password, hash_salt in account_repo.records)
@@ -0,0 +1,49 @@
+import os
+import pathlib
+import subprocess
+import sys
+
+BACKEND_DIR: pathlib.Path = pathlib.Path(__file__).parent.parent.parent.resolve() / "backend"
+IMPORT_TIME_BUDGET_US: int = int(os.environ.get("IMPORT_TIME_BUDGET_US", 3_000_000))
+
+# Fails if importing the app read the settings or created a database engine
+CHECK_SIDE_EFFECTS: str = """
+import sys
+import src.main
+from src.config.manager import get_settings
+
+assert get_settings.cache_info().currsize == 0, "settings were loaded at import"
+assert "asyncpg" not in sys.modules, "a database engine was created at import"
+"""
+
+
+def import_times(module: str) -> dict[str, int]:
+    """
+    Import `module` in a fresh interpreter with `python -X importtime` and return the cumulative import time of
+    every module, in microseconds.
+    """
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = dict()
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = (part.strip() for part in line.removeprefix("import time:").split("|"))
+        times[name] = int(cumulative)
+    return times
+
+
+def test_app_import_has_no_side_effects() -> None:
+    subprocess.run([sys.executable, "-c", CHECK_SIDE_EFFECTS], cwd=BACKEND_DIR, check=True)
+
+
+def test_app_import_time_is_within_budget() -> None:
+    times = import_times("src.main")
+    slowest = sorted(times.items(), key=lambda item: item[1], reverse=True)[:10]
+
+    assert times["src.main"] <= IMPORT_TIME_BUDGET_US, f"Slowest imports (us): {slowest}"
@@ -0,0 +1,32 @@
+import time
+
+from backend.src.launcher import PreforkServer, settings
+
+
+def test_crashing_workers_back_off_and_eventually_stop_the_server() -> None:
+    server = PreforkServer(app=None, workers=2)  # type: ignore
+    delays = list()
+
+    for _ in range(settings.SERVER_WORKER_MAX_CRASHES - 1):
+        # Both workers of a generation crash at boot, which counts once
+        started_at = time.monotonic()
+        server._schedule_respawn(started_at)
+        server._schedule_respawn(started_at)
+        delays.append(round(server._respawn_at - time.monotonic()))
+        assert not server._should_exit
+
+    server._schedule_respawn(time.monotonic())
+
+    assert server.crashes == settings.SERVER_WORKER_MAX_CRASHES
+    assert server._should_exit and server.exit_code == 1
+    assert delays == sorted(delays) and delays[-1] > delays[0]
+
+
+def test_worker_exiting_after_its_min_uptime_resets_the_crash_count() -> None:
+    server = PreforkServer(app=None, workers=1)  # type: ignore
+
+    server._schedule_respawn(time.monotonic())
+    server._schedule_respawn(time.monotonic() - settings.SERVER_WORKER_MIN_UPTIME_SECONDS)
+
+    assert server.crashes == 0
+    assert server._pending_respawns == 2 and not server._should_exit
@@ -0,0 +1,72 @@
+import gc
+
+from backend.src.monitoring.aggregation import merge_dumps
+from backend.src.monitoring.memory import GC_COLLECTIONS, MemorySampler
+from backend.src.monitoring.metrics import MetricsRegistry, render_prometheus_text
+
+
+def _create_worker_registry() -> MetricsRegistry:
+    registry = MetricsRegistry()
+    registry.counter("requests_total", "Requests.", ("route",))
+    registry.histogram("latency_seconds", "Latency.", ("route",), buckets=(0.1, 1.0))
+    return registry
+
+
+def test_histogram_renders_cumulative_buckets_sum_and_count() -> None:
+    registry = _create_worker_registry()
+    latency = registry.metrics["latency_seconds"]
+    for value in (0.05, 0.1, 0.5, 3.0):
+        latency.observe(value, "accounts:read")  # type: ignore
+
+    lines = render_prometheus_text(registry.dump()).splitlines()
+
+    assert lines[-5:] == [
+        'latency_seconds_bucket{route="accounts:read",le="0.1"} 2',
+        'latency_seconds_bucket{route="accounts:read",le="1.0"} 3',
+        'latency_seconds_bucket{route="accounts:read",le="+Inf"} 4',
+        'latency_seconds_sum{route="accounts:read"} 3.65',
+        'latency_seconds_count{route="accounts:read"} 4',
+    ]
+    assert "# TYPE latency_seconds histogram" in lines
+
+
+def test_label_values_are_escaped() -> None:
+    registry = _create_worker_registry()
+    registry.metrics["requests_total"].inc('say "hi"\\n\nnow')  # type: ignore
+
+    text = render_prometheus_text(registry.dump())
+
+    assert 'requests_total{route="say \\"hi\\"\\\\n\\nnow"} 1.0\n' in text
+
+
+def test_merge_dumps_sums_worker_samples() -> None:
+    first_worker, second_worker = _create_worker_registry(), _create_worker_registry()
+    first_worker.metrics["requests_total"].inc("a")  # type: ignore
+    first_worker.metrics["latency_seconds"].observe(0.05, "a")  # type: ignore
+    second_worker.metrics["requests_total"].inc("a", amount=2)  # type: ignore
+    second_worker.metrics["requests_total"].inc("b")  # type: ignore
+    second_worker.metrics["latency_seconds"].observe(0.5, "a")  # type: ignore
+    second_worker.metrics["latency_seconds"].observe(2.0, "a")  # type: ignore
+
+    merged = merge_dumps([first_worker.dump(), second_worker.dump()])
+
+    assert sorted(merged["requests_total"]["values"]) == [[["a"], 3.0], [["b"], 1.0]]
+    assert merged["latency_seconds"]["values"] == [[["a"], [1, 1, 1, 2.55]]]
+    text = render_prometheus_text(merged)
+    assert 'latency_seconds_bucket{route="a",le="+Inf"} 3\n' in text
+    assert 'latency_seconds_count{route="a"} 3\n' in text
+    # The dumps of the workers are left untouched
+    assert first_worker.dump()["latency_seconds"]["values"] == [[["a"], [1, 0, 0, 0.05]]]
+
+
+async def test_gc_collections_are_exported_as_a_counter() -> None:
+    memory_sampler = MemorySampler(interval=60.0)
+    memory_sampler.start()
+    await memory_sampler.stop()
+
+    gc.collect()
+    family = GC_COLLECTIONS.dump()
+
+    assert GC_COLLECTIONS.name == "python_gc_collections_total"
+    assert family["kind"] == "counter"
+    assert dict((label_values[0], value) for label_values, value in family["values"])["2"] >= 1
@@ -0,0 +1,207 @@
+import asyncio
+import types
+import typing
+
+import fastapi
+import loguru
+import pytest
+from sqlalchemy.exc import DBAPIError
+from starlette.responses import PlainTextResponse, RedirectResponse
+from starlette.types import Message, Receive, Scope, Send
+
+from backend.src.api.dependencies.session import QUERY_CANCELED_SQLSTATE, get_async_session
+from backend.src.api.middlewares.disconnect import CancelOnDisconnectMiddleware
+from backend.src.api.middlewares.metrics import HTTP_REQUESTS, MetricsMiddleware
+from backend.src.api.middlewares.read_your_writes import (
+    PRIMARY_PIN_STATE_KEY,
+    READ_YOUR_WRITES_COOKIE,
+    ReadYourWritesMiddleware,
+)
+
+
+def _http_scope(method: str = "GET", headers: list[tuple[bytes, bytes]] | None = None) -> Scope:
+    return {"type": "http", "method": method, "path": "/", "headers": headers or [], "query_string": b""}
+
+
+async def _call(app: typing.Callable[[Scope, Receive, Send], typing.Awaitable[None]], scope: Scope) -> list[Message]:
+    sent: list[Message] = list()
+
+    async def receive() -> Message:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: Message) -> None:
+        sent.append(message)
+
+    await app(scope, receive, send)
+    return sent
+
+
+def _set_cookies(message: Message) -> list[bytes]:
+    return [value for name, value in message["headers"] if name == b"set-cookie"]
+
+
+async def test_read_your_writes_cookie_reaches_a_returned_response() -> None:
+    async def writing_route(scope: Scope, receive: Receive, send: Send) -> None:
+        scope.setdefault("state", {})[PRIMARY_PIN_STATE_KEY] = 1234
+        await RedirectResponse("/elsewhere")(scope, receive, send)
+
+    async def reading_route(scope: Scope, receive: Receive, send: Send) -> None:
+        await RedirectResponse("/elsewhere")(scope, receive, send)
+
+    written = await _call(ReadYourWritesMiddleware(writing_route), _http_scope("POST"))
+    read = await _call(ReadYourWritesMiddleware(reading_route), _http_scope())
+
+    cookies = _set_cookies(written[0])
+    assert len(cookies) == 1 and cookies[0].startswith(f"{READ_YOUR_WRITES_COOKIE}=1234;".encode())
+    assert _set_cookies(read[0]) == []
+
+
+class FakeClient:
+    """
+    The server side of one ASGI connection: `receive` hands out queued client messages as they arrive.
+    """
+
+    def __init__(self, *messages: Message):
+        self.messages: asyncio.Queue[Message] = asyncio.Queue()
+        for message in messages:
+            self.messages.put_nowait(message)
+        self.received: list[Message] = list()
+        self.sent: list[Message] = list()
+
+    async def receive(self) -> Message:
+        message = await self.messages.get()
+        self.received.append(message)
+        return message
+
+    async def send(self, message: Message) -> None:
+        self.sent.append(message)
+
+    def disconnect(self) -> None:
+        self.messages.put_nowait({"type": "http.disconnect"})
+
+
+class BlockingRoute:
+    """
+    Reads the whole request body, then waits until it is cancelled.
+    """
+
+    def __init__(self) -> None:
+        self.body = b""
+        self.body_read = asyncio.Event()
+        self.cancelled = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        more_body = True
+        while more_body:
+            message = await receive()
+            self.body += message.get("body", b"")
+            more_body = message.get("more_body", False)
+        self.body_read.set()
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+
+
+async def test_disconnect_cancels_a_get_handler() -> None:
+    client = FakeClient({"type": "http.request", "body": b"", "more_body": False})
+    route = BlockingRoute()
+
+    request = asyncio.create_task(CancelOnDisconnectMiddleware(route)(_http_scope(), client.receive, client.send))
+    await route.body_read.wait()
+    client.disconnect()
+    await asyncio.wait_for(request, timeout=1)
+
+    assert route.cancelled
+    assert client.sent == []
+
+
+async def test_disconnected_request_is_counted_as_client_closed() -> None:
+    client = FakeClient({"type": "http.request", "body": b"", "more_body": False})
+    route = BlockingRoute()
+    app = MetricsMiddleware(CancelOnDisconnectMiddleware(route))
+    counted = HTTP_REQUESTS.values.get(("unmatched", "GET", "499"), 0.0)
+
+    request = asyncio.create_task(app(_http_scope(), client.receive, client.send))
+    await route.body_read.wait()
+    client.disconnect()
+    await asyncio.wait_for(request, timeout=1)
+
+    assert HTTP_REQUESTS.values[("unmatched", "GET", "499")] == counted + 1
+    assert ("unmatched", "GET", "500") not in HTTP_REQUESTS.values
+
+
+async def test_streamed_body_is_read_by_the_handler_before_disconnects_are_watched() -> None:
+    client = FakeClient(
+        {"type": "http.request", "body": b"abc", "more_body": True},
+        {"type": "http.request", "body": b"def", "more_body": False},
+    )
+    route = BlockingRoute()
+    scope = _http_scope("POST", headers=[(b"transfer-encoding", b"chunked")])
+
+    request = asyncio.create_task(CancelOnDisconnectMiddleware(route)(scope, client.receive, client.send))
+    await route.body_read.wait()
+    assert not route.cancelled
+    client.disconnect()
+    await asyncio.wait_for(request, timeout=1)
+
+    assert route.body == b"abcdef"
+    assert route.cancelled
+
+
+async def test_completed_response_leaves_later_messages_unread() -> None:
+    client = FakeClient({"type": "http.request", "body": b"", "more_body": False})
+
+    async def route(scope: Scope, receive: Receive, send: Send) -> None:
+        await receive()
+        await PlainTextResponse("ok")(scope, receive, send)
+
+    await asyncio.wait_for(CancelOnDisconnectMiddleware(route)(_http_scope(), client.receive, client.send), timeout=1)
+    client.disconnect()
+    await asyncio.sleep(0)
+
+    assert [message["type"] for message in client.sent] == ["http.response.start", "http.response.body"]
+    assert client.received == [{"type": "http.request", "body": b"", "more_body": False}]
+    assert client.messages.qsize() == 1
+    assert asyncio.all_tasks() == {asyncio.current_task()}
+
+
+def _open_request_sessions() -> typing.AsyncGenerator[typing.Any, None]:
+    session = types.SimpleNamespace(
+        sync_session=types.SimpleNamespace(info=dict()),
+        rollback=lambda: asyncio.sleep(0),
+        close=lambda: asyncio.sleep(0),
+    )
+    db = types.SimpleNamespace(async_session_factory=lambda: session, replicas=[])
+    scope = _http_scope()
+    scope["app"] = types.SimpleNamespace(state=types.SimpleNamespace(db=db))
+    return get_async_session(fastapi.Request(scope))
+
+
+async def test_statement_timeout_answers_503_with_retry_after() -> None:
+    sessions = _open_request_sessions()
+    await sessions.__anext__()
+    timeout_error = DBAPIError("SELECT pg_sleep(60)", None, types.SimpleNamespace(sqlstate=QUERY_CANCELED_SQLSTATE))
+    with pytest.raises(fastapi.HTTPException) as exc_info:
+        await sessions.athrow(timeout_error)
+
+    assert exc_info.value.status_code == fastapi.status.HTTP_503_SERVICE_UNAVAILABLE
+    assert int(exc_info.value.headers["Retry-After"]) > 0  # type: ignore
+
+
+async def test_http_exceptions_pass_through_the_session_unlogged() -> None:
+    messages: list[str] = list()
+    handler_id = loguru.logger.add(messages.append, level="DEBUG")
+    sessions = _open_request_sessions()
+    await sessions.__anext__()
+    not_found = fastapi.HTTPException(status_code=fastapi.status.HTTP_404_NOT_FOUND)
+
+    try:
+        with pytest.raises(fastapi.HTTPException) as exc_info:
+            await sessions.athrow(not_found)
+    finally:
+        loguru.logger.remove(handler_id)
+
+    assert exc_info.value is not_found
+    assert messages == []
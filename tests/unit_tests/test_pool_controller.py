@@ -0,0 +1,79 @@
+import types
+
+from backend.src.repository.pool import (
+    DB_POOL_CHECKOUT_WAIT,
+    InstrumentedAsyncQueuePool,
+    PoolController,
+    get_max_overflow,
+)
+
+SLOW_WAIT: float = 0.5
+FAST_WAIT: float = 0.0001
+
+
+def _create_controller(max_overflow: int = 2, **kwargs: int) -> tuple[PoolController, InstrumentedAsyncQueuePool]:
+    pool = InstrumentedAsyncQueuePool(creator=lambda: None, pool_size=5, max_overflow=max_overflow)
+    controller = PoolController(
+        engine=types.SimpleNamespace(pool=pool),  # type: ignore
+        min_overflow=0,
+        max_overflow=6,
+        interval=1.0,
+        step=2,
+        wait_high_ms=100.0,
+        wait_low_ms=1.0,
+        low_utilization=0.5,
+        **kwargs,
+    )
+    return controller, pool
+
+
+def _tick(controller: PoolController, pool: InstrumentedAsyncQueuePool, wait: float) -> str:
+    pool.checkout_waits.extend([wait] * 20)
+    return controller.tick()
+
+
+def test_tick_grows_after_consecutive_slow_samples() -> None:
+    controller, pool = _create_controller(grow_after=2)
+
+    assert _tick(controller, pool, SLOW_WAIT) == "hold"
+    assert get_max_overflow(pool) == 2
+    assert _tick(controller, pool, SLOW_WAIT) == "grow"
+    assert get_max_overflow(pool) == 4
+    assert not pool.checkout_waits
+
+
+def test_tick_does_not_flap_on_a_single_burst() -> None:
+    controller, pool = _create_controller(grow_after=2, shrink_after=3)
+
+    decisions = [_tick(controller, pool, wait) for wait in (SLOW_WAIT, 0.05, SLOW_WAIT, FAST_WAIT, FAST_WAIT)]
+
+    assert decisions == ["hold"] * 5
+    assert get_max_overflow(pool) == 2
+
+
+def test_tick_shrinks_after_quiet_samples_down_to_the_minimum() -> None:
+    controller, pool = _create_controller(max_overflow=3, shrink_after=2)
+
+    decisions = [_tick(controller, pool, FAST_WAIT) for _ in range(6)]
+
+    assert decisions == ["hold", "shrink", "hold", "shrink", "hold", "hold"]
+    assert get_max_overflow(pool) == 0
+
+
+def test_tick_caps_growth_at_the_maximum() -> None:
+    controller, pool = _create_controller(max_overflow=5, grow_after=1)
+
+    assert _tick(controller, pool, SLOW_WAIT) == "grow"
+    assert get_max_overflow(pool) == 6
+    assert _tick(controller, pool, SLOW_WAIT) == "capped"
+    assert get_max_overflow(pool) == 6
+    assert controller.decisions == {"grow": 1, "capped": 1}
+
+
+def test_checkout_wait_is_labelled_with_the_engine_name() -> None:
+    pool = InstrumentedAsyncQueuePool(creator=lambda: None, pool_size=1, max_overflow=0, logging_name="replica")
+
+    pool._do_get()
+
+    assert ("replica",) in DB_POOL_CHECKOUT_WAIT.values
+    assert len(pool.checkout_waits) == 1
@@ -0,0 +1,48 @@
+import pytest
+
+from backend.src.monitoring.queries import (
+    QueryBudgetExceeded,
+    assert_query_budget,
+    query_budget,
+    record_statement,
+    track_queries,
+)
+
+SELECT_ACCOUNT: str = "SELECT account.id FROM account WHERE account.id = $1::INTEGER"
+SELECT_SESSIONS: str = "SELECT refresh_session.id FROM refresh_session WHERE refresh_session.account = $1::INTEGER"
+
+
+def test_nested_collectors_count_the_same_statements() -> None:
+    record_statement(SELECT_ACCOUNT, 0.001)
+
+    with track_queries() as outer:
+        record_statement(SELECT_SESSIONS, 0.002)
+        with track_queries() as inner:
+            for _ in range(3):
+                record_statement(SELECT_ACCOUNT, 0.001)
+
+    assert outer.count == 4
+    assert inner.count == 3
+    assert inner.duration == pytest.approx(0.003)
+    assert outer.repeated_shapes(threshold=3) == [(SELECT_ACCOUNT, 3)]
+
+
+def test_assert_query_budget_fails_on_overrun() -> None:
+    with assert_query_budget(2):
+        record_statement(SELECT_ACCOUNT, 0.001)
+        record_statement(SELECT_SESSIONS, 0.001)
+
+    with pytest.raises(QueryBudgetExceeded, match="3 statements"):
+        with assert_query_budget(2):
+            for _ in range(3):
+                record_statement(SELECT_ACCOUNT, 0.001)
+
+
+async def test_strict_query_budget_decorator_raises() -> None:
+    @query_budget(1, strict=True)
+    async def load_sessions_per_account() -> None:
+        for _ in range(2):
+            record_statement(SELECT_SESSIONS, 0.001)
+
+    with pytest.raises(QueryBudgetExceeded, match="load_sessions_per_account"):
+        await load_sessions_per_account()
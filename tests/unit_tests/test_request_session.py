@@ -0,0 +1,26 @@
+import sqlalchemy
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from backend.src.repository.database import RequestSession
+from backend.src.repository.replicas import ReplicaSet
+
+
+def _create_session() -> tuple[RequestSession, sqlalchemy.Engine]:
+    primary = create_async_engine("postgresql+asyncpg://primary/db")
+    replica = create_async_engine("postgresql+asyncpg://replica/db")
+    session = RequestSession(bind=primary.sync_engine, replicas=ReplicaSet([replica], retry_after=1.0))
+    session.info[RequestSession.READ_ONLY_KEY] = True
+    return session, replica.sync_engine
+
+
+def test_read_only_select_is_served_by_a_replica() -> None:
+    session, replica = _create_session()
+
+    assert session.get_bind(clause=sqlalchemy.select(1)) is replica
+
+
+def test_primary_only_select_stays_on_the_primary() -> None:
+    session, replica = _create_session()
+
+    assert session.get_bind(clause=sqlalchemy.select(1), primary_only=True) is not replica
+    assert session.get_bind(clause=sqlalchemy.select(1), replica_ok=True, primary_only=True) is not replica
@@ -0,0 +1,15 @@
+import copy
+
+from backend.src.api.dependencies.scopes import AccountScopes, RoleNames
+
+
+def test_scopes_do_not_change_the_shared_role_mapping() -> None:
+    relationships = copy.deepcopy(AccountScopes._ROLE_RELATIONSHIPS)
+
+    for _ in range(3):
+        for role in RoleNames:
+            assert role.value in AccountScopes(role.value).scopes
+            AccountScopes(role.value).scopes.append("injected")
+
+    assert AccountScopes._ROLE_RELATIONSHIPS == relationships
+    assert AccountScopes(RoleNames.DEVELOPER.value).scopes == [RoleNames.STAFF.value, RoleNames.DEVELOPER.value]
@@ -0,0 +1,57 @@
+import types
+import typing
+
+from backend.src.api.middlewares.tracing import start_root_span, stop_root_span
+from backend.src.repository.crud.base import BaseCRUDRepository
+
+SAMPLED_TRACEPARENT: str = "00-0af7651916cd43dd8448eb211c80319c-b7ad6b7169203331-01"
+
+
+class FakeExporter:
+    def __init__(self) -> None:
+        self.spans: list[typing.Any] = list()
+
+    def export(self, span: typing.Any) -> None:
+        self.spans.append(span)
+
+
+class WidgetRepository(BaseCRUDRepository):
+    async def find_widget(self) -> str:
+        return "widget"
+
+
+class GadgetRepository(WidgetRepository):
+    pass
+
+
+def test_sampled_traceparent_is_only_followed_from_trusted_upstreams() -> None:
+    exporter = FakeExporter()
+
+    untrusted = start_root_span(exporter, "GET /", SAMPLED_TRACEPARENT, sample_rate=0.0)  # type: ignore
+    trusted = start_root_span(exporter, "GET /", SAMPLED_TRACEPARENT, 0.0, is_parent_trusted=True)  # type: ignore
+    local = start_root_span(exporter, "GET /", SAMPLED_TRACEPARENT, sample_rate=1.0)  # type: ignore
+
+    assert untrusted is None
+    assert trusted is not None and trusted[0].trace_id == "0af7651916cd43dd8448eb211c80319c"
+    stop_root_span(*trusted)
+    assert local is not None and local[0].trace_id == "0af7651916cd43dd8448eb211c80319c"
+    stop_root_span(*local)
+
+
+async def test_repository_methods_get_one_span_named_after_the_called_class() -> None:
+    async def commit() -> None:
+        pass
+
+    exporter = FakeExporter()
+    repository = GadgetRepository(async_session=types.SimpleNamespace(commit=commit))  # type: ignore
+    root = start_root_span(exporter, "GET /", None, sample_rate=1.0)  # type: ignore
+    assert root is not None
+    await repository.find_widget()
+    await repository.commit_changes()
+    stop_root_span(*root)
+
+    assert [span.name for span in exporter.spans] == [
+        "GadgetRepository.find_widget",
+        "GadgetRepository.commit_changes",
+        "GET /",
+    ]